@@ -0,0 +1,90 @@
+"""
+Fuzzy scoring benchmark.
+
+Generates contact names and phone numbers and reports the time to score
+search terms against all of them one pair at a time, as the searches did
+before, and in one batch with `motherbot.helpers.scoring.score_matches`.
+fuzzywuzzy is measured too if it is installed.
+
+Usage:
+    python -m benchmarks.fuzzy_scoring [--contacts 100000] [--terms 20]
+"""
+
+import argparse
+import random
+from time import perf_counter
+from typing import Callable
+from benchmarks.snapshot_codecs import generate_book
+from motherbot.helpers.scoring import score_matches
+from motherbot.constants.values import FUZZY_MATCH_THRESHOLD
+
+
+def score_pairs(
+    scorer: Callable[[str, str], float],
+    term: str,
+    choices: list[str],
+) -> dict[str, int]:
+    """
+    Scores the term against the choices one pair at a time.
+    """
+    scores = {}
+    for choice in choices:
+        match = round(scorer(term, choice))
+        if match >= FUZZY_MATCH_THRESHOLD:
+            scores[choice] = match
+    return scores
+
+
+def main() -> None:
+    """
+    Runs the benchmark and prints the results table.
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--contacts", type=int, default=100_000)
+    parser.add_argument("--terms", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"Generating {args.contacts} contacts...")
+    book = generate_book(args.contacts)
+    names = list(book.data)
+    phones = list(dict.fromkeys(phone for phone, _ in book.phone_numbers()))
+    random.seed(0)
+    terms = [
+        random.choice(names)[:random.randint(3, 10)]
+        for _ in range(args.terms)
+    ]
+
+    from rapidfuzz import fuzz
+
+    engines = {
+        "rapidfuzz, per pair": lambda term, choices, scorer: score_pairs(
+            getattr(fuzz, scorer), term, choices
+        ),
+        "rapidfuzz, batched": lambda term, choices, scorer: score_matches(
+            term, choices, scorer, FUZZY_MATCH_THRESHOLD
+        ),
+    }
+    try:
+        from fuzzywuzzy import fuzz as fuzzywuzzy_fuzz
+    except ImportError:
+        pass
+    else:
+        engines["fuzzywuzzy, per pair"] = (
+            lambda term, choices, scorer: score_pairs(
+                getattr(fuzzywuzzy_fuzz, scorer), term, choices
+            )
+        )
+
+    print(f"{'engine':<22} {'names, ms':>10} {'phones, ms':>11}")
+    for engine, score in engines.items():
+        times = []
+        for choices, scorer in ((names, "partial_ratio"), (phones, "ratio")):
+            start = perf_counter()
+            for term in terms:
+                score(term, choices, scorer)
+            times.append((perf_counter() - start) / len(terms) * 1000)
+        print(f"{engine:<22} {times[0]:>10.1f} {times[1]:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
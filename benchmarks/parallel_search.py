@@ -0,0 +1,68 @@
+"""
+Parallel search benchmark.
+
+Generates contacts and reports the time to score search terms against the
+names and phone numbers of all of them, in this process with
+`motherbot.helpers.scoring.score_entries` and in worker processes with
+`motherbot.helpers.parallel_search.ShardedScorer`.
+
+Usage:
+    python -m benchmarks.parallel_search [--contacts 200000] [--terms 20]
+        [--shards 4]
+"""
+
+import argparse
+import random
+from time import perf_counter
+from benchmarks.snapshot_codecs import generate_book
+from motherbot.helpers.parallel_search import ShardedScorer
+from motherbot.helpers.scoring import score_entries
+
+
+def main() -> None:
+    """
+    Runs the benchmark and prints the results table.
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--contacts", type=int, default=200_000)
+    parser.add_argument("--terms", type=int, default=20)
+    parser.add_argument("--shards", type=int, default=None)
+    args = parser.parse_args()
+
+    print(f"Generating {args.contacts} contacts...")
+    book = generate_book(args.contacts)
+    entries = {
+        name: [name, *(str(phone) for phone in record.phones)]
+        for name, record in book.data.items()
+    }
+    keys = list(entries)
+    random.seed(0)
+    terms = [
+        random.choice(keys)[:random.randint(3, 10)]
+        for _ in range(args.terms)
+    ]
+
+    start = perf_counter()
+    scorer = ShardedScorer(entries.items(), args.shards)
+    # The worker processes start and receive their shards with the first
+    # search
+    scorer.score(terms[0], keys)
+    startup = perf_counter() - start
+
+    engines = {
+        "one process": lambda term: score_entries(term, entries),
+        f"{scorer.shards} shards": lambda term: scorer.score(term, keys),
+    }
+    print(f"{'engine':<14} {'per term, ms':>13}")
+    for engine, score in engines.items():
+        start = perf_counter()
+        for term in terms:
+            score(term)
+        elapsed = (perf_counter() - start) / len(terms) * 1000
+        print(f"{engine:<14} {elapsed:>13.1f}")
+    print(f"Starting the shards took {startup * 1000:.0f} ms")
+    scorer.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Snapshot codecs benchmark.
+
+Generates an address book with fake contacts and reports the snapshot size,
+save time and load time for every snapshot codec.
+
+Usage:
+    python -m benchmarks.snapshot_codecs [--contacts 100000]
+"""
+
+import argparse
+import os
+import tempfile
+from time import perf_counter
+from motherbot.contacts.address_book import AddressBook
+from motherbot.contacts.record import Record
+from motherbot.helpers.generate_data import generate_random_contact
+from motherbot.helpers.serialize import save_data, load_data
+from motherbot.settings.app_settings import app_settings
+from motherbot.constants.values import NAME_MAX_LENGTH
+
+
+def generate_book(count: int) -> AddressBook:
+    """
+    Generates an address book with `count` fake contacts.
+    """
+    book = AddressBook()
+    for i in range(count):
+        contact = generate_random_contact()
+        suffix = f" {i}"
+        name = contact["name"][:NAME_MAX_LENGTH - len(suffix)] + suffix
+        record = Record(name)
+        for phone in contact["phones"]:
+            try:
+                record.add_phone(phone)
+            except ValueError:
+                continue
+        for field, add in (
+            ("birthday", record.add_birthday),
+            ("email", record.add_email),
+            ("address", record.add_address),
+        ):
+            try:
+                if contact[field]:
+                    add(contact[field])
+            except ValueError:
+                continue
+        book.add_record(record)
+    return book
+
+
+def main() -> None:
+    """
+    Runs the benchmark and prints the results table.
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--contacts", type=int, default=100_000)
+    args = parser.parse_args()
+
+    print(f"Generating {args.contacts} contacts...")
+    book = generate_book(args.contacts)
+
+    print(f"{'codec':<6} {'size, MB':>10} {'save, s':>9} {'load, s':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "address_book.pkl")
+        for codec in app_settings.list_snapshot_codecs():
+            app_settings.snapshot_codec = codec
+
+            start = perf_counter()
+            save_data(book, filename)
+            save_time = perf_counter() - start
+
+            start = perf_counter()
+            loaded_book = load_data(filename)
+            load_time = perf_counter() - start
+            assert len(loaded_book) == len(book)
+
+            size = os.path.getsize(filename) / 1024 / 1024
+            print(
+                f"{codec:<6} {size:>10.2f} {save_time:>9.3f} {load_time:>9.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
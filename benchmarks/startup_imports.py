@@ -0,0 +1,77 @@
+"""
+Startup imports benchmark.
+
+Imports `motherbot.main` in fresh interpreters with `-X importtime` and
+reports the total import time and the third-party packages that take the
+longest to import before the first prompt.
+
+Usage:
+    python -m benchmarks.startup_imports [--runs 5] [--top 10]
+"""
+
+import argparse
+import subprocess
+import sys
+from statistics import median
+
+# Dependencies that are only needed by some commands
+HEAVY_PACKAGES = ["faker", "rapidfuzz", "rich", "tabulate"]
+
+
+def measure_imports() -> dict[str, int]:
+    """
+    Imports `motherbot.main` in a fresh interpreter.
+
+    Returns:
+        dict[str, int]: The cumulative import time in microseconds of every
+        imported third-party package, by top-level package name.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import motherbot.main"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        package = name.strip().split(".")[0]
+        if package in sys.stdlib_module_names:
+            continue
+        # The outermost import of a package includes all its submodules
+        times[package] = max(times.get(package, 0), int(cumulative))
+    return times
+
+
+def main() -> None:
+    """
+    Runs the benchmark and prints the results.
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    runs = [measure_imports() for _ in range(args.runs)]
+    packages = {package for times in runs for package in times}
+    medians = {
+        package: median(times.get(package, 0) for times in runs)
+        for package in packages
+    }
+
+    print(f"import motherbot.main: {medians['motherbot'] / 1000:.1f} ms")
+    print(f"{'package':<20} {'import, ms':>10}")
+    for package, time in sorted(
+        medians.items(), key=lambda item: item[1], reverse=True
+    )[:args.top]:
+        print(f"{package:<20} {time / 1000:>10.1f}")
+    loaded = [package for package in HEAVY_PACKAGES if package in packages]
+    print(f"Heavy packages loaded at startup: {', '.join(loaded) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -23,7 +23,10 @@ command_names_en = {
     "all_contacts": "all-contacts",
     "birthdays": "birthdays",
     "search_contacts": "search-contacts",
+    "find_phone": "find-phone",
     "fake_contacts": "fake-contacts",
+    "import_contacts": "import-contacts",
+    "export_contacts": "export-contacts",
     "smart_search": "smart-search",
     "add_note": "add-note",
     "change_note": "change-note",
@@ -39,7 +42,10 @@ command_names_en = {
     "all_notes": "all-notes",
     "reminders": "reminders",
     "search_notes": "search-notes",
+    "search_text": "search-text",
     "fake_notes": "fake-notes",
+    "import_notes": "import-notes",
+    "export_notes": "export-notes",
     "close": "close",
     "exit": "exit",
 }
@@ -50,8 +56,8 @@ command_descriptions_en = {
         "subcommands": {}
     },
     "settings": {
-        "description": ("Opens the settings menu to change language or date "
-                        "format."),
+        "description": ("Opens the settings menu to change language, date "
+                        "format or whether phone numbers must be unique."),
         "subcommands": {}
     },
     "add_contact": {
@@ -92,7 +98,13 @@ command_descriptions_en = {
     },
     "search_contacts": {
         "description": ("Allows you to search for contacts by name or phone"
-                        " number."),
+                        " number, or with a filter query on their fields "
+                        "like city:Kyiv or missing:email AND month:3."),
+        "subcommands": {}
+    },
+    "find_phone": {
+        "description": ("Finds who owns a phone number, or the contacts "
+                        "whose phone numbers contain the given digits."),
         "subcommands": {}
     },
     "fake_contacts": {
@@ -100,6 +112,16 @@ command_descriptions_en = {
                         "adds them to an address book."),
         "subcommands": {}
     },
+    "import_contacts": {
+        "description": ("Imports contacts from a CSV, JSON Lines or vCard "
+                        "file and reports the rejected rows."),
+        "subcommands": {}
+    },
+    "export_contacts": {
+        "description": ("Exports contacts to a CSV, JSON Lines or vCard file, "
+                        "or birthdays to an iCalendar (.ics) file."),
+        "subcommands": {}
+    },
     "add_note": {
         "description": ("Starts the process of adding a new note to the "
                         "notebook. Will ask for text, tag(s), reminder."),
@@ -133,7 +155,15 @@ command_descriptions_en = {
         "subcommands": {}
     },
     "search_notes": {
-        "description": "Allows you to search for notes by title or tag.",
+        "description": ("Allows you to search for notes by title or tag, "
+                        "or with a filter query like #work AND #urgent NOT "
+                        "#done or #work has:reminder."),
+        "subcommands": {}
+    },
+    "search_text": {
+        "description": ("Searches the note texts for words and shows the "
+                        "best matching notes first with the matched words "
+                        "highlighted."),
         "subcommands": {}
     },
     "fake_notes": {
@@ -141,6 +171,16 @@ command_descriptions_en = {
                         "adds them to the notebook."),
         "subcommands": {}
     },
+    "import_notes": {
+        "description": ("Imports notes from a CSV or JSON Lines file and "
+                        "reports the rejected rows."),
+        "subcommands": {}
+    },
+    "export_notes": {
+        "description": ("Exports notes to a CSV or JSON Lines file, or "
+                        "reminders to an iCalendar (.ics) file."),
+        "subcommands": {}
+    },
     "close": {
         "description": "Exits the program.",
         "subcommands": {}
@@ -172,7 +212,10 @@ command_names_ua = {
     "all_contacts": "всі-контакти",
     "birthdays": "дні-народження",
     "search_contacts": "пошук-контактів",
+    "find_phone": "пошук-телефону",
     "fake_contacts": "генерувати-контакти",
+    "import_contacts": "імпорт-контактів",
+    "export_contacts": "експорт-контактів",
     "add_note": "додати-нотатку",
     "change_note": "редагувати-нотатку",
     "add_tags": "додати-теги",
@@ -187,7 +230,10 @@ command_names_ua = {
     "all_notes": "всі-нотатки",
     "reminders": "нагадування",
     "search_notes": "пошук-нотаток",
+    "search_text": "пошук-тексту",
     "fake_notes": "генерувати-нотатки",
+    "import_notes": "імпорт-нотаток",
+    "export_notes": "експорт-нотаток",
     "close": "закрити",
     "exit": "вихід",
 }
@@ -198,8 +244,8 @@ command_descriptions_ua = {
         "subcommands": {}
     },
     "settings": {
-        "description": ("Відкрити меню налаштувань для зміни мови або формату "
-                        "дати."),
+        "description": ("Відкрити меню налаштувань для зміни мови, формату "
+                        "дати або унікальності номерів телефонів."),
         "subcommands": {}
     },
     "add_contact": {
@@ -238,7 +284,14 @@ command_descriptions_ua = {
         "subcommands": {}
     },
     "search_contacts": {
-        "description": "Пошук контакту за іменем чи номером телефону.",
+        "description": ("Пошук контакту за іменем чи номером телефону "
+                        "або запитом-фільтром за полями, як-от city:Київ "
+                        "чи missing:email AND month:3."),
+        "subcommands": {}
+    },
+    "find_phone": {
+        "description": ("Знайти власника номера телефону або контакти, "
+                        "номери яких містять вказані цифри."),
         "subcommands": {}
     },
     "fake_contacts": {
@@ -246,6 +299,16 @@ command_descriptions_ua = {
                         "контакти будуть додані в адресну книгу."),
         "subcommands": {}
     },
+    "import_contacts": {
+        "description": ("Імпортувати контакти з файлу CSV, JSON Lines або "
+                        "vCard і показати відхилені рядки."),
+        "subcommands": {}
+    },
+    "export_contacts": {
+        "description": ("Експортувати контакти у файл CSV, JSON Lines або "
+                        "vCard, або дні народження у файл iCalendar (.ics)."),
+        "subcommands": {}
+    },
     "add_note": {
         "description": ("Почати процес додавання нової нотатки. Буде запитано "
                         "назву нотатки, текст, теги та нагадування."),
@@ -278,7 +341,14 @@ command_descriptions_ua = {
         "subcommands": {}
     },
     "search_notes": {
-        "description": "Пошук нотатки за назвою чи тегом.",
+        "description": ("Пошук нотатки за назвою чи тегом або запитом-"
+                        "фільтром, як-от #робота AND #терміново NOT #готово "
+                        "чи #робота has:reminder."),
+        "subcommands": {}
+    },
+    "search_text": {
+        "description": ("Пошук слів у текстах нотаток. Найкращі збіги "
+                        "показуються першими, знайдені слова виділено."),
         "subcommands": {}
     },
     "fake_notes": {
@@ -286,6 +356,16 @@ command_descriptions_ua = {
                         "нотатки будуть додані в книгу."),
         "subcommands": {}
     },
+    "import_notes": {
+        "description": ("Імпортувати нотатки з файлу CSV або JSON Lines і "
+                        "показати відхилені рядки."),
+        "subcommands": {}
+    },
+    "export_notes": {
+        "description": ("Експортувати нотатки у файл CSV або JSON Lines, або "
+                        "нагадування у файл iCalendar (.ics)."),
+        "subcommands": {}
+    },
     "close": {
         "description": "Закрити програму.",
         "subcommands": {}
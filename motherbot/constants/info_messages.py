@@ -17,9 +17,12 @@ info_messages_en = {
     "address_added": "Address added.",
     "address_removed": "Address removed.",
     "no_contacts": "Contacts not found.",
+    "results_shown": "Shown {} of {} results.",
     "upcoming_birthdays": "You have {} upcoming birthday(s) in {} days.",
     "no_birthdays": "There are no upcoming birthdays in the next {} days.",
     "fake_contacts_generated": "Fake contacts generated successfully.",
+    "contacts_imported": "{} contact(s) imported, {} row(s) rejected.",
+    "contacts_exported": "{} contact(s) exported to {}.",
     "note_added": "Note added successfully.",
     "note_edited": "Note edited successfully.",
     "note_deleted": "Note deleted successfully.",
@@ -31,9 +34,14 @@ info_messages_en = {
     "reminder_removed": "Reminder removed.",
     "no_notes": "Notes not found.",
     "fake_notes_generated": "Fake notes generated successfully.",
+    "notes_imported": "{} note(s) imported, {} row(s) rejected.",
+    "notes_exported": "{} note(s) exported to {}.",
     "reminders": "You have {} upcoming reminder(s) in {} days.",
     "no_reminders": "There are no reminders in the next {} days.",
     "settings_changed": "Settings changed successfully.",
+    "merge_conflicts": (
+        "Also changed in another session, your version was kept: {}"
+    ),
     "goodbye": "Good bye!",
 }
 
@@ -52,9 +60,12 @@ info_messages_ua = {
     "address_added": "Адреса додана.",
     "address_removed": "Адреса видалена.",
     "no_contacts": "Контакти не знайдено.",
+    "results_shown": "Показано {} з {} результатів.",
     "upcoming_birthdays": "У вас {} дні(в) народження наступні(ий) {} дні(в).",
     "no_birthdays": "У вас немає днів народження наступні(ий) {} дні(в).",
     "fake_contacts_generated": "Контакти сгенеровано успішно.",
+    "contacts_imported": "Імпортовано контактів: {}, відхилено рядків: {}.",
+    "contacts_exported": "Експортовано контактів: {} у {}.",
     "note_added": "Нотатка додана успішно.",
     "note_edited": "Нотатка редагована успішно.",
     "note_deleted": "Нотатка видалена успішно.",
@@ -66,8 +77,13 @@ info_messages_ua = {
     "reminder_removed": "Нагадування видалено.",
     "no_notes": "Нотатки не знайдено.",
     "fake_notes_generated": "Нотатки сгенеровано успішно.",
+    "notes_imported": "Імпортовано нотаток: {}, відхилено рядків: {}.",
+    "notes_exported": "Експортовано нотаток: {} у {}.",
     "reminders": "У вас {} нагадувань(ня) наступні(ий) {} дні(в).",
     "no_reminders": "У вас немає нагадувань наступні(ий) {} дні(в).",
     "settings_changed": "Налаштування змінено успішно.",
+    "merge_conflicts": (
+        "Також змінено в іншому сеансі, збережено вашу версію: {}"
+    ),
     "goodbye": "До побачення!",
 }
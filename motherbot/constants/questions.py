@@ -18,12 +18,26 @@ questions_en = {
     "days": "Enter number of days: ",
     "contacts": "Enter number of contacts: ",
     "notes": "Enter number of notes: ",
-    "search_contacts": "Enter search term (name or phone number): ",
-    "search_notes": "Enter search term (title or tag): ",
+    "import_file": "Enter file name ({}): ",
+    "export_file": "Enter file name to export to ({}): ",
+    "search_contacts": (
+        "Enter search term (name, phone number or query like "
+        "city:Kyiv missing:email): "
+    ),
+    "search_notes": (
+        "Enter search term (title, tag or query like #work NOT "
+        "has:reminder): "
+    ),
+    "search_text": "Enter words to search for in the note texts: ",
+    "phone_digits": "Enter phone number or its digits: ",
     "skip": "(press Enter to skip) ",
     "back": "[back to main menu CTRL+C] ",
+    "next_page": (
+        "Shown {} of {}. Press Enter for the next page or type q to stop: "
+    ),
     "language": "Enter language ({}): ",
     "date_format": "Enter date format ({}): ",
+    "unique_phones": "Require unique phone numbers (y/n): ",
 }
 
 questions_ua = {
@@ -42,10 +56,25 @@ questions_ua = {
     "days": "Введіть кількість днів: ",
     "contacts": "Введіть кількість контактів: ",
     "notes": "Введіть кількість нотаток: ",
-    "search_contacts": "Введіть пошуковий запит (ім'я або номер телефону): ",
-    "search_notes": "Введіть пошуковий запит (назву або тег): ",
+    "import_file": "Введіть назву файлу ({}): ",
+    "export_file": "Введіть назву файлу для експорту ({}): ",
+    "search_contacts": (
+        "Введіть пошуковий запит (ім'я, номер телефону або запит як "
+        "city:Київ missing:email): "
+    ),
+    "search_notes": (
+        "Введіть пошуковий запит (назву, тег або запит як #робота NOT "
+        "has:reminder): "
+    ),
+    "search_text": "Введіть слова для пошуку в текстах нотаток: ",
+    "phone_digits": "Введіть номер телефону або його цифри: ",
     "skip": "(натисніть Enter, щоб пропустити) ",
     "back": "[повернутися до головного меню CTRL+C] ",
+    "next_page": (
+        "Показано {} з {}. Натисніть Enter для наступної сторінки або "
+        "введіть q, щоб зупинитися: "
+    ),
     "language": "Введіть мову ({}): ",
     "date_format": "Введіть формат дати ({}): ",
+    "unique_phones": "Вимагати унікальні номери телефонів (т/н): ",
 }
@@ -22,9 +22,15 @@ validation_errors_en = {
     ),
     "duplicate_name": "Name \"{}\" already exists.",
     "name_not_found": "Name \"{}\" not found.",
+    "name_suggestion": "Name \"{}\" not found. Did you mean \"{}\"?",
     "invalid_phone": f"Phone number must consist of {PHONE_LENGTH} digits.",
     "duplicate_phone": "Phone number \"{}\" already exists.",
     "phone_not_found": "Phone number \"{}\" not found.",
+    "phone_taken": "Phone number \"{}\" already belongs to {}.",
+    "phones_not_unique": (
+        "Phone numbers belonging to several contacts: {}."
+    ),
+    "invalid_digits": "Enter digits only.",
     "future_birthday": "Birthday cannot be in the future.",
     "invalid_email": "Invalid email address.",
     "invalid_address": (
@@ -48,6 +54,21 @@ validation_errors_en = {
     "invalid_number": "Please enter a valid number.",
     "invalid_language": "Language must be one of: {}",
     "invalid_date_format": "Date format must be one of: {}",
+    "invalid_storage_mode": "Storage mode must be one of: {}",
+    "invalid_snapshot_codec": "Snapshot codec must be one of: {}",
+    "invalid_search_field": "Search field must be one of: {}",
+    "invalid_filter_query": (
+        "Invalid query. Combine field:value, #tag and words with AND, OR, "
+        "NOT and parentheses."
+    ),
+    "invalid_month": "Month must be a number from 1 to 12.",
+    "invalid_parallel_search_size": (
+        "Parallel search size must be a whole number, 0 turns it off."
+    ),
+    "invalid_file_format": "File format must be one of: {}",
+    "file_not_found": "File \"{}\" not found.",
+    "file_unreadable": "Cannot read file \"{}\": {}",
+    "invalid_import_row": "Row must be an object with named fields.",
 }
 
 validation_errors_ua = {
@@ -55,9 +76,17 @@ validation_errors_ua = {
                      f"{NAME_MAX_LENGTH} символів."),
     "duplicate_name": "Ім'я \"{}\" вже існує.",
     "name_not_found": "Ім'я \"{}\" не знайдено.",
+    "name_suggestion": (
+        "Ім'я \"{}\" не знайдено. Можливо, ви мали на увазі \"{}\"?"
+    ),
     "invalid_phone": f"Номер телефону має складатися з {PHONE_LENGTH} цифр.",
     "duplicate_phone": "Номер телефону \"{}\" вже існує.",
     "phone_not_found": "Номер телефону \"{}\" не знайдено.",
+    "phone_taken": "Номер телефону \"{}\" вже належить контакту {}.",
+    "phones_not_unique": (
+        "Номери телефонів, що належать кільком контактам: {}."
+    ),
+    "invalid_digits": "Введіть лише цифри.",
     "future_birthday": "День народження не може бути в майбутньому.",
     "invalid_email": "Невірна адреса електронної пошти.",
     "invalid_address": (
@@ -79,4 +108,19 @@ validation_errors_ua = {
     "invalid_reminder": "Дата нагадування має бути в майбутньому.",
     "invalid_date": "Невірний формат дати. Використовуйте {}.",
     "invalid_number": "Будь ласка, введіть ціле число.",
+    "invalid_storage_mode": "Режим зберігання має бути одним з: {}",
+    "invalid_snapshot_codec": "Кодек знімка має бути одним з: {}",
+    "invalid_search_field": "Поле пошуку має бути одним з: {}",
+    "invalid_filter_query": (
+        "Невірний запит. Поєднуйте поле:значення, #тег і слова за допомогою "
+        "AND, OR, NOT і дужок."
+    ),
+    "invalid_month": "Місяць має бути числом від 1 до 12.",
+    "invalid_parallel_search_size": (
+        "Розмір для паралельного пошуку має бути цілим числом, 0 вимикає його."
+    ),
+    "invalid_file_format": "Формат файлу має бути одним з: {}",
+    "file_not_found": "Файл \"{}\" не знайдено.",
+    "file_unreadable": "Не вдалося прочитати файл \"{}\": {}",
+    "invalid_import_row": "Рядок має бути об'єктом з іменованими полями.",
 }
@@ -4,6 +4,36 @@ Values constants module.
 
 ADDRESS_BOOK_PATH = "address_book.pkl"
 NOTES_BOOK_PATH = "notes_book.pkl"
+JOURNAL_SUFFIX = ".journal"
+TEMP_SUFFIX = ".tmp"
+LOCK_SUFFIX = ".lock"
+LOCK_TIMEOUT = 30
+NOTE_BODIES_SUFFIX = ".bodies"
+SNAPSHOT_MAGIC = b"MOTHERBOT"
+SNAPSHOT_VERSION = 3
+JOURNAL_COMPACT_SIZE = 1024 * 1024
+DATABASE_PATH = "motherbot.db"
+SQLITE_CACHE_SIZE = 1000
+NOTE_BODY_CACHE_SIZE = 256
+VIEW_SUFFIX = ".view"
+VIEW_MAGIC = b"MOTHERVIEW"
+VIEW_VERSION = 1
+VIEW_CACHE_SIZE = 1000
+IO_CHUNK_SIZE = 1024 * 1024
+PROGRESS_MIN_SIZE = 16 * 1024 * 1024
+NGRAM_SIZE = 3
+SEARCH_CANDIDATE_LIMIT = 1000
+SEARCH_INDEX_MIN_SIZE = 20_000
+SEARCH_PAGE_SIZE = 20
+SEARCH_CACHE_SIZE = 64
+BK_NAME_DISTANCE = 2
+BK_PHONE_DISTANCE = 1
+SNIPPET_WORDS = 12
+BM25_K1 = 1.2
+BM25_B = 0.75
+FUZZY_MATCH_THRESHOLD = 70
+PARALLEL_SCORING_MIN_CHOICES = 10000
+PARALLEL_SEARCH_MIN_SIZE = 200_000
 NAME_MIN_LENGTH = 1
 NAME_MAX_LENGTH = 30
 PHONE_LENGTH = 10
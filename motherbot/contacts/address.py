@@ -4,9 +4,10 @@ Address field module.
 
 from ..settings.app_settings import app_settings
 from ..constants.values import ADDRESS_MIN_LENGTH, ADDRESS_MAX_LENGTH
+from ..helpers.restorable import Restorable
 
 
-class Address:
+class Address(Restorable):
     """
     Class representing an address field.
     """
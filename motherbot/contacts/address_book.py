@@ -4,12 +4,42 @@ Address book module.
 
 from typing import List
 from collections import UserDict
-from datetime import datetime
-from fuzzywuzzy import fuzz
+from concurrent.futures import BrokenExecutor
+from datetime import date, datetime
 from .record import Record
 from ..helpers.colors import warning
 from ..helpers.display import wrap_text, display_table, highlight_term
+from ..helpers.bk_tree import BKTree
+from ..helpers.field_index import (
+    SEARCH_FIELDS,
+    FieldIndex,
+    address_values,
+    email_values,
+    field_query_values,
+)
+from ..helpers.filter_query import (
+    Predicate,
+    parse_date_range,
+    run_filter_query,
+)
+from ..helpers.ngram_index import NgramIndex
+from ..helpers.parallel_search import ShardedScorer
+from ..helpers.phone_index import PhoneIndex
+from ..helpers.scoring import score_entries, top_keys
+from ..helpers.search_cache import SearchCache
 from ..settings.app_settings import app_settings
+from ..constants.values import (
+    BK_NAME_DISTANCE,
+    BK_PHONE_DISTANCE,
+    PHONE_LENGTH,
+    SEARCH_INDEX_MIN_SIZE,
+)
+
+FILTER_FIELDS = [
+    "name", "phone", *SEARCH_FIELDS, "birthday", "month", "has", "missing"
+]
+HAS_FIELDS = ["phone", "email", "address", "birthday"]
+PHRASE_FIELDS = {"name", "address", "street", "city", "country"}
 
 
 class AddressBook(UserDict):
@@ -21,6 +51,332 @@ class AddressBook(UserDict):
         super().__init__()
         self.language = "en"
         self.date_str_format = "DD.MM.YYYY"
+        self.unique_phones = False
+        self._changes = {}
+        self._base = {}
+        self._index = None
+        self._phone_index = None
+        self._field_index = None
+        self._name_tree = None
+        self._phone_tree = None
+        self._parallel_scorer = None
+        self._version = 0
+        self._search_cache = SearchCache()
+
+    def __getstate__(self) -> dict:
+        """
+        Returns the state to be pickled, without unsaved changes tracking,
+        the search indexes, the search cache and the search worker
+        processes.
+        """
+        state = self.__dict__.copy()
+        state.pop("_changes", None)
+        state.pop("_base", None)
+        state.pop("_index", None)
+        state.pop("_phone_index", None)
+        state.pop("_field_index", None)
+        state.pop("_name_tree", None)
+        state.pop("_phone_tree", None)
+        state.pop("_parallel_scorer", None)
+        state.pop("_version", None)
+        state.pop("_search_cache", None)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """
+        Restores the pickled state, resets changes tracking and binds the
+        records to the book.
+        """
+        self.unique_phones = False
+        self.__dict__.update(state)
+        self._changes = {}
+        self._base = {}
+        self._index = None
+        self._phone_index = None
+        self._field_index = None
+        self._name_tree = None
+        self._phone_tree = None
+        self._parallel_scorer = None
+        self._version = 0
+        self._search_cache = SearchCache()
+        for record in self.data.values():
+            record.bind(self)
+
+    def to_primitives(self) -> tuple[dict, list]:
+        """
+        Returns the book as plain values for compact snapshots.
+
+        Returns:
+            tuple[dict, list]: The book settings and the list of records,
+            each converted with `Record.to_primitives`.
+        """
+        state = self.__getstate__()
+        state.pop("data", None)
+        return state, [record.to_primitives() for record in self.data.values()]
+
+    @classmethod
+    def from_primitives(cls, state: dict, entries: list) -> "AddressBook":
+        """
+        Creates a book from the values returned by `to_primitives` without
+        validating the records again.
+
+        Args:
+            state (dict): The book settings.
+            entries (list): The records converted to plain values.
+
+        Returns:
+            AddressBook: The restored book.
+        """
+        book = cls()
+        book.__dict__.update(state)
+        for primitives in entries:
+            record = Record.from_primitives(primitives)
+            record.bind(book)
+            book.data[record.name.value.lower()] = record
+        return book
+
+    def mark_changed(self, record: Record | None = None) -> None:
+        """
+        Marks a record as changed since the last save. Without a record the
+        book settings (language, date format) are marked as changed.
+
+        Args:
+            record (Record, optional): The record that was edited in place.
+        """
+        if record is None:
+            self._changes[None] = "state"
+        else:
+            self._changes[record.name.value.lower()] = "put"
+            self.update_index(record.name.value.lower(), record)
+
+    def pop_changes(self) -> dict:
+        """
+        Returns the changes made since the last save and resets them.
+
+        Returns:
+            dict: A mapping of normalized names to "put" or "delete", the
+            `None` key maps to "state" if the book settings were changed.
+        """
+        changes, self._changes = self._changes, {}
+        self._base = {}
+        for key, operation in changes.items():
+            if operation == "put" and key in self.data:
+                self.data[key].mark_clean()
+        return changes
+
+    def remember_base(self, record: Record) -> None:
+        """
+        Remembers the saved version of a record before it is first changed
+        or deleted, to tell at the next save whether another session
+        changed it too.
+
+        Args:
+            record (Record): The record as it was last saved.
+        """
+        self._base.setdefault(
+            record.name.value.lower(), record.to_primitives()
+        )
+
+    def base_primitives(self, key: str) -> tuple | None:
+        """
+        Returns the saved version of an entry changed since the last save.
+
+        Args:
+            key (str): The normalized name of the record.
+
+        Returns:
+            tuple | None: The record as returned by `Record.to_primitives`
+            before it was changed, or None if it was added since the last
+            save.
+        """
+        return self._base.get(key)
+
+    @property
+    def changes(self) -> dict:
+        """
+        Returns the changes made since the last save without resetting them.
+
+        Returns:
+            dict: A mapping of normalized names to the pending operations,
+            see `pop_changes`.
+        """
+        return dict(self._changes)
+
+    def restore_changes(self, changes: dict) -> None:
+        """
+        Restores the pending changes, e.g. after the entries added by an
+        interrupted import are deleted again.
+
+        Args:
+            changes (dict): The changes returned by `changes` before.
+        """
+        self._changes = dict(changes)
+
+    @property
+    def search_index(self) -> NgramIndex:
+        """
+        Returns the n-gram index of the names and phone numbers of the
+        contacts, building it on first use.
+        """
+        if self._index is None:
+            self._index = NgramIndex()
+            for key, record in self.data.items():
+                self._index.update(key, self._index_texts(key, record))
+        return self._index
+
+    @staticmethod
+    def _index_texts(key: str, record: Record) -> list[str]:
+        """
+        Returns the texts of a record to be indexed: the normalized name and
+        the phone numbers.
+        """
+        return [key, *(str(phone) for phone in record.phones)]
+
+    @property
+    def field_index(self) -> FieldIndex:
+        """
+        Returns the index of the emails and addresses of the contacts,
+        building it on first use.
+        """
+        if self._field_index is None:
+            self._field_index = FieldIndex()
+            for key, record in self.data.items():
+                self._field_index.update(key, self._field_values(record))
+        return self._field_index
+
+    @staticmethod
+    def _field_values(record: Record) -> list[tuple[str, str]]:
+        """
+        Returns the field values of a record to be indexed, see
+        `email_values` and `address_values`.
+        """
+        values = []
+        if record.email:
+            values += email_values(record.email.value)
+        if record.address:
+            values += address_values(record.address.value)
+        return values
+
+    @property
+    def parallel_scorer(self) -> ShardedScorer | None:
+        """
+        Returns the scorer of the names and phone numbers of the contacts in
+        worker processes, starting it on first use, or None if the book has
+        fewer than `app_settings.parallel_search_size` contacts.
+        """
+        size = app_settings.parallel_search_size
+        if not size or len(self.data) < size:
+            return None
+        if self._parallel_scorer is None:
+            self._parallel_scorer = ShardedScorer(
+                (key, self._index_texts(key, record))
+                for key, record in self.data.items()
+            )
+        return self._parallel_scorer
+
+    def _score_contacts(
+        self, search_term: str, names: list[str]
+    ) -> dict[str, int]:
+        """
+        Scores the names and phone numbers of the contacts with
+        `score_entries`, in worker processes for large books.
+        """
+        scorer = self.parallel_scorer
+        if scorer is not None:
+            try:
+                return scorer.score(search_term, names)
+            except BrokenExecutor:
+                # The workers are started again by the next search
+                scorer.close()
+                self._parallel_scorer = None
+        return score_entries(search_term, {
+            name: self._index_texts(name, self.data[name]) for name in names
+        })
+
+    @property
+    def phone_index(self) -> PhoneIndex:
+        """
+        Returns the index of the phone numbers of the contacts, building it
+        on first use.
+        """
+        if self._phone_index is None:
+            self._phone_index = PhoneIndex(self.phone_numbers())
+        return self._phone_index
+
+    @property
+    def name_tree(self) -> BKTree:
+        """
+        Returns the BK-tree of the normalized names of the contacts,
+        building it on first use.
+        """
+        if self._name_tree is None:
+            self._name_tree = BKTree(self.data)
+        return self._name_tree
+
+    @property
+    def phone_tree(self) -> BKTree:
+        """
+        Returns the BK-tree of the distinct phone numbers of the contacts,
+        building it on first use.
+        """
+        if self._phone_tree is None:
+            self._phone_tree = BKTree(self.phone_index)
+        return self._phone_tree
+
+    def update_index(self, key: str, record: Record | None) -> None:
+        """
+        Updates the search indexes after a record was added, edited or
+        deleted, and bumps the version of the book, which invalidates the
+        cached search results. Indexes that are not built yet are skipped.
+
+        Args:
+            key (str): The normalized name of the record.
+            record (Record | None): The record or None if it was deleted.
+
+        Returns:
+            None
+        """
+        self._version += 1
+        if self._name_tree is not None:
+            if record is None:
+                self._name_tree.discard(key)
+            else:
+                self._name_tree.add(key)
+        if self._phone_index is not None:
+            old_phones = self._phone_index.phones(key)
+            new_phones = frozenset(
+                str(phone) for phone in record.phones
+            ) if record is not None else frozenset()
+            self._phone_index.update(key, new_phones)
+            # The phone tree is only built on top of the phone index
+            if self._phone_tree is not None:
+                for phone in old_phones - new_phones:
+                    if phone not in self._phone_index:
+                        self._phone_tree.discard(phone)
+                for phone in new_phones - old_phones:
+                    self._phone_tree.add(phone)
+        if self._field_index is not None:
+            self._field_index.update(
+                key, self._field_values(record) if record is not None else ()
+            )
+        if self._parallel_scorer is not None:
+            self._parallel_scorer.update(
+                key,
+                None if record is None else self._index_texts(key, record),
+            )
+        if self._index is None:
+            return
+        if record is None:
+            self._index.remove(key)
+        else:
+            self._index.update(key, self._index_texts(key, record))
+
+    @property
+    def is_dirty(self) -> bool:
+        """
+        Returns True if the book was changed since it was last saved.
+        """
+        return bool(self._changes)
 
     def add_record(self, new_record: Record) -> None:
         """
@@ -30,7 +386,9 @@ class AddressBook(UserDict):
             new_record (Record): The record to be added.
 
         Raises:
-            ValueError: If a contact with the same name already exists.
+            ValueError: If a contact with the same name already exists, or if
+            phone numbers must be unique and one of the record's numbers
+            belongs to another contact.
         """
         normalized_name = new_record.name.value.lower()
         if normalized_name in self.data:
@@ -38,7 +396,245 @@ class AddressBook(UserDict):
                 app_settings.get_validation_errors()["duplicate_name"]
                 .format(new_record.name.value)
             )
+        for phone in new_record.phones:
+            self.check_phone(str(phone), normalized_name)
         self.data[normalized_name] = new_record
+        new_record.bind(self)
+        self._changes[normalized_name] = "put"
+        self.update_index(normalized_name, new_record)
+
+    def check_phone(self, phone: str, key: str) -> None:
+        """
+        Checks that a phone number can be added to a contact. Unless phone
+        numbers must be unique across the book, any number can.
+
+        Args:
+            phone (str): The phone number.
+            key (str): The normalized name of the contact.
+
+        Raises:
+            ValueError: If phone numbers must be unique and the number
+            belongs to another contact.
+
+        Returns:
+            None
+        """
+        if not self.unique_phones:
+            return
+        owners = self.phone_index.owners(phone) - {key}
+        if owners:
+            raise ValueError(
+                app_settings.get_validation_errors()["phone_taken"]
+                .format(phone, self.data[min(owners)].name.value)
+            )
+
+    def set_unique_phones(self, unique: bool) -> None:
+        """
+        Turns the book-wide uniqueness check of phone numbers on or off.
+
+        Args:
+            unique (bool): Whether a phone number may only belong to one
+            contact.
+
+        Raises:
+            ValueError: If the check is turned on while some phone numbers
+            belong to several contacts.
+
+        Returns:
+            None
+        """
+        if unique == self.unique_phones:
+            return
+        if unique:
+            shared = self.phone_index.shared()
+            if shared:
+                raise ValueError(
+                    app_settings.get_validation_errors()["phones_not_unique"]
+                    .format(", ".join(sorted(shared)))
+                )
+        self.unique_phones = unique
+        self.mark_changed()
+
+    def find_by_phone(self, phone: str) -> list[Record]:
+        """
+        Finds the records that have the given phone number.
+
+        Args:
+            phone (str): The phone number.
+
+        Returns:
+            list[Record]: The records with the phone number.
+        """
+        return [
+            self.data[key] for key in sorted(self.phone_index.owners(phone))
+        ]
+
+    def search_phones(self, digits: str) -> list[Record]:
+        """
+        Finds the records with a phone number containing the digits. The
+        numbers starting with the digits are found in the phone index and
+        come first, the other ones are looked up in the search index.
+
+        Args:
+            digits (str): The digits to search for.
+
+        Returns:
+            list[Record]: The records with a matching phone number.
+        """
+        keys = {
+            key: None
+            for phone in self.phone_index.with_prefix(digits)
+            for key in sorted(self.phone_index.owners(phone))
+        }
+        for key in self.search_index.candidates(digits, limit=0):
+            if any(digits in phone for phone in self.phone_index.phones(key)):
+                keys.setdefault(key)
+        return [self.data[key] for key in keys]
+
+    def birthday_keys(self, start: date, end: date) -> set[str] | None:
+        """
+        Returns the contacts born within the inclusive date range from an
+        index of the birthdays. The records of this book are kept in memory
+        and have no such index.
+
+        Args:
+            start (date): The first date of the range.
+            end (date): The last date of the range.
+
+        Returns:
+            set[str] | None: The normalized names of the contacts, or None if
+            the book has no index of the birthdays.
+        """
+        return None
+
+    def email_keys(self, email: str) -> set[str]:
+        """
+        Returns the contacts with the given email address from the field
+        index.
+
+        Args:
+            email (str): The email address in lower case.
+
+        Returns:
+            set[str]: The normalized names of the contacts.
+        """
+        return self.field_index.keys("email", email)
+
+    def _filter_predicate(self, field: str | None, value: str) -> Predicate:
+        """
+        Returns the predicate of a filter query on a field of the records,
+        see `run_filter_query`. Names, phone numbers, emails and addresses
+        are looked up in the search indexes, whole email addresses with
+        `email_keys` and birthdays in the index of the birthdays if the book
+        has one.
+        """
+        validation_errors = app_settings.get_validation_errors()
+        field = field or "name"
+        if field == "name":
+            term = value.strip().lower()
+            return Predicate(
+                lambda record: term in record.name.value.lower(),
+                lambda: {
+                    key for key in self.search_index.candidates(term, limit=0)
+                    if term in key
+                },
+            )
+        if field == "phone":
+            digits = value.strip()
+            if not digits.isdigit():
+                raise ValueError(validation_errors["invalid_digits"])
+
+            def lookup() -> set[str]:
+                if len(digits) == PHONE_LENGTH:
+                    return self.phone_index.owners(digits)
+                return {
+                    key
+                    for key in self.search_index.candidates(digits, limit=0)
+                    if any(
+                        digits in phone
+                        for phone in self.phone_index.phones(key)
+                    )
+                }
+
+            return Predicate(
+                lambda record: any(
+                    digits in str(phone) for phone in record.phones
+                ),
+                lookup,
+            )
+        if field in SEARCH_FIELDS:
+            values = field_query_values(field, value)
+            return Predicate(
+                lambda record: bool(values) and set(values).issubset(
+                    self._field_values(record)
+                ),
+                lambda: set.intersection(*(
+                    self.email_keys(field_value[1])
+                    if field_value[0] == "email"
+                    else self.field_index.keys(*field_value)
+                    for field_value in values
+                )) if values else set(),
+            )
+        if field == "birthday":
+            start, end = parse_date_range(value)
+            return Predicate(
+                lambda record: record.birthday is not None
+                and start <= record.birthday.value <= end,
+                lambda: self.birthday_keys(start, end),
+            )
+        if field == "month":
+            month = value.strip()
+            if not month.isdigit() or not 1 <= int(month) <= 12:
+                raise ValueError(validation_errors["invalid_month"])
+            return Predicate(
+                lambda record: record.birthday is not None
+                and record.birthday.value.month == int(month)
+            )
+        if field == "has" and value.strip().lower() in HAS_FIELDS:
+            has_field = value.strip().lower()
+            if has_field == "phone":
+                return Predicate(
+                    lambda record: bool(record.phones),
+                    self.phone_index.keys,
+                )
+            return Predicate(
+                lambda record: getattr(record, has_field) is not None
+            )
+        if field == "has":
+            raise ValueError(
+                validation_errors["invalid_search_field"]
+                .format(", ".join(HAS_FIELDS))
+            )
+        raise ValueError(
+            validation_errors["invalid_search_field"]
+            .format(", ".join(FILTER_FIELDS))
+        )
+
+    def filter(self, query: str) -> list[Record]:
+        """
+        Finds the records matching a filter query, e.g.
+        `missing:email AND month:3` or `city:Kyiv OR phone:050`, see
+        `run_filter_query`.
+
+        Plain words match the names. The fields are `name`, `phone`,
+        `email`, `domain`, `address`, `street`, `city`, `country`,
+        `birthday` (a date range), `month` (of the birthday) and `has` or
+        `missing` with `phone`, `email`, `address` or `birthday`.
+
+        Args:
+            query (str): The filter query.
+
+        Raises:
+            ValueError: If the query is invalid or uses an unknown field.
+
+        Returns:
+            list[Record]: The matching records sorted by name.
+        """
+        keys = run_filter_query(
+            query, self._filter_predicate, lambda: set(self.data),
+            self.data.__getitem__, PHRASE_FIELDS,
+        )
+        return [self.data[key] for key in keys]
 
     def find(self, contact_name: str) -> Record:
         """
@@ -56,9 +652,42 @@ class AddressBook(UserDict):
         normalized_name = contact_name.strip().lower()
         if normalized_name in self.data:
             return self.data[normalized_name]
-        raise ValueError(
-            app_settings.get_validation_errors()["name_not_found"]
-            .format(contact_name)
+        raise self._name_not_found(contact_name)
+
+    def suggest_name(self, contact_name: str) -> Record | None:
+        """
+        Finds the contact whose name is closest to a misspelled name, within
+        `BK_NAME_DISTANCE` edits and less than half of the name.
+
+        Args:
+            contact_name (str): The misspelled name.
+
+        Returns:
+            Record | None: The closest contact or None if no name is close
+            enough.
+        """
+        normalized_name = contact_name.strip().lower()
+        for distance, name in self.name_tree.search(
+            normalized_name, BK_NAME_DISTANCE
+        ):
+            if 2 * distance < len(normalized_name):
+                return self.data[name]
+        return None
+
+    def _name_not_found(self, contact_name: str) -> ValueError:
+        """
+        Returns the error for a name that is not in the book, suggesting the
+        closest name if there is one.
+        """
+        validation_errors = app_settings.get_validation_errors()
+        suggestion = self.suggest_name(contact_name)
+        if suggestion is not None:
+            return ValueError(
+                validation_errors["name_suggestion"]
+                .format(contact_name, suggestion.name.value)
+            )
+        return ValueError(
+            validation_errors["name_not_found"].format(contact_name)
         )
 
     def delete(self, contact_name: str) -> None:
@@ -73,11 +702,11 @@ class AddressBook(UserDict):
         """
         normalized_name = contact_name.lower()
         if normalized_name not in self.data:
-            raise ValueError(
-                app_settings.get_validation_errors()["name_not_found"]
-                .format(contact_name)
-            )
-        del self.data[normalized_name]
+            raise self._name_not_found(contact_name)
+        self.data[normalized_name].before_change()
+        self.data.pop(normalized_name).bind(None)
+        self._changes[normalized_name] = "delete"
+        self.update_index(normalized_name, None)
 
     def upcoming_birthdays(self, days: int, short: bool = False) -> str:
         """
@@ -130,59 +759,88 @@ class AddressBook(UserDict):
         )
         return display_table(headers, sorted_birthdays)
 
-    def smart_search(self, search_term: str) -> list:
+    def phone_numbers(self) -> list[tuple[str, str]]:
         """
-        Smart search that finds contacts even with typos and suggests contacts
-          as the user types.
-        Args:
-            search_term (str): The term to search for in the contact names and
-              phone numbers.
-            limit (int): The maximum number of suggestions to return.
-            Returns:
-            list: A list of `Record` instances that match the search term with
-              fuzzy matching.
+        Returns the phone numbers of all contacts.
+
+        Returns:
+            list[tuple[str, str]]: Pairs of a phone number and the normalized
+            name of its contact.
         """
-        search_term = search_term.lower()
-        names = list(self.data)
-        phone_numbers = [
+        return [
             (str(phone), name)
             for name, record in self.data.items()
             for phone in record.phones
         ]
 
-        matched_names = {}
+    def search_scores(self, search_term: str) -> dict[str, int]:
+        """
+        Scores the contacts matching the search term, even with typos.
+
+        Books with fewer than `SEARCH_INDEX_MIN_SIZE` contacts are scored
+        whole with fuzzy matching, see `score_entries`. In larger books only
+        the candidates found in the n-gram index of the names and phone
+        numbers, and for a phone number the contacts with a number within
+        `BK_PHONE_DISTANCE` edits found in the phone BK-tree, are scored, so
+        weak matches of a term sharing few n-grams with them may be missed,
+        see `NgramIndex.candidates`. Books with at least
+        `app_settings.parallel_search_size` contacts are scored in worker
+        processes, see `ShardedScorer`. The results of the last terms
+        are cached until the book changes.
 
-        for name in names:
-            if search_term in name:
-                matched_names[name] = name.count(search_term) * 100
-            else:
-                match = fuzz.partial_ratio(search_term, name)
-                if match >= 70:
-                    matched_names[name] = match
-
-        for phone, name in phone_numbers:
-            if search_term in phone:
-                matched_names[name] = (
-                    matched_names.get(name, 0)
-                    + phone.count(search_term) * 100
-                )
-            else:
-                match = fuzz.ratio(search_term, phone)
-                if match >= 70:
-                    matched_names[name] = matched_names.get(name, 0) + match
-
-        sorted_names = sorted(
-            matched_names.items(),
-            key=lambda x: x[1],
-            reverse=True
-        )
+        Args:
+            search_term (str): The term to search for in the contact names and
+              phone numbers.
 
-        results = []
-        for name, _ in sorted_names:
-            record = self.find(name)
-            results.append(record)
+        Returns:
+            dict[str, int]: The scores of the matching contacts by normalized
+            name.
+        """
+        search_term = search_term.lower()
+        cached = self._search_cache.get(search_term, self._version)
+        if cached is not None:
+            return dict(cached)
+        if len(self.data) < SEARCH_INDEX_MIN_SIZE:
+            names = list(self.data)
+        else:
+            names = self.search_index.candidates(search_term)
+            if (
+                search_term.isdigit()
+                and len(search_term) >= PHONE_LENGTH - BK_PHONE_DISTANCE
+            ):
+                # A mistyped phone number may share few n-grams with it
+                names += sorted({
+                    name
+                    for _, phone in self.phone_tree.search(
+                        search_term, BK_PHONE_DISTANCE
+                    )
+                    for name in self.phone_index.owners(phone)
+                }.difference(names))
+        matched_names = self._score_contacts(search_term, names)
+        self._search_cache.put(search_term, self._version, matched_names)
+        return dict(matched_names)
+
+    def smart_search(
+        self, search_term: str, limit: int | None = None, offset: int = 0
+    ) -> list:
+        """
+        Smart search that finds contacts even with typos and suggests contacts
+          as the user types.
+
+        Args:
+            search_term (str): The term to search for in the contact names and
+              phone numbers.
+            limit (int | None, optional): The maximum number of contacts to
+              return, all matching contacts if None.
+            offset (int, optional): The number of best matching contacts to
+              skip.
 
-        return results
+        Returns:
+            list: A list of `Record` instances that match the search term with
+              fuzzy matching, best matches first.
+        """
+        scores = self.search_scores(search_term)
+        return [self.find(name) for name in top_keys(scores, limit, offset)]
 
     @staticmethod
     def display_contacts(
@@ -220,13 +878,21 @@ class AddressBook(UserDict):
                 ])
             else:
                 phones = "\n".join(map(str, contact.phones))
+            address = (
+                wrap_text(str(contact.address), width=30)
+                if contact.address else "-"
+            )
+            if search_term and field == "address" and contact.address:
+                address = highlight_term(address, search_term)
+            email = str(contact.email) if contact.email else "-"
+            if search_term and field == "email" and contact.email:
+                email = highlight_term(email, search_term)
             table.append([
                 name,
                 phones if contact.phones else "-",
                 str(contact.birthday) if contact.birthday else "-",
-                (wrap_text(str(contact.address), width=30)
-                    if contact.address else "-"),
-                str(contact.email) if contact.email else "-",
+                address,
+                email,
             ])
 
         return display_table(headers, table)
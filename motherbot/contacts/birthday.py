@@ -4,9 +4,10 @@ Birthday field module.
 
 from datetime import datetime
 from ..settings.app_settings import app_settings
+from ..helpers.restorable import Restorable
 
 
-class Birthday:
+class Birthday(Restorable):
     """
     Class representing a birthday field.
     """
@@ -5,9 +5,12 @@ Email field module.
 import re
 from ..settings.app_settings import app_settings
 from ..constants.values import EMAIL_PATTERN
+from ..helpers.restorable import Restorable
 
+EMAIL_REGEX = re.compile(EMAIL_PATTERN)
 
-class Email:
+
+class Email(Restorable):
     """
     Class representing an email field.
     """
@@ -22,7 +25,7 @@ class Email:
         Raises:
             ValueError: If the email does not meet the validation criteria.
         """
-        if not re.match(EMAIL_PATTERN, email):
+        if not EMAIL_REGEX.match(email):
             raise ValueError(
                 app_settings.get_validation_errors()["invalid_email"]
             )
@@ -0,0 +1,38 @@
+"""
+Memory-mapped address book module.
+"""
+
+from .address_book import AddressBook
+from .record import Record
+from ..helpers.mapped_storage import MappedMapping
+
+
+class MappedAddressBook(AddressBook):
+    """
+    Read-only address book opened from a memory-mapped view file.
+
+    Only the names of the contacts are read when the book is opened, a
+    record is decoded when a query or display uses it. Changes made to the
+    book are kept in memory and never written back to the view.
+    """
+
+    def __init__(self, filename: str) -> None:
+        """
+        Opens the address book from a view file.
+
+        Args:
+            filename (str): The name of the view file.
+        """
+        super().__init__()
+        self.data = MappedMapping(
+            filename,
+            decode=Record.from_primitives,
+            bind=lambda record: record.bind(self),
+        )
+        self.__dict__.update(self.data.state)
+
+    def close(self) -> None:
+        """
+        Closes the view file.
+        """
+        self.data.close()
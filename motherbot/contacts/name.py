@@ -4,9 +4,10 @@ Name field module.
 
 from ..settings.app_settings import app_settings
 from ..constants.values import NAME_MIN_LENGTH, NAME_MAX_LENGTH
+from ..helpers.restorable import Restorable
 
 
-class Name:
+class Name(Restorable):
     """
     Class representing a name field.
     """
@@ -6,9 +6,12 @@ import re
 from typing import Union
 from ..settings.app_settings import app_settings
 from ..constants.values import PHONE_PATTERN
+from ..helpers.restorable import Restorable
 
+PHONE_REGEX = re.compile(PHONE_PATTERN)
 
-class Phone:
+
+class Phone(Restorable):
     """
     Class representing a phone field.
     """
@@ -23,7 +26,7 @@ class Phone:
         Raises:
             ValueError: If the phone number does not consist of 10 digits.
         """
-        if not re.match(PHONE_PATTERN, phone):
+        if not PHONE_REGEX.match(phone):
             raise ValueError(
                 app_settings.get_validation_errors()["invalid_phone"]
             )
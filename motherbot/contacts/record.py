@@ -2,6 +2,7 @@
 Record module.
 """
 
+from datetime import date
 from typing import List, Optional
 from .name import Name
 from .phone import Phone
@@ -35,6 +36,108 @@ class Record:
         self.birthday: Optional[Birthday] = None
         self.email: Optional[Email] = None
         self.address: Optional[Address] = None
+        self._book = None
+        self._dirty = True
+
+    def __getstate__(self) -> dict:
+        """
+        Returns the state to be pickled, without the book and changes
+        tracking.
+        """
+        state = self.__dict__.copy()
+        state.pop("_book", None)
+        state.pop("_dirty", None)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """
+        Restores the pickled state of a record saved to disk.
+        """
+        self.__dict__.update(state)
+        self._book = None
+        self._dirty = False
+
+    def to_primitives(self) -> tuple:
+        """
+        Returns the record as a tuple of plain values for compact snapshots.
+
+        Returns:
+            tuple: The name, the list of phones, the birthday as a date
+            ordinal, the email and the address, with None for missing fields.
+        """
+        return (
+            self.name.value,
+            [phone.value for phone in self.phones],
+            self.birthday.value.toordinal() if self.birthday else None,
+            self.email.value if self.email else None,
+            self.address.value if self.address else None,
+        )
+
+    @classmethod
+    def from_primitives(cls, primitives: tuple) -> "Record":
+        """
+        Creates a record from the values returned by `to_primitives` without
+        validating the fields again.
+
+        Args:
+            primitives (tuple): The values of the record fields.
+
+        Returns:
+            Record: The restored record.
+        """
+        name, phones, birthday, email, address = primitives
+        record = cls.__new__(cls)
+        record.name = Name.restore(name)
+        record.phones = [Phone.restore(phone) for phone in phones]
+        record.birthday = (
+            Birthday.restore(date.fromordinal(birthday))
+            if birthday is not None else None
+        )
+        record.email = Email.restore(email) if email is not None else None
+        record.address = (
+            Address.restore(address) if address is not None else None
+        )
+        record._book = None
+        record._dirty = False
+        return record
+
+    @property
+    def is_dirty(self) -> bool:
+        """
+        Returns True if the record was changed since it was last saved.
+        """
+        return self._dirty
+
+    def bind(self, book) -> None:
+        """
+        Binds the record to the address book that tracks its changes.
+
+        Args:
+            book (AddressBook | None): The address book holding the record.
+        """
+        self._book = book
+
+    def before_change(self) -> None:
+        """
+        Lets the address book remember the saved version of the record
+        before the record is first changed since it was last saved.
+        """
+        if not self._dirty and self._book is not None:
+            self._book.remember_base(self)
+
+    def mark_dirty(self) -> None:
+        """
+        Marks the record as changed and reports it to its address book.
+        """
+        self._dirty = True
+        if self._book is not None:
+            self._book.mark_changed(self)
+
+    def mark_clean(self) -> None:
+        """
+        Marks the record as saved.
+        """
+        self._dirty = False
 
     def add_phone(self, phone: str) -> None:
         """
@@ -44,7 +147,9 @@ class Record:
             phone (str): The phone number to add.
 
         Raises:
-            ValueError: If the phone number already exists in the record.
+            ValueError: If the phone number already exists in the record, or
+            if phone numbers must be unique in the address book of the record
+            and the number belongs to another contact.
         """
         new_phone = Phone(phone)
         if new_phone in self.phones:
@@ -52,7 +157,11 @@ class Record:
                 app_settings.get_validation_errors()["duplicate_phone"]
                 .format(phone)
             )
+        if self._book is not None:
+            self._book.check_phone(new_phone.value, self.name.value.lower())
+        self.before_change()
         self.phones.append(new_phone)
+        self.mark_dirty()
 
     def remove_phone(self, phone: str) -> None:
         """
@@ -67,7 +176,9 @@ class Record:
         """
         phone_to_remove = Phone(phone)
         if phone_to_remove in self.phones:
+            self.before_change()
             self.phones.remove(phone)
+            self.mark_dirty()
         else:
             raise ValueError(
                 app_settings.get_validation_errors()["phone_not_found"]
@@ -81,13 +192,17 @@ class Record:
         Args:
             birthday (str): The birthday to be added.
         """
+        self.before_change()
         self.birthday = Birthday(birthday)
+        self.mark_dirty()
 
     def remove_birthday(self) -> None:
         """
         Removes the birthday from the record.
         """
+        self.before_change()
         self.birthday = None
+        self.mark_dirty()
 
     def add_address(self, address: str) -> None:
         """
@@ -96,7 +211,9 @@ class Record:
         Args:
             address (str): The address to be added.
         """
+        self.before_change()
         self.address = Address(address)
+        self.mark_dirty()
 
     def remove_address(self) -> None:
         """
@@ -105,7 +222,9 @@ class Record:
         Returns:
             None
         """
+        self.before_change()
         self.address = None
+        self.mark_dirty()
 
     def add_email(self, email: str) -> None:
         """
@@ -114,10 +233,14 @@ class Record:
         Args:
             email (str): The email address to be added.
         """
+        self.before_change()
         self.email = Email(email)
+        self.mark_dirty()
 
     def remove_email(self) -> None:
         """
         Removes the email address from the record.
         """
+        self.before_change()
         self.email = None
+        self.mark_dirty()
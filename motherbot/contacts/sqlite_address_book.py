@@ -0,0 +1,131 @@
+"""
+SQLite address book module.
+"""
+
+import sqlite3
+from datetime import date
+from .address_book import AddressBook
+from .record import Record
+from ..helpers.sqlite_storage import SQLiteMapping, load_meta, save_meta
+
+
+class SQLiteAddressBook(AddressBook):
+    """
+    Address book whose records are stored in a SQLite database.
+
+    Records are written to the database as soon as they are added, edited or
+    deleted and committed on save. Names, emails and birthdays are indexed
+    columns, phones are kept in the indexed `contacts_phone` table.
+    """
+
+    def __init__(self, connection: sqlite3.Connection) -> None:
+        """
+        Initializes the address book on top of an open database.
+
+        Args:
+            connection (sqlite3.Connection): The database connection.
+        """
+        super().__init__()
+        self.connection = connection
+        self.data = SQLiteMapping(
+            connection,
+            "contacts",
+            columns={
+                "name": lambda record: record.name.value,
+                "email": lambda record: (
+                    record.email.value.lower() if record.email else None
+                ),
+                "birthday": lambda record: (
+                    record.birthday.value.isoformat()
+                    if record.birthday else None
+                ),
+            },
+            multi_columns={
+                "phone": lambda record: [
+                    phone.value for phone in record.phones
+                ],
+            },
+            bind=lambda record: record.bind(self),
+        )
+        self.language = load_meta(connection, "language", self.language)
+        self.date_str_format = load_meta(
+            connection, "date_str_format", self.date_str_format
+        )
+        self.unique_phones = load_meta(
+            connection, "unique_phones", self.unique_phones
+        )
+
+    def mark_changed(self, record: Record | None = None) -> None:
+        """
+        Marks a record or the book settings as changed and writes them to the
+        database.
+
+        Args:
+            record (Record, optional): The record that was edited in place.
+        """
+        super().mark_changed(record)
+        if record is None:
+            save_meta(self.connection, "language", self.language)
+            save_meta(self.connection, "date_str_format", self.date_str_format)
+            save_meta(self.connection, "unique_phones", self.unique_phones)
+        else:
+            self.data[record.name.value.lower()] = record
+
+    def commit(self) -> None:
+        """
+        Commits the changes made since the last save to the database file.
+        """
+        self.pop_changes()
+        self.data.commit()
+
+    def find_by_phone(self, phone: str) -> list[Record]:
+        """
+        Finds the records that have the given phone number.
+
+        Args:
+            phone (str): The phone number.
+
+        Returns:
+            list[Record]: The records with the phone number.
+        """
+        return [self.data[key] for key in self.data.keys_where("phone", phone)]
+
+    def email_keys(self, email: str) -> set[str]:
+        """
+        Returns the contacts with the given email address from the email
+        column index without loading the records.
+
+        Args:
+            email (str): The email address in lower case.
+
+        Returns:
+            set[str]: The normalized names of the contacts.
+        """
+        return set(self.data.keys_where("email", email))
+
+    def birthday_keys(self, start: date, end: date) -> set[str]:
+        """
+        Returns the contacts born within the inclusive date range from the
+        birthday column index.
+
+        Args:
+            start (date): The first date of the range.
+            end (date): The last date of the range.
+
+        Returns:
+            set[str]: The normalized names of the contacts.
+        """
+        return set(self.data.keys_between(
+            "birthday", start.isoformat(), end.isoformat()
+        ))
+
+    def phone_numbers(self) -> list[tuple[str, str]]:
+        """
+        Returns the phone numbers of all contacts from the phone index
+        without loading the records.
+
+        Returns:
+            list[tuple[str, str]]: Pairs of a phone number and the normalized
+            name of its contact.
+        """
+        return self.data.column_values("phone")
@@ -5,13 +5,31 @@ The contacts controllers module contains functions that interact with the user
 and modify the address book.
 """
 
-from .general import save_books
-from ..contacts.address_book import AddressBook
+from .general import save_books, import_book, export_book, show_pages
+from ..contacts.address_book import PHRASE_FIELDS, AddressBook
 from ..contacts.record import Record
 from ..helpers.colors import green, blue, gray, success, warning, danger
 from ..helpers.generate_data import generate_random_contact
+from ..helpers.import_data import import_contacts_file
+from ..helpers.export_data import export_contacts_file
 from ..helpers.completer import Prompt
+from ..helpers.filter_query import is_filter_query, query_terms
+from ..helpers.scoring import top_keys
 from ..settings.app_settings import app_settings
+from ..constants.values import PHONE_LENGTH
+
+# Columns of the contacts table highlighted for the fields of a filter query
+HIGHLIGHTED_COLUMNS = {
+    None: "name",
+    "name": "name",
+    "phone": "phones",
+    "email": "email",
+    "domain": "email",
+    "address": "address",
+    "street": "address",
+    "city": "address",
+    "country": "address",
+}
 
 
 def add_contact(book: AddressBook) -> str:
@@ -45,7 +63,7 @@ def add_contact(book: AddressBook) -> str:
                 print(gray(questions["back"]) + danger(str(e)))
                 continue
 
-        add_phones(new_record)
+        add_phones(new_record, book)
         edit_birthday(new_record)
         edit_email(new_record)
         edit_address(new_record)
@@ -149,12 +167,14 @@ def change_contact(book: AddressBook) -> str:
         )
 
 
-def add_phones(contact: Record) -> None:
+def add_phones(contact: Record, book: AddressBook | None = None) -> None:
     """
     Adds a new phone number to the `contact`.
 
     Args:
         contact (Record): An instance of the `Record` class.
+        book (AddressBook, optional): The book a new contact is going to be
+        added to, to check the phone numbers before the contact is in it.
 
     Returns:
         None
@@ -169,6 +189,8 @@ def add_phones(contact: Record) -> None:
             )
             if not phone.strip():
                 break
+            if book is not None:
+                book.check_phone(phone, contact.name.value.lower())
             contact.add_phone(phone)
             print(
                 gray(questions["back"])
@@ -482,9 +504,54 @@ def fake_contacts(book: AddressBook) -> str:
     return success(info_messages["fake_contacts_generated"])
 
 
+def import_contacts(book: AddressBook) -> str:
+    """
+    Imports contacts from a CSV, JSON Lines or vCard file into the `book`
+    and saves the book once the whole file is imported.
+
+    Args:
+        book (AddressBook): An instance of the `AddressBook` class.
+
+    Returns:
+        str: A message with the number of imported contacts and rejected
+        rows.
+    """
+    info_messages = app_settings.get_info_messages()
+    result = import_book(book, import_contacts_file, ".csv, .jsonl, .vcf")
+    if result is None:
+        return danger("\n" + info_messages["operation_cancelled"])
+    imported, rejected = result
+    save_books(address_book=book)
+    return success(
+        info_messages["contacts_imported"].format(imported, len(rejected))
+    )
+
+
+def export_contacts(book: AddressBook) -> str:
+    """
+    Exports the contacts of the `book` to a CSV, JSON Lines or vCard file,
+    or their birthdays to an iCalendar file.
+
+    Args:
+        book (AddressBook): An instance of the `AddressBook` class.
+
+    Returns:
+        str: A message with the number of exported contacts.
+    """
+    info_messages = app_settings.get_info_messages()
+    result = export_book(
+        book, export_contacts_file, ".csv, .jsonl, .vcf, .ics"
+    )
+    if result is None:
+        return danger("\n" + info_messages["operation_cancelled"])
+    return success(info_messages["contacts_exported"].format(*result))
+
+
 def search_contacts(book: AddressBook) -> str:
     """
-    Interactive search for contacts in the `book`.
+    Interactive search for contacts in the `book`. The search term can be a
+    name, a phone number or a filter query such as `city:Kyiv`,
+    `email:@gmail.com` or `missing:email AND month:3`.
 
     Args:
         book (AddressBook): An instance of the `AddressBook` class.
@@ -504,9 +571,85 @@ def search_contacts(book: AddressBook) -> str:
             if not search_term:
                 continue
 
-            results = book.smart_search(search_term)
+            if is_filter_query(search_term):
+                try:
+                    results = book.filter(search_term)
+                except ValueError as e:
+                    print(gray(questions["back"]) + danger(str(e)))
+                    continue
+                # The first condition on a shown column is highlighted
+                field, value = next((
+                    (HIGHLIGHTED_COLUMNS[field], value)
+                    for field, value in query_terms(
+                        search_term, PHRASE_FIELDS
+                    )
+                    if field in HIGHLIGHTED_COLUMNS
+                ), ("", ""))
+                if results:
+                    return show_pages(
+                        len(results),
+                        lambda limit, offset: results[offset:offset + limit],
+                        lambda page: book.display_contacts(
+                            page, value, field
+                        ),
+                    )
+            else:
+                scores = book.search_scores(search_term)
+                if scores:
+                    return show_pages(
+                        len(scores),
+                        lambda limit, offset: [
+                            book.find(name)
+                            for name in top_keys(scores, limit, offset)
+                        ],
+                        lambda page: book.display_contacts(page, search_term),
+                    )
+
+            print(warning(info_messages["no_contacts"]))
+        except KeyboardInterrupt:
+            return danger("\n" + info_messages["operation_cancelled"])
+
+
+def find_phone(book: AddressBook) -> str:
+    """
+    Finds the owners of a phone number in the `book`, or the contacts whose
+    phone numbers contain the entered digits.
+
+    Args:
+        book (AddressBook): An instance of the `AddressBook` class.
+
+    Returns:
+        str: A string containing the table of the matching contacts or an
+        error message if no results were found.
+    """
+    questions = app_settings.get_questions()
+    info_messages = app_settings.get_info_messages()
+    validation_errors = app_settings.get_validation_errors()
+    while True:
+        try:
+            digits = input(
+                gray(questions["back"])
+                + blue(questions["phone_digits"])
+            ).strip()
+            if not digits:
+                continue
+            if not digits.isdigit():
+                print(
+                    gray(questions["back"])
+                    + danger(validation_errors["invalid_digits"])
+                )
+                continue
+
+            if len(digits) == PHONE_LENGTH:
+                results = book.find_by_phone(digits)
+            else:
+                results = book.search_phones(digits)
             if results:
-                return book.display_contacts(results, search_term)
+                return show_pages(
+                    len(results),
+                    lambda limit, offset: results[offset:offset + limit],
+                    lambda page: book.display_contacts(page, digits, "phones"),
+                )
 
             print(warning(info_messages["no_contacts"]))
         except KeyboardInterrupt:
@@ -1,10 +1,38 @@
-from time import sleep
-from rich.progress import Progress
-from ..helpers.serialize import save_data, load_data
-from ..helpers.colors import yellow, blue, gray, danger, success
-from ..constants.values import ADDRESS_BOOK_PATH, NOTES_BOOK_PATH
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+from ..helpers.serialize import dump_data, load_data
+from ..helpers.journal import (
+    SESSION_ID,
+    dump_journal,
+    replay_journal,
+    compact_journal,
+    journal_size,
+)
+from ..helpers.writer import writer
+from ..helpers.locking import book_lock, disk_stamp, merge_disk_changes
+from ..helpers.sqlite_storage import connect_database
+from ..helpers.mapped_storage import (
+    read_view_stamp,
+    snapshot_stamp,
+    write_view,
+)
+from ..helpers.progress import io_progress
+from ..helpers.colors import yellow, blue, gray, danger, success, warning
+from ..helpers.display import display_table, wrap_text
+from ..constants.values import (
+    ADDRESS_BOOK_PATH,
+    NOTES_BOOK_PATH,
+    DATABASE_PATH,
+    JOURNAL_COMPACT_SIZE,
+    VIEW_SUFFIX,
+    SEARCH_PAGE_SIZE,
+)
 from ..contacts.address_book import AddressBook
+from ..contacts.sqlite_address_book import SQLiteAddressBook
+from ..contacts.mapped_address_book import MappedAddressBook
 from ..notes.notes_book import NotesBook
+from ..notes.sqlite_notes_book import SQLiteNotesBook
 from ..settings.app_settings import app_settings
 
 
@@ -15,6 +43,9 @@ def save_books(
     """
     Saves the `adsress_book` and `notes_book` to disk.
 
+    The books are serialized right away and written to disk by the
+    background writer, call `flush_books` to wait for the writes.
+
     Args:
         adsress_book (AddressBook) optional: An instance of the `AddressBook`
         class.
@@ -23,40 +54,340 @@ def save_books(
     Returns:
         None
     """
-    with Progress() as progress:
-        task = progress.add_task(
-            "[blue]Saving data, please wait...", total=100
+    if address_book is not None:
+        save_book(address_book, ADDRESS_BOOK_PATH)
+    if notes_book is not None:
+        save_book(notes_book, NOTES_BOOK_PATH)
+
+
+def save_book(book: AddressBook | NotesBook, filename: str) -> None:
+    """
+    Saves a single book according to the current storage mode. Books
+    without unsaved changes are skipped.
+
+    In journal mode only the changed entries are appended to the journal,
+    unless they make up most of the book, in which case a snapshot is
+    cheaper. The journal is folded into a snapshot once it gets too large.
+    In sqlite mode the entries are already written to the database and only
+    need to be committed.
+
+    Args:
+        book (AddressBook | NotesBook): The book to be saved.
+        filename (str): The name of the book file.
+
+    Returns:
+        None
+    """
+    if not book.is_dirty:
+        return
+    if app_settings.storage_mode == "sqlite":
+        book.commit()
+        return
+    conflicts = sync_book(book, filename)
+    if conflicts - {None}:
+        print(warning(
+            app_settings.get_info_messages()["merge_conflicts"]
+            .format(", ".join(sorted(conflicts - {None})))
+        ))
+    changes = book.pop_changes()
+    if (
+        app_settings.storage_mode == "journal"
+        and len(changes) * 2 < len(book.data)
+        and journal_size(filename) <= JOURNAL_COMPACT_SIZE
+    ):
+        if changes:
+            writer.append_journal(
+                filename, dump_journal(book, changes, SESSION_ID)
+            )
+    else:
+        writer.save_snapshot(
+            filename,
+            *dump_data(book, filename),
+            fallback=(
+                dump_journal(book, changes, SESSION_ID) if changes else None
+            ),
+        )
+
+
+def sync_book(book: AddressBook | NotesBook, filename: str) -> set:
+    """
+    Merges the changes other sessions saved to the book files since this
+    session last saw them, keeping the unsaved changes of this session.
+
+    Args:
+        book (AddressBook | NotesBook): The book.
+        filename (str): The name of the book file.
+
+    Returns:
+        set: The keys of the unsaved entries that were also changed in
+        another session.
+    """
+    if writer.stamp(filename) in (None, disk_stamp(filename)):
+        return set()
+    writer.wait()
+    with book_lock(filename):
+        base = writer.stamp(filename)
+        if base == disk_stamp(filename):
+            return set()
+        conflicts = merge_disk_changes(
+            book, filename, base, book.changes, SESSION_ID
         )
-        while not progress.finished:
-            progress.update(task, advance=100)
-            sleep(0.8)
-    if address_book:
-        save_data(address_book, ADDRESS_BOOK_PATH)
-    if notes_book:
-        save_data(notes_book, NOTES_BOOK_PATH)
+        writer.track(filename, disk_stamp(filename))
+    return conflicts
+
+
+def flush_books() -> None:
+    """
+    Waits until all saved books are written to disk and stops the
+    background writer.
+
+    Returns:
+        None
+    """
+    with io_progress("[blue]Saving data, please wait...") as report:
+        writer.close(report)
 
 
 def load_books() -> tuple[AddressBook, NotesBook]:
     """
-    Loads the `adsress_book` and `notes_book` from disk.
+    Loads the `adsress_book` and `notes_book` from disk. The notes book is
+    loaded on a worker thread while the address book is loaded on the
+    current one.
+
+    Returns:
+        tuple[AddressBook, NotesBook]: A tuple of the `adsress_book` and
+        `notes_book` objects.
+    """
+    if app_settings.storage_mode == "sqlite":
+        return load_database()
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        notes_book = executor.submit(load_book, NOTES_BOOK_PATH, NotesBook)
+        book = load_book(ADDRESS_BOOK_PATH, AddressBook)
+        return book, notes_book.result()
+
+
+def load_book(
+    filename: str,
+    book_type: type[AddressBook | NotesBook],
+    compact: bool = True
+) -> AddressBook | NotesBook:
+    """
+    Loads a single book from its snapshot and journal and remembers the
+    version of the files it was loaded from.
+
+    Args:
+        filename (str): The name of the book file.
+        book_type (type): The class of the book, used when the file does
+        not exist.
+        compact (bool, optional): Whether a large journal is folded into
+        the snapshot.
+
+    Returns:
+        AddressBook | NotesBook: The book.
+    """
+    with book_lock(filename):
+        book = load_data(filename, default_data=book_type())
+        replay_journal(book, filename)
+        if compact:
+            compact_journal(book, filename)
+        writer.track(filename, disk_stamp(filename))
+    return book
+
+
+def load_view_books() -> tuple[AddressBook, NotesBook]:
+    """
+    Opens the `adsress_book` and `notes_book` for viewing only.
+
+    The address book is opened from its memory-mapped view, which is
+    rebuilt first if the snapshot changed since the view was written, while
+    the notes book is loaded on a worker thread. The journals are applied in
+    memory and nothing is written back to the books. In SQLite storage the
+    database is opened read-only, and the books are empty if it does not
+    exist yet.
 
     Returns:
         tuple[AddressBook, NotesBook]: A tuple of the `adsress_book` and
         `notes_book` objects.
     """
-    with Progress() as progress:
-        task = progress.add_task(
-            "[blue]Loading data, please wait...", total=100
+    if app_settings.storage_mode == "sqlite":
+        if not os.path.exists(DATABASE_PATH):
+            return AddressBook(), NotesBook()
+        connection = connect_database(DATABASE_PATH, read_only=True)
+        return SQLiteAddressBook(connection), SQLiteNotesBook(connection)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        notes_book = executor.submit(
+            load_book, NOTES_BOOK_PATH, NotesBook, compact=False
         )
-        while not progress.finished:
-            progress.update(task, advance=100)
-            sleep(0.8)
-    book = load_data(ADDRESS_BOOK_PATH, default_data=AddressBook())
-    notes_book = load_data(NOTES_BOOK_PATH, default_data=NotesBook())
+        view_filename = ADDRESS_BOOK_PATH + VIEW_SUFFIX
+        with book_lock(ADDRESS_BOOK_PATH):
+            stamp = snapshot_stamp(ADDRESS_BOOK_PATH)
+            if stamp is None or read_view_stamp(view_filename) != stamp:
+                write_view(
+                    load_data(ADDRESS_BOOK_PATH, default_data=AddressBook()),
+                    view_filename,
+                    stamp,
+                )
+            book = MappedAddressBook(view_filename)
+            replay_journal(book, ADDRESS_BOOK_PATH)
+        return book, notes_book.result()
+
+
+def load_database() -> tuple[SQLiteAddressBook, SQLiteNotesBook]:
+    """
+    Opens the `adsress_book` and `notes_book` stored in the database.
+
+    When the database is created for the first time, the books saved in the
+    other storage modes are copied into it.
+
+    Returns:
+        tuple[SQLiteAddressBook, SQLiteNotesBook]: A tuple of the
+        `adsress_book` and `notes_book` objects.
+    """
+    is_new = not os.path.exists(DATABASE_PATH)
+    connection = connect_database(DATABASE_PATH)
+    book = SQLiteAddressBook(connection)
+    notes_book = SQLiteNotesBook(connection)
+    if is_new:
+        old_book = load_data(ADDRESS_BOOK_PATH, default_data=AddressBook())
+        replay_journal(old_book, ADDRESS_BOOK_PATH)
+        book.data.update(old_book.data)
+        book.language = old_book.language
+        book.date_str_format = old_book.date_str_format
+        book.mark_changed()
+        old_notes_book = load_data(NOTES_BOOK_PATH, default_data=NotesBook())
+        replay_journal(old_notes_book, NOTES_BOOK_PATH)
+        notes_book.data.update(old_notes_book.data)
+        book.commit()
 
     return book, notes_book
 
 
+def import_book(
+    book: AddressBook | NotesBook,
+    import_file: Callable[
+        [AddressBook | NotesBook, str], tuple[int, list[tuple[int, str]]]
+    ],
+    extensions: str,
+) -> tuple[int, list[tuple[int, str]]] | None:
+    """
+    Asks for a file name, imports the file into the `book` and shows the
+    rejected rows. The book is not saved.
+
+    Args:
+        book (AddressBook | NotesBook): The book to import into.
+        import_file (Callable): The function importing a file into the book.
+        extensions (str): The supported file extensions shown to the user.
+
+    Returns:
+        tuple[int, list[tuple[int, str]]] | None: The number of imported
+        entries and the rejected rows, or None if the import was cancelled.
+    """
+    questions = app_settings.get_questions()
+    try:
+        while True:
+            filename = input(
+                gray(questions["back"])
+                + blue(questions["import_file"].format(extensions))
+            ).strip()
+            if not filename:
+                continue
+            try:
+                imported, rejected = import_file(book, filename)
+                break
+            except ValueError as e:
+                print(gray(questions["back"]) + danger(str(e)))
+                continue
+    except KeyboardInterrupt:
+        return None
+
+    if rejected:
+        headers = (
+            ["Line", "Error"] if app_settings.language == "en" else
+            ["Рядок", "Помилка"]
+        )
+        print(display_table(
+            headers,
+            [[line, wrap_text(error, width=60)] for line, error in rejected]
+        ))
+    return imported, rejected
+
+
+def export_book(
+    book: AddressBook | NotesBook,
+    export_file: Callable[[AddressBook | NotesBook, str], int],
+    extensions: str,
+) -> tuple[int, str] | None:
+    """
+    Asks for a file name and exports the `book` to it.
+
+    Args:
+        book (AddressBook | NotesBook): The book to export.
+        export_file (Callable): The function exporting the book to a file.
+        extensions (str): The supported file extensions shown to the user.
+
+    Returns:
+        tuple[int, str] | None: The number of exported entries and the name
+        of the file, or None if the export was cancelled.
+    """
+    questions = app_settings.get_questions()
+    try:
+        while True:
+            filename = input(
+                gray(questions["back"])
+                + blue(questions["export_file"].format(extensions))
+            ).strip()
+            if not filename:
+                continue
+            try:
+                return export_file(book, filename), filename
+            except (ValueError, OSError) as e:
+                print(gray(questions["back"]) + danger(str(e)))
+                continue
+    except KeyboardInterrupt:
+        return None
+
+
+def show_pages(
+    count: int,
+    get_page: Callable[[int, int], list],
+    display: Callable[[list], str],
+) -> str:
+    """
+    Shows the results of a search page by page. The next page is fetched
+    only when the user asks for it.
+
+    Args:
+        count (int): The number of results.
+        get_page (Callable[[int, int], list]): A function returning at most
+        `limit` results after the first `offset`, called with `limit` and
+        `offset`.
+        display (Callable[[list], str]): A function formatting a page of
+        results.
+
+    Returns:
+        str: The last page shown, or the number of results shown if the user
+        stopped before the last page.
+    """
+    questions = app_settings.get_questions()
+    info_messages = app_settings.get_info_messages()
+    offset = 0
+    while True:
+        page = get_page(SEARCH_PAGE_SIZE, offset)
+        offset += len(page)
+        table = display(page)
+        if not page or offset >= count:
+            return table
+        print(table)
+        answer = input(
+            gray(questions["back"])
+            + blue(questions["next_page"].format(offset, count))
+        ).strip()
+        if answer:
+            return gray(info_messages["results_shown"].format(offset, count))
+
+
 def get_help() -> None:
     """
     Returns a help message with list of available commands.
@@ -74,10 +405,11 @@ def get_help() -> None:
 
 def settings(book: AddressBook) -> str:
     """
-    Sets the language for the application.
+    Sets the language and the date format for the application and whether
+    phone numbers must be unique in the `book`.
 
     Returns:
-        str: The language code.
+        str: A message indicating whether the settings were changed.
     """
     questions = app_settings.get_questions()
     is_updated = False
@@ -96,6 +428,7 @@ def settings(book: AddressBook) -> str:
             try:
                 app_settings.language = language
                 book.language = language
+                book.mark_changed()
                 is_updated = True
                 break
             except ValueError as e:
@@ -116,6 +449,25 @@ def settings(book: AddressBook) -> str:
             try:
                 app_settings.date_format = date_format
                 book.date_str_format = date_format
+                book.mark_changed()
+                is_updated = True
+                break
+            except ValueError as e:
+                print(gray(questions["back"]) + danger(str(e)))
+                continue
+
+        while True:
+            answer = input(
+                gray(questions["back"])
+                + blue(questions["unique_phones"] + questions["skip"])
+            ).strip().lower()
+            if not answer:
+                break
+            unique = answer in ["y", "yes", "т", "так"]
+            if book.unique_phones == unique:
+                break
+            try:
+                book.set_unique_phones(unique)
                 is_updated = True
                 break
             except ValueError as e:
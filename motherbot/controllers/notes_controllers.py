@@ -5,14 +5,26 @@ The controllers module contains functions that interact with the user and
 modify the notes book.
 """
 
-from .general import save_books
-from ..notes.notes_book import NotesBook
+from .general import save_books, import_book, export_book, show_pages
+from ..notes.notes_book import PHRASE_FIELDS, NotesBook
 from ..notes.note import Note
 from ..helpers.colors import green, blue, gray, success, warning, danger
 from ..helpers.completer import Prompt
 from ..helpers.generate_data import generate_random_note
+from ..helpers.import_data import import_notes_file
+from ..helpers.export_data import export_notes_file
+from ..helpers.filter_query import is_filter_query, query_terms
+from ..helpers.scoring import top_keys
 from ..settings.app_settings import app_settings
 
+# Columns of the notes table highlighted for the fields of a filter query
+HIGHLIGHTED_COLUMNS = {
+    None: "title",
+    "title": "title",
+    "tag": "tags",
+    "text": "text",
+}
+
 
 def add_note(book: NotesBook) -> str:
     """
@@ -394,6 +406,46 @@ def fake_notes(book: NotesBook) -> str:
     return success(info_messages["fake_notes_generated"])
 
 
+def import_notes(book: NotesBook) -> str:
+    """
+    Imports notes from a CSV or JSON Lines file into the `book` and saves the
+    book once the whole file is imported.
+
+    Args:
+        book (NotesBook): An instance of the `NotesBook` class.
+
+    Returns:
+        str: A message with the number of imported notes and rejected rows.
+    """
+    info_messages = app_settings.get_info_messages()
+    result = import_book(book, import_notes_file, ".csv, .jsonl")
+    if result is None:
+        return danger("\n" + info_messages["operation_cancelled"])
+    imported, rejected = result
+    save_books(notes_book=book)
+    return success(
+        info_messages["notes_imported"].format(imported, len(rejected))
+    )
+
+
+def export_notes(book: NotesBook) -> str:
+    """
+    Exports the notes of the `book` to a CSV or JSON Lines file, or their
+    reminders to an iCalendar file.
+
+    Args:
+        book (NotesBook): An instance of the `NotesBook` class.
+
+    Returns:
+        str: A message with the number of exported notes.
+    """
+    info_messages = app_settings.get_info_messages()
+    result = export_book(book, export_notes_file, ".csv, .jsonl, .ics")
+    if result is None:
+        return danger("\n" + info_messages["operation_cancelled"])
+    return success(info_messages["notes_exported"].format(*result))
+
+
 def reminders(book: NotesBook) -> str:
     """
     Returns a string containing the titles and reminder dates of all notes
@@ -431,7 +483,8 @@ def reminders(book: NotesBook) -> str:
 def search_notes(book: NotesBook) -> str:
     """
     Searches for notes in the `NotesBook` that match the given search term.
-    The search term can be a note title or a tag.
+    The search term can be a note title, a tag or a filter query such as
+    `#work AND #urgent NOT #done` or `#work reminder:<01.12.2026`.
 
     Args:
         book (NotesBook): An instance of the `NotesBook` class.
@@ -451,9 +504,79 @@ def search_notes(book: NotesBook) -> str:
             if not search_term:
                 continue
 
-            results = book.smart_search(search_term)
-            if results:
-                return book.display_notes(results, search_term)
+            if is_filter_query(search_term):
+                try:
+                    results = book.filter(search_term)
+                except ValueError as e:
+                    print(gray(questions["back"]) + danger(str(e)))
+                    continue
+                # The first condition on a shown column is highlighted
+                field, value = next((
+                    (HIGHLIGHTED_COLUMNS[field], value)
+                    for field, value in query_terms(
+                        search_term, PHRASE_FIELDS
+                    )
+                    if field in HIGHLIGHTED_COLUMNS
+                ), ("", ""))
+                if results:
+                    return show_pages(
+                        len(results),
+                        lambda limit, offset: results[offset:offset + limit],
+                        lambda page: book.display_notes(page, value, field),
+                    )
+            else:
+                scores = book.search_scores(search_term)
+                if scores:
+                    return show_pages(
+                        len(scores),
+                        lambda limit, offset: [
+                            book.find(title)
+                            for title in top_keys(scores, limit, offset)
+                        ],
+                        lambda page: book.display_notes(page, search_term),
+                    )
+
+            print(warning(info_messages["no_notes"]))
+        except KeyboardInterrupt:
+            return danger("\n" + info_messages["operation_cancelled"])
+
+
+def search_text(book: NotesBook) -> str:
+    """
+    Searches for notes whose texts contain the words of the search term,
+    best matches first, and shows the parts of the texts with the most
+    matching words.
+
+    Args:
+        book (NotesBook): An instance of the `NotesBook` class.
+
+    Returns:
+        str: A string containing the notes that match the search term or an
+        error message if no results were found.
+    """
+    questions = app_settings.get_questions()
+    info_messages = app_settings.get_info_messages()
+    while True:
+        try:
+            search_term = input(
+                gray(questions["back"])
+                + blue(questions["search_text"])
+            ).strip()
+            if not search_term:
+                continue
+
+            scores = book.search_text(search_term)
+            if scores:
+                return show_pages(
+                    len(scores),
+                    lambda limit, offset: [
+                        book.find(title)
+                        for title in top_keys(scores, limit, offset)
+                    ],
+                    lambda page: book.display_notes(
+                        page, search_term, "text"
+                    ),
+                )
 
             print(warning(info_messages["no_notes"]))
         except KeyboardInterrupt:
@@ -0,0 +1,116 @@
+"""
+BK-tree module.
+
+A BK-tree is a metric tree of strings under the Levenshtein distance. Every
+child of a node is kept under its distance to the node, so by the triangle
+inequality a search for the strings within some distance of a term only
+descends into the children whose distance to the node differs from the
+term's by at most that much.
+"""
+
+from typing import Iterable
+
+
+class BKTree:
+    """
+    BK-tree of distinct strings.
+
+    Removed strings stay in the tree and are only skipped by searches, the
+    tree is rebuilt once they outnumber the live ones.
+    """
+
+    def __init__(self, words: Iterable[str] = ()) -> None:
+        """
+        Initializes the tree.
+
+        Args:
+            words (Iterable[str], optional): The strings to add.
+        """
+        # Node: [word, {distance: child node}]
+        self._root = None
+        self._nodes = set()
+        self._live = set()
+        for word in words:
+            self.add(word)
+
+    def __len__(self) -> int:
+        return len(self._live)
+
+    def __contains__(self, word: object) -> bool:
+        return word in self._live
+
+    def add(self, word: str) -> None:
+        """
+        Adds a string to the tree.
+
+        Args:
+            word (str): The string.
+
+        Returns:
+            None
+        """
+        from rapidfuzz.distance import Levenshtein
+
+        if word in self._live:
+            return
+        self._live.add(word)
+        if word in self._nodes:
+            return
+        self._nodes.add(word)
+        if self._root is None:
+            self._root = [word, {}]
+            return
+        node = self._root
+        while True:
+            distance = Levenshtein.distance(word, node[0])
+            child = node[1].get(distance)
+            if child is None:
+                node[1][distance] = [word, {}]
+                return
+            node = child
+
+    def discard(self, word: str) -> None:
+        """
+        Removes a string from the tree if it is in it.
+
+        Args:
+            word (str): The string.
+
+        Returns:
+            None
+        """
+        self._live.discard(word)
+        if len(self._nodes) > 2 * len(self._live) + 1024:
+            live = self._live
+            self._root = None
+            self._nodes = set()
+            self._live = set()
+            for live_word in live:
+                self.add(live_word)
+
+    def search(self, term: str, max_distance: int) -> list[tuple[int, str]]:
+        """
+        Finds the strings within the distance of the term.
+
+        Args:
+            term (str): The term.
+            max_distance (int): The largest Levenshtein distance.
+
+        Returns:
+            list[tuple[int, str]]: The distances and the strings, closest
+            first.
+        """
+        from rapidfuzz.distance import Levenshtein
+
+        matches = []
+        nodes = [self._root] if self._root is not None else []
+        while nodes:
+            word, children = nodes.pop()
+            distance = Levenshtein.distance(term, word)
+            if distance <= max_distance and word in self._live:
+                matches.append((distance, word))
+            nodes.extend(
+                child for child_distance, child in children.items()
+                if abs(child_distance - distance) <= max_distance
+            )
+        return sorted(matches)
@@ -1,5 +1,6 @@
 from prompt_toolkit.completion import Completer, Completion
 from prompt_toolkit import PromptSession
+from prompt_toolkit.patch_stdout import patch_stdout
 from prompt_toolkit.styles import Style
 
 
@@ -70,9 +71,12 @@ class Prompt():
             styles[f"prompt{i}"] = style
 
         color_style = Style.from_dict(styles)
-        return self.session.prompt(
-            message=message,
-            completer=CustomCompleter(commands, all_commands),
-            style=color_style,
-            mouse_support=self.mouse_support
-        )
+        # Text printed by other threads (e.g. the books loader) is shown
+        # above the prompt instead of breaking it
+        with patch_stdout(raw=True):
+            return self.session.prompt(
+                message=message,
+                completer=CustomCompleter(commands, all_commands),
+                style=color_style,
+                mouse_support=self.mouse_support
+            )
@@ -6,9 +6,10 @@ The display module contains functions that display data to the user.
 
 import re
 import textwrap
-from tabulate import tabulate
-from fuzzywuzzy import fuzz
 from .colors import yellow, success, warning
+from .scoring import ratio
+from .text_index import WORD_PATTERN, tokenize
+from ..constants.values import SNIPPET_WORDS
 
 
 def wrap_text(text: str, width: int = 20) -> str:
@@ -36,6 +37,8 @@ def display_table(headers: list, table: list) -> str:
     Returns:
         str: The formatted table as a string.
     """
+    from tabulate import tabulate
+
     colored_headers = [yellow(header) for header in headers]
     return tabulate(table, headers=colored_headers, tablefmt="fancy_grid")
 
@@ -62,14 +65,14 @@ def highlight_term(text: str, term: str, threshold: int = 60) -> str:
             flags=re.IGNORECASE
         )
 
-    if fuzz.ratio(text.lower(), term) >= threshold:
+    if ratio(text.lower(), term) >= threshold:
         return warning(text)
 
     words = text.split()
     highlighted_words = []
 
     for word in words:
-        similarity = fuzz.ratio(word.lower(), term)
+        similarity = ratio(word.lower(), term)
         if similarity >= threshold:
             highlighted_word = warning(word)
         else:
@@ -77,3 +80,66 @@ def highlight_term(text: str, term: str, threshold: int = 60) -> str:
         highlighted_words.append(highlighted_word)
 
     return ' '.join(highlighted_words)
+
+
+def text_snippet(
+    text: str, search_term: str, length: int = SNIPPET_WORDS
+) -> str:
+    """
+    Shortens the text to the words containing the most words of the search
+    term. Cut off parts are replaced with "...".
+
+    Args:
+    text (str): The text to shorten.
+    search_term (str): The words searched for.
+    length (int): The number of words to keep.
+
+    Returns:
+    str: The shortened text.
+    """
+    words = text.split()
+    if len(words) <= length:
+        return " ".join(words)
+    terms = set(tokenize(search_term))
+    hits = [bool(terms.intersection(tokenize(word))) for word in words]
+    start = max(
+        range(len(words) - length + 1),
+        key=lambda start: sum(hits[start:start + length]),
+    )
+    # Center the matching words in the snippet
+    positions = [
+        position for position in range(start, start + length)
+        if hits[position]
+    ]
+    if positions:
+        middle = (positions[0] + positions[-1]) // 2
+        start = max(0, min(len(words) - length, middle - length // 2))
+    snippet = " ".join(words[start:start + length])
+    if start > 0:
+        snippet = "... " + snippet
+    if start + length < len(words):
+        snippet += " ..."
+    return snippet
+
+
+def highlight_words(text: str, search_term: str) -> str:
+    """
+    Highlights every word of the text that is a word of the search term,
+    see `highlight_term`.
+
+    Args:
+    text (str): The text to search in.
+    search_term (str): The words to highlight.
+
+    Returns:
+    str: The text with the words highlighted.
+    """
+    terms = set(tokenize(search_term))
+
+    def highlight(match: re.Match) -> str:
+        word = tokenize(match.group(0))[0]
+        if word in terms:
+            return highlight_term(match.group(0), word)
+        return match.group(0)
+
+    return WORD_PATTERN.sub(highlight, text)
@@ -0,0 +1,336 @@
+"""
+Export data module.
+
+Contacts are exported to CSV, JSON Lines and vCard files, notes to CSV and
+JSON Lines files, and birthdays and reminders to iCalendar feeds. The books
+are walked with generators and every entry is written as soon as it is
+converted, so memory use does not depend on the size of the book.
+"""
+
+import csv
+import json
+import os
+from datetime import datetime, timezone
+from typing import Callable, Iterable, Iterator, TextIO
+from ..contacts.address_book import AddressBook
+from ..contacts.record import Record
+from ..notes.notes_book import NotesBook
+from ..settings.app_settings import app_settings
+from ..constants.values import TEMP_SUFFIX
+
+CONTACT_FIELDS = ["name", "phones", "birthday", "email", "address"]
+NOTE_FIELDS = ["title", "text", "tags", "reminder"]
+# Longest line of vCard and iCalendar files in octets, without the CRLF
+LINE_LENGTH = 75
+
+
+def contact_rows(book: AddressBook) -> Iterator[dict]:
+    """
+    Converts the contacts of the book to rows one by one.
+
+    Args:
+        book (AddressBook): The address book.
+
+    Returns:
+        Iterator[dict]: The fields of every contact, dates are formatted
+        with the current date format, as they are entered.
+    """
+    for record in book.data.values():
+        yield {
+            "name": record.name.value,
+            "phones": [phone.value for phone in record.phones],
+            "birthday": str(record.birthday) if record.birthday else None,
+            "email": record.email.value if record.email else None,
+            "address": record.address.value if record.address else None,
+        }
+
+
+def note_rows(book: NotesBook) -> Iterator[dict]:
+    """
+    Converts the notes of the book to rows one by one.
+
+    Args:
+        book (NotesBook): The notes book.
+
+    Returns:
+        Iterator[dict]: The fields of every note, dates are formatted with
+        the current date format, as they are entered.
+    """
+    for note in book.data.values():
+        yield {
+            "title": note.title.value,
+            "text": note.text.value if note.text else None,
+            "tags": [tag.value for tag in note.tags],
+            "reminder": str(note.reminder) if note.reminder else None,
+        }
+
+
+def write_csv(f: TextIO, rows: Iterable[dict], fields: list[str]) -> int:
+    """
+    Writes rows to a CSV file with a header. Lists are joined with spaces.
+
+    Args:
+        f (TextIO): The open file.
+        rows (Iterable[dict]): The rows.
+        fields (list[str]): The columns.
+
+    Returns:
+        int: The number of written rows.
+    """
+    writer = csv.DictWriter(f, fieldnames=fields)
+    writer.writeheader()
+    count = 0
+    for row in rows:
+        writer.writerow({
+            key: " ".join(value) if isinstance(value, list) else value
+            for key, value in row.items()
+        })
+        count += 1
+    return count
+
+
+def write_jsonl(f: TextIO, rows: Iterable[dict]) -> int:
+    """
+    Writes rows to a JSON Lines file, one JSON object per line.
+
+    Args:
+        f (TextIO): The open file.
+        rows (Iterable[dict]): The rows.
+
+    Returns:
+        int: The number of written rows.
+    """
+    count = 0
+    for row in rows:
+        f.write(json.dumps(row, ensure_ascii=False) + "\n")
+        count += 1
+    return count
+
+
+def escape_text(value: str) -> str:
+    """
+    Escapes a vCard or iCalendar text value.
+
+    Args:
+        value (str): The value.
+
+    Returns:
+        str: The value with backslashes, semicolons, commas and newlines
+        escaped.
+    """
+    return (
+        value.replace("\\", "\\\\").replace(";", "\\;")
+        .replace(",", "\\,").replace("\n", "\\n")
+    )
+
+
+def fold_line(line: str) -> str:
+    """
+    Folds a vCard or iCalendar content line into lines of at most
+    `LINE_LENGTH` octets, continued lines start with a space.
+
+    Args:
+        line (str): The content line.
+
+    Returns:
+        str: The folded line ending with CRLF.
+    """
+    parts = []
+    current, size, limit = [], 0, LINE_LENGTH
+    for char in line:
+        char_size = len(char.encode("utf-8"))
+        if size + char_size > limit:
+            parts.append("".join(current))
+            current, size, limit = [], 0, LINE_LENGTH - 1
+        current.append(char)
+        size += char_size
+    parts.append("".join(current))
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def write_vcard(f: TextIO, records: Iterable[Record]) -> int:
+    """
+    Writes contacts to a vCard 3.0 file.
+
+    Args:
+        f (TextIO): The open file.
+        records (Iterable[Record]): The contacts.
+
+    Returns:
+        int: The number of written contacts.
+    """
+    count = 0
+    for record in records:
+        name = escape_text(record.name.value)
+        lines = ["BEGIN:VCARD", "VERSION:3.0", f"FN:{name}", f"N:{name};;;;"]
+        lines += [f"TEL;TYPE=CELL:{phone.value}" for phone in record.phones]
+        if record.email:
+            lines.append(f"EMAIL:{escape_text(record.email.value)}")
+        if record.address:
+            lines.append(f"ADR:;;{escape_text(record.address.value)};;;;")
+        if record.birthday:
+            lines.append(f"BDAY:{record.birthday.value.isoformat()}")
+        lines.append("END:VCARD")
+        f.write("".join(fold_line(line) for line in lines))
+        count += 1
+    return count
+
+
+def birthday_events(book: AddressBook) -> Iterator[list[str]]:
+    """
+    Converts the birthdays of the book to yearly iCalendar events.
+
+    Args:
+        book (AddressBook): The address book.
+
+    Returns:
+        Iterator[list[str]]: The content lines of every event.
+    """
+    for key, record in book.data.items():
+        if record.birthday is None:
+            continue
+        yield [
+            f"UID:birthday-{escape_text(key)}@motherbot",
+            f"DTSTART;VALUE=DATE:{record.birthday.value:%Y%m%d}",
+            "RRULE:FREQ=YEARLY",
+            f"SUMMARY:{escape_text(record.name.value)}",
+            "CATEGORIES:BIRTHDAY",
+        ]
+
+
+def reminder_events(book: NotesBook) -> Iterator[list[str]]:
+    """
+    Converts the reminders of the book to iCalendar events.
+
+    Args:
+        book (NotesBook): The notes book.
+
+    Returns:
+        Iterator[list[str]]: The content lines of every event.
+    """
+    for key, note in book.data.items():
+        if note.reminder is None:
+            continue
+        lines = [
+            f"UID:reminder-{escape_text(key)}@motherbot",
+            f"DTSTART;VALUE=DATE:{note.reminder.value:%Y%m%d}",
+            f"SUMMARY:{escape_text(note.title.value)}",
+        ]
+        if note.text:
+            lines.append(f"DESCRIPTION:{escape_text(note.text.value)}")
+        if note.tags:
+            lines.append("CATEGORIES:" + ",".join(
+                escape_text(tag.value.lstrip("#")) for tag in note.tags
+            ))
+        yield lines
+
+
+def write_ics(f: TextIO, events: Iterable[list[str]]) -> int:
+    """
+    Writes events to an iCalendar file.
+
+    Args:
+        f (TextIO): The open file.
+        events (Iterable[list[str]]): The content lines of every event.
+
+    Returns:
+        int: The number of written events.
+    """
+    stamp = f"DTSTAMP:{datetime.now(timezone.utc):%Y%m%dT%H%M%SZ}"
+    f.write(fold_line("BEGIN:VCALENDAR"))
+    f.write(fold_line("VERSION:2.0"))
+    f.write(fold_line("PRODID:-//motherbot//EN"))
+    count = 0
+    for lines in events:
+        f.write("".join(
+            fold_line(line)
+            for line in ["BEGIN:VEVENT", stamp, *lines, "END:VEVENT"]
+        ))
+        count += 1
+    f.write(fold_line("END:VCALENDAR"))
+    return count
+
+
+def write_export(
+    filename: str,
+    writers: dict[str, Callable[[TextIO], int]],
+) -> int:
+    """
+    Atomically writes an export file, choosing the format by the file
+    extension.
+
+    Args:
+        filename (str): The name of the file.
+        writers (dict): Functions writing the supported formats to an open
+        file by extension.
+
+    Raises:
+        ValueError: If the format is not supported.
+        OSError: If the file cannot be written.
+
+    Returns:
+        int: The number of exported entries.
+    """
+    extension = os.path.splitext(filename)[1].lower()
+    if extension not in writers:
+        raise ValueError(
+            app_settings.get_validation_errors()["invalid_file_format"]
+            .format(", ".join(writers))
+        )
+    temp_filename = filename + TEMP_SUFFIX
+    try:
+        with open(temp_filename, "w", encoding="utf-8", newline="") as f:
+            count = writers[extension](f)
+        os.replace(temp_filename, filename)
+    except BaseException:
+        if os.path.exists(temp_filename):
+            os.remove(temp_filename)
+        raise
+    return count
+
+
+def export_contacts_file(book: AddressBook, filename: str) -> int:
+    """
+    Exports the contacts of the book to a CSV, JSON Lines or vCard file, or
+    their birthdays to an iCalendar file.
+
+    Args:
+        book (AddressBook): The address book.
+        filename (str): The name of the file.
+
+    Raises:
+        ValueError: If the format is not supported.
+        OSError: If the file cannot be written.
+
+    Returns:
+        int: The number of exported contacts or birthdays.
+    """
+    return write_export(filename, {
+        ".csv": lambda f: write_csv(f, contact_rows(book), CONTACT_FIELDS),
+        ".jsonl": lambda f: write_jsonl(f, contact_rows(book)),
+        ".vcf": lambda f: write_vcard(f, book.data.values()),
+        ".ics": lambda f: write_ics(f, birthday_events(book)),
+    })
+
+
+def export_notes_file(book: NotesBook, filename: str) -> int:
+    """
+    Exports the notes of the book to a CSV or JSON Lines file, or their
+    reminders to an iCalendar file.
+
+    Args:
+        book (NotesBook): The notes book.
+        filename (str): The name of the file.
+
+    Raises:
+        ValueError: If the format is not supported.
+        OSError: If the file cannot be written.
+
+    Returns:
+        int: The number of exported notes or reminders.
+    """
+    return write_export(filename, {
+        ".csv": lambda f: write_csv(f, note_rows(book), NOTE_FIELDS),
+        ".jsonl": lambda f: write_jsonl(f, note_rows(book)),
+        ".ics": lambda f: write_ics(f, reminder_events(book)),
+    })
@@ -0,0 +1,170 @@
+"""
+Field index module.
+
+The field index maps the values of the contact fields that are not covered
+by the search index, the email address and its domain and the street, city,
+country and words of the address, to the contacts having them. A filter
+query condition such as `email:@gmail.com` or `city:Kyiv` is answered with
+a lookup in the index instead of a scan of the book.
+"""
+
+from typing import Hashable, Iterable
+from .text_index import tokenize
+
+SEARCH_FIELDS = ["email", "domain", "address", "street", "city", "country"]
+
+
+def normalize_value(value: str) -> str:
+    """
+    Normalizes a field value for lookups, ignoring case, punctuation and
+    extra spaces.
+
+    Args:
+        value (str): The value.
+
+    Returns:
+        str: The lower-cased words of the value separated by spaces.
+    """
+    return " ".join(tokenize(value))
+
+
+def email_values(email: str) -> list[tuple[str, str]]:
+    """
+    Returns the index values of an email address: the whole address and
+    its domain.
+
+    Args:
+        email (str): The email address.
+
+    Returns:
+        list[tuple[str, str]]: Pairs of a field and a value.
+    """
+    email = email.strip().lower()
+    return [("email", email), ("domain", email.rpartition("@")[2])]
+
+
+def address_values(address: str) -> list[tuple[str, str]]:
+    """
+    Returns the index values of an address written as
+    `street, city, country`: its parts and every word of it.
+
+    The last part is taken for the country and the one before it for the
+    city, an address of two parts has no country and one of a single part
+    is a street.
+
+    Args:
+        address (str): The address.
+
+    Returns:
+        list[tuple[str, str]]: Pairs of a field and a value.
+    """
+    parts = [
+        part for part in map(normalize_value, address.split(",")) if part
+    ]
+    if len(parts) > 2:
+        parts = [" ".join(parts[:-2]), *parts[-2:]]
+    values = list(zip(("street", "city", "country"), parts))
+    values += [("address", word) for word in dict.fromkeys(tokenize(address))]
+    return values
+
+
+def field_query_values(field: str, value: str) -> list[tuple[str, str]]:
+    """
+    Returns the index values all contacts matching a field condition of a
+    filter query have.
+
+    `email` looks up a whole address, or a domain if the value has no local
+    part, e.g. `@gmail.com`. `address` matches the addresses containing all
+    words of the value, `street`, `city` and `country` match a whole part of
+    the address.
+
+    Args:
+        field (str): One of `SEARCH_FIELDS`.
+        value (str): The value of the condition, e.g. `@gmail.com` or
+        `Kyiv`.
+
+    Returns:
+        list[tuple[str, str]]: Pairs of a field and a value to look up in the
+        index.
+    """
+    value = value.strip()
+    if field in ("email", "domain"):
+        value = value.lower()
+        if field == "email" and "@" in value.lstrip("@"):
+            return [("email", value)]
+        return [("domain", value.lstrip("@"))]
+    if field == "address":
+        return [("address", word) for word in dict.fromkeys(tokenize(value))]
+    return [(field, normalize_value(value))]
+
+
+class FieldIndex:
+    """
+    Index of the entries by the values of their fields.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes an empty index.
+        """
+        # (field, value) -> keys of the entries having it
+        self._keys = {}
+        # Key -> (field, value) pairs of the entry
+        self._values = {}
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._values
+
+    def update(
+        self, key: Hashable, values: Iterable[tuple[str, str]]
+    ) -> None:
+        """
+        Indexes the field values of an entry, replacing the values indexed
+        before.
+
+        Args:
+            key (Hashable): The key of the entry.
+            values (Iterable[tuple[str, str]]): Pairs of a field and a value.
+
+        Returns:
+            None
+        """
+        old_values = self._values.pop(key, frozenset())
+        new_values = frozenset(values)
+        for value in old_values - new_values:
+            keys = self._keys[value]
+            keys.discard(key)
+            if not keys:
+                del self._keys[value]
+        for value in new_values - old_values:
+            self._keys.setdefault(value, set()).add(key)
+        if new_values:
+            self._values[key] = new_values
+
+    def remove(self, key: Hashable) -> None:
+        """
+        Removes an entry from the index if it is indexed.
+
+        Args:
+            key (Hashable): The key of the entry.
+
+        Returns:
+            None
+        """
+        self.update(key, ())
+
+    def keys(self, field: str, value: str) -> set[Hashable]:
+        """
+        Returns the entries having the value in the field.
+
+        Args:
+            field (str): The field, e.g. "domain" or "city".
+            value (str): The normalized value.
+
+        Returns:
+            set[Hashable]: The keys of the entries.
+        """
+        return set(self._keys.get((field, value), ()))
@@ -0,0 +1,471 @@
+"""
+Filter query module.
+
+A filter query combines conditions on the fields of the entries with
+boolean operators, e.g. `missing:email AND month:3` or
+`#work reminder:<01.12.2026`. A condition is a `field:value` predicate, a
+tag `#tag`, or plain words matched against the name or title. The value of
+a field that may have several words, such as a city, runs until the next
+operator, predicate or parenthesis: `city:New York has:email` is the same
+as `city:"New York" has:email`. Other values are a single word or a quoted
+value. `missing:field` negates `has:field`.
+Conditions next to each other are joined with AND, `NOT` between two
+operands means "and not", and OR has the lowest precedence.
+
+A query is planned before it is run. Predicates backed by an index of the
+book are looked up in it, an AND starts from its smallest lookup and
+intersects the other ones with it, and only the entries left after the
+lookups are loaded and checked against the predicates no index answers.
+"""
+
+import re
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Collection, Hashable
+from ..settings.app_settings import app_settings
+
+OPERATORS = {"AND", "OR", "NOT"}
+TOKEN_PATTERN = re.compile(r'\(|\)|"[^"]*"?|[^\s()"]+')
+FIELD_PATTERN = re.compile(r"^([^\W\d_][\w-]*):(.*)$", re.DOTALL)
+RANGE_SEPARATOR = ".."
+
+
+class Predicate:
+    """
+    Condition on a field of an entry.
+    """
+
+    def __init__(
+        self,
+        matches: Callable[[Any], bool],
+        lookup: Callable[[], set | None] | None = None,
+        exact: bool = True,
+    ) -> None:
+        """
+        Initializes a predicate.
+
+        Args:
+            matches (Callable[[Any], bool]): A function telling whether an
+            entry satisfies the predicate.
+            lookup (Callable[[], set | None] | None, optional): A function
+            returning the keys of the entries satisfying the predicate from
+            an index, or None if no index answers it.
+            exact (bool, optional): False if the lookup may return entries
+            that do not satisfy the predicate and have to be checked.
+        """
+        self.matches = matches
+        self.lookup = lookup
+        self.exact = exact
+
+
+class Operator:
+    """
+    AND, OR or NOT of predicates and other operators.
+    """
+
+    def __init__(self, name: str, operands: list) -> None:
+        """
+        Initializes an operator.
+
+        Args:
+            name (str): "AND", "OR" or "NOT".
+            operands (list): The predicates and operators it applies to, a
+            single one for NOT.
+        """
+        self.name = name
+        self.operands = operands
+
+    def matches(self, entry: Any) -> bool:
+        """
+        Tells whether an entry satisfies the operator.
+        """
+        if self.name == "NOT":
+            return not self.operands[0].matches(entry)
+        if self.name == "AND":
+            return all(operand.matches(entry) for operand in self.operands)
+        return any(operand.matches(entry) for operand in self.operands)
+
+
+def tokenize(query: str) -> list[str]:
+    """
+    Splits a filter query into words, quoted values and parentheses.
+
+    Args:
+        query (str): The query.
+
+    Returns:
+        list[str]: The tokens, operators are upper-cased.
+    """
+    return [
+        token.upper() if token.upper() in OPERATORS else token
+        for token in TOKEN_PATTERN.findall(query)
+    ]
+
+
+def is_filter_query(query: str) -> bool:
+    """
+    Tells whether a search term is a filter query rather than a plain term:
+    it has a `field:value` predicate, or a tag next to other terms or
+    operators. A single tag such as `#wor` is a plain term, which also
+    finds similar tags such as `#work`.
+
+    Args:
+        query (str): The search term.
+
+    Returns:
+        bool: True if the term is a filter query.
+    """
+    tokens = tokenize(query)
+    if any(FIELD_PATTERN.match(token) for token in tokens):
+        return True
+    return len(tokens) > 1 and any(
+        token.startswith("#") and len(token) > 1 for token in tokens
+    )
+
+
+def parse_date(value: str) -> date:
+    """
+    Parses a date in the date format of the settings.
+
+    Args:
+        value (str): The date.
+
+    Raises:
+        ValueError: If the date is not in the date format.
+
+    Returns:
+        date: The parsed date.
+    """
+    try:
+        return datetime.strptime(
+            value.strip(), app_settings.date_format
+        ).date()
+    except ValueError as exc:
+        raise ValueError(
+            app_settings.get_validation_errors()["invalid_date"]
+            .format(app_settings.date_str_format)
+        ) from exc
+
+
+def parse_date_range(value: str) -> tuple[date, date]:
+    """
+    Parses a date range: a date, `<date`, `<=date`, `>date`, `>=date` or
+    `start..end` with either end left out.
+
+    Args:
+        value (str): The date range.
+
+    Raises:
+        ValueError: If a date is not in the date format.
+
+    Returns:
+        tuple[date, date]: The first and the last date of the range.
+    """
+    value = value.strip()
+    if RANGE_SEPARATOR in value:
+        start, _, end = value.partition(RANGE_SEPARATOR)
+        return (
+            parse_date(start) if start.strip() else date.min,
+            parse_date(end) if end.strip() else date.max,
+        )
+    for prefix, bounds in (
+        ("<=", lambda day: (date.min, day)),
+        (">=", lambda day: (day, date.max)),
+        ("<", lambda day: (date.min, day - timedelta(days=1))),
+        (">", lambda day: (day + timedelta(days=1), date.max)),
+    ):
+        if value.startswith(prefix):
+            return bounds(parse_date(value[len(prefix):]))
+    day = parse_date(value)
+    return day, day
+
+
+class FilterQuery:
+    """
+    Recursive descent parser of a filter query.
+    """
+
+    def __init__(
+        self,
+        query: str,
+        make_predicate: Callable[[str | None, str], Predicate],
+        phrase_fields: Collection[str] = (),
+    ) -> None:
+        """
+        Prepares a query to be parsed.
+
+        Args:
+            query (str): The query.
+            make_predicate (Callable[[str | None, str], Predicate]): A
+            function returning the predicate for a field and a value, the
+            field is "tag" for a tag and None for plain words. It raises a
+            ValueError for an unknown field or an invalid value.
+            phrase_fields (Collection[str], optional): The fields whose
+            values may have several words.
+        """
+        self.tokens = tokenize(query)
+        self.position = 0
+        self.make_predicate = make_predicate
+        self.phrase_fields = phrase_fields
+        # Fields and values of the predicates that are not negated
+        self.terms = []
+        self._negations = 0
+
+    def parse(self) -> Predicate | Operator:
+        """
+        Parses the query.
+
+        Raises:
+            ValueError: If the query is not a valid filter query.
+
+        Returns:
+            Predicate | Operator: The root of the parsed query.
+        """
+        result = self._or()
+        if self.position != len(self.tokens):
+            self._fail()
+        return result
+
+    def _peek(self) -> str | None:
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return None
+
+    def _next(self) -> str | None:
+        token = self._peek()
+        self.position += 1
+        return token
+
+    def _fail(self) -> None:
+        raise ValueError(
+            app_settings.get_validation_errors()["invalid_filter_query"]
+        )
+
+    def _is_word(self, token: str | None) -> bool:
+        """
+        Tells whether a token is a plain word or a quoted value rather than
+        an operator, a parenthesis, a predicate or a tag.
+        """
+        return token is not None and (token.startswith('"') or not (
+            token in OPERATORS or token in "()"
+            or FIELD_PATTERN.match(token)
+            or token.startswith("#") and len(token) > 1
+        ))
+
+    def _words(self, first: str = "") -> str:
+        """
+        Joins the plain words and quoted values starting at the current
+        token into one value.
+        """
+        words = [first] if first else []
+        while self._is_word(self._peek()):
+            words.append(self._next().strip('"'))
+        return " ".join(words)
+
+    def _or(self) -> Predicate | Operator:
+        """
+        or := and ("OR" and)*
+        """
+        operands = [self._and()]
+        while self._peek() == "OR":
+            self._next()
+            operands.append(self._and())
+        return operands[0] if len(operands) == 1 else Operator("OR", operands)
+
+    def _and(self) -> Predicate | Operator:
+        """
+        and := unary (["AND"] unary | ["AND"] "NOT" unary)*
+        """
+        operands = [self._unary()]
+        while self._peek() not in (None, "OR", ")"):
+            operator = self._peek()
+            if operator == "NOT":
+                self._next()
+                self._negations += 1
+                operands.append(Operator("NOT", [self._unary()]))
+                self._negations -= 1
+                continue
+            if operator == "AND":
+                self._next()
+                # "AND NOT" is the same as "NOT"
+                if self._peek() == "NOT":
+                    continue
+            operands.append(self._unary())
+        return (
+            operands[0] if len(operands) == 1 else Operator("AND", operands)
+        )
+
+    def _unary(self) -> Predicate | Operator:
+        """
+        unary := "NOT" unary | operand
+        """
+        if self._peek() == "NOT":
+            self._next()
+            self._negations += 1
+            operand = self._unary()
+            self._negations -= 1
+            return Operator("NOT", [operand])
+        return self._operand()
+
+    def _operand(self) -> Predicate | Operator:
+        """
+        operand := "(" or ")" | field ":" value | tag | word+
+        """
+        token = self._next()
+        if token == "(":
+            result = self._or()
+            if self._next() != ")":
+                self._fail()
+            return result
+        if token is None or token in OPERATORS or token == ")":
+            self._fail()
+        match = None if token.startswith('"') else FIELD_PATTERN.match(token)
+        if match:
+            field, value = match[1].lower(), match[2].strip('"')
+            if field in self.phrase_fields:
+                value = self._words(value)
+            elif not value and self._is_word(self._peek()):
+                # The value of `field:"value"` or `field: value` is the next
+                # token
+                value = self._next().strip('"')
+        elif token.startswith("#") and len(token) > 1:
+            field, value = "tag", token[1:]
+        else:
+            field, value = None, self._words(token.strip('"'))
+        if field == "missing":
+            return Operator("NOT", [self.make_predicate("has", value)])
+        if not self._negations:
+            self.terms.append((field, value))
+        return self.make_predicate(field, value)
+
+
+def plan(
+    node: Predicate | Operator, universe: Callable[[], set]
+) -> tuple[set | None, bool]:
+    """
+    Finds the entries that may satisfy a parsed query with index lookups.
+
+    Args:
+        node (Predicate | Operator): The parsed query.
+        universe (Callable[[], set]): A function returning the keys of all
+        entries, only called for negations.
+
+    Returns:
+        tuple[set | None, bool]: The keys of the entries that may satisfy
+        the query, None if they cannot be narrowed down without checking
+        every entry, and whether all of them satisfy it.
+    """
+    if isinstance(node, Predicate):
+        keys = node.lookup() if node.lookup else None
+        return (None, False) if keys is None else (set(keys), node.exact)
+    if node.name == "NOT":
+        keys, exact = plan(node.operands[0], universe)
+        if keys is None or not exact:
+            return None, False
+        return universe() - keys, True
+    if node.name == "OR":
+        plans = [plan(operand, universe) for operand in node.operands]
+        if any(keys is None for keys, _ in plans):
+            return None, False
+        return set().union(*(keys for keys, _ in plans)), all(
+            exact for _, exact in plans
+        )
+    # The most selective lookup of an AND is intersected with the others,
+    # exact negations are subtracted instead of taking their complement
+    lookups, negations, exact = [], [], True
+    for operand in node.operands:
+        if isinstance(operand, Operator) and operand.name == "NOT":
+            keys, operand_exact = plan(operand.operands[0], universe)
+            if keys is not None and operand_exact:
+                negations.append(keys)
+            else:
+                exact = False
+            continue
+        keys, operand_exact = plan(operand, universe)
+        if keys is None:
+            exact = False
+        else:
+            lookups.append(keys)
+            exact = exact and operand_exact
+    if not lookups:
+        if not negations:
+            return None, False
+        lookups.append(universe())
+    lookups.sort(key=len)
+    result = set(lookups[0])
+    for keys in lookups[1:]:
+        if not result:
+            break
+        result &= keys
+    for keys in negations:
+        result -= keys
+    return result, exact
+
+
+def run_filter_query(
+    query: str,
+    make_predicate: Callable[[str | None, str], Predicate],
+    universe: Callable[[], set],
+    load: Callable[[Hashable], Any],
+    phrase_fields: Collection[str] = (),
+) -> list[Hashable]:
+    """
+    Parses, plans and runs a filter query.
+
+    Args:
+        query (str): The query, e.g. `missing:email AND month:3`.
+        make_predicate (Callable[[str | None, str], Predicate]): A function
+        returning the predicate for a field and a value, see `FilterQuery`.
+        universe (Callable[[], set]): A function returning the keys of all
+        entries.
+        load (Callable[[Hashable], Any]): A function returning the entry with
+        a key, only called for the entries the lookups did not settle.
+        phrase_fields (Collection[str], optional): The fields whose values
+        may have several words.
+
+    Raises:
+        ValueError: If the query is not a valid filter query.
+
+    Returns:
+        list[Hashable]: The keys of the matching entries, sorted.
+    """
+    root = FilterQuery(query, make_predicate, phrase_fields).parse()
+    all_keys = None
+
+    def cached_universe() -> set:
+        nonlocal all_keys
+        if all_keys is None:
+            all_keys = set(universe())
+        return all_keys
+
+    keys, exact = plan(root, cached_universe)
+    if keys is None:
+        keys, exact = cached_universe(), False
+    if not exact:
+        keys = {key for key in keys if root.matches(load(key))}
+    return sorted(keys)
+
+
+def query_terms(
+    query: str, phrase_fields: Collection[str] = ()
+) -> list[tuple[str | None, str]]:
+    """
+    Returns the fields and values of the predicates of a filter query that
+    are not negated, e.g. to highlight them in the results.
+
+    Args:
+        query (str): The query.
+        phrase_fields (Collection[str], optional): The fields whose values
+        may have several words.
+
+    Raises:
+        ValueError: If the query is not a valid filter query.
+
+    Returns:
+        list[tuple[str | None, str]]: Pairs of a field, None for plain
+        words, and a value.
+    """
+    parser = FilterQuery(
+        query, lambda field, value: Predicate(bool), phrase_fields
+    )
+    parser.parse()
+    return parser.terms
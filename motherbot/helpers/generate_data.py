@@ -2,11 +2,32 @@
 Generate data module.
 """
 
+from functools import lru_cache
 from random import randint, random, choice, choices
 from datetime import datetime, timedelta
-from faker import Faker
+from typing import TYPE_CHECKING
 from ..settings.app_settings import app_settings
 
+if TYPE_CHECKING:
+    from faker import Faker
+
+
+@lru_cache(maxsize=None)
+def get_faker(locale: str) -> "Faker":
+    """
+    Returns a Faker instance for the locale, creating it only once. Faker
+    is slow to import, so it is imported on first use.
+
+    Args:
+        locale (str): The Faker locale, e.g. "en_US".
+
+    Returns:
+        Faker: The Faker instance.
+    """
+    from faker import Faker
+
+    return Faker(locale)
+
 
 def generate_random_contact() -> dict:
     """
@@ -16,7 +37,7 @@ def generate_random_contact() -> dict:
         dict: A dictionary containing random contact data, including name,
         phones, birthday, email, and address.
     """
-    fake = Faker("uk_UA" if app_settings.language == "ua" else "en_US")
+    fake = get_faker("uk_UA" if app_settings.language == "ua" else "en_US")
 
     data = {
         "name": choice([fake.name(), fake.first_name()]),
@@ -47,7 +68,7 @@ def generate_random_note() -> dict:
         dict: A dictionary containing random note data, including title,
         text, tags, and reminder.
     """
-    fake = Faker("uk_UA" if app_settings.language == "ua" else "en_US")
+    fake = get_faker("uk_UA" if app_settings.language == "ua" else "en_US")
 
     data = {
         "title": " ".join(
@@ -0,0 +1,445 @@
+"""
+Import data module.
+
+Contacts and notes are imported from CSV, JSON Lines and vCard files. The
+file is streamed through a pipeline of generators: rows are parsed one at a
+time, turned into records or notes by the field classes, which validate
+them as if they were typed in, and added to the book once the whole file
+is read, so a file that cannot be read leaves the book unchanged. Invalid
+rows are collected with their line numbers instead of stopping the import.
+"""
+
+import csv
+import json
+import os
+from datetime import date
+from typing import Callable, Iterator, TextIO
+from ..contacts.address_book import AddressBook
+from ..contacts.record import Record
+from ..notes.note import Note
+from ..notes.notes_book import NotesBook
+from ..settings.app_settings import app_settings
+
+
+def read_csv(f: TextIO) -> Iterator[tuple[int, dict]]:
+    """
+    Reads rows of a CSV file with a header.
+
+    Args:
+        f (TextIO): The open file.
+
+    Returns:
+        Iterator[tuple[int, dict]]: The line number and the fields of every
+        row.
+    """
+    reader = csv.DictReader(f)
+    for row in reader:
+        yield reader.line_num, {
+            key.strip().lower(): value for key, value in row.items()
+            if key is not None
+        }
+
+
+def read_jsonl(f: TextIO) -> Iterator[tuple[int, dict]]:
+    """
+    Reads rows of a JSON Lines file, one JSON object per line. Blank lines
+    are skipped.
+
+    Args:
+        f (TextIO): The open file.
+
+    Returns:
+        Iterator[tuple[int, dict]]: The line number and the fields of every
+        row, or the error message for lines that are not JSON objects.
+    """
+    for line_number, line in enumerate(f, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_number, str(e)
+            continue
+        if not isinstance(row, dict):
+            yield line_number, app_settings.get_validation_errors()[
+                "invalid_import_row"
+            ]
+            continue
+        yield line_number, {key.lower(): value for key, value in row.items()}
+
+
+def unescape_vcard(value: str) -> str:
+    """
+    Unescapes a vCard property value.
+
+    Args:
+        value (str): The escaped value.
+
+    Returns:
+        str: The value with `\\n`, `\\,`, `\\;` and `\\\\` unescaped.
+    """
+    result = []
+    chars = iter(value)
+    for char in chars:
+        if char == "\\":
+            char = next(chars, "")
+            result.append("\n" if char in "nN" else char)
+        else:
+            result.append(char)
+    return "".join(result)
+
+
+def split_vcard(value: str) -> list[str]:
+    """
+    Splits a structured vCard value (e.g. `ADR`) by unescaped semicolons.
+
+    Args:
+        value (str): The escaped value.
+
+    Returns:
+        list[str]: The unescaped components.
+    """
+    components = [""]
+    escaped = False
+    for char in value:
+        if escaped:
+            components[-1] += "\\" + char
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif char == ";":
+            components.append("")
+        else:
+            components[-1] += char
+    return [unescape_vcard(component) for component in components]
+
+
+def unfold_vcard(f: TextIO) -> Iterator[tuple[int, str]]:
+    """
+    Joins the folded lines of a vCard file.
+
+    Args:
+        f (TextIO): The open file.
+
+    Returns:
+        Iterator[tuple[int, str]]: The number of the first line and the
+        content of every logical line.
+    """
+    start, current = 0, None
+    for line_number, line in enumerate(f, start=1):
+        line = line.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and current is not None:
+            current += line[1:]
+            continue
+        if current is not None:
+            yield start, current
+        start, current = line_number, line
+    if current is not None:
+        yield start, current
+
+
+def read_vcard(f: TextIO) -> Iterator[tuple[int, dict]]:
+    """
+    Reads contacts of a vCard file.
+
+    Args:
+        f (TextIO): The open file.
+
+    Returns:
+        Iterator[tuple[int, dict]]: The line of `BEGIN:VCARD` and the fields
+        of every contact.
+    """
+    row = None
+    start = 0
+    for line_number, line in unfold_vcard(f):
+        name, _, value = line.partition(":")
+        name = name.split(";")[0].split(".")[-1].upper()
+        if name == "BEGIN" and value.upper() == "VCARD":
+            row, start = {"phones": []}, line_number
+        elif row is None:
+            continue
+        elif name == "END" and value.upper() == "VCARD":
+            yield start, row
+            row = None
+        elif name == "FN":
+            row["name"] = unescape_vcard(value)
+        elif name == "N" and "name" not in row:
+            family, given, *_ = split_vcard(value) + [""]
+            row["name"] = f"{given} {family}".strip()
+        elif name == "TEL":
+            row["phones"].append(unescape_vcard(value))
+        elif name == "EMAIL" and "email" not in row:
+            row["email"] = unescape_vcard(value)
+        elif name == "ADR" and "address" not in row:
+            row["address"] = ", ".join(
+                component for component in split_vcard(value) if component
+            )
+        elif name == "BDAY":
+            try:
+                birthday = date.fromisoformat(value.strip())
+                row["birthday"] = birthday.strftime(app_settings.date_format)
+            except ValueError:
+                row["birthday"] = value
+
+
+# Readers of the supported formats by file extension
+CONTACT_READERS = {
+    ".csv": read_csv,
+    ".jsonl": read_jsonl,
+    ".ndjson": read_jsonl,
+    ".vcf": read_vcard,
+}
+NOTE_READERS = {
+    ".csv": read_csv,
+    ".jsonl": read_jsonl,
+    ".ndjson": read_jsonl,
+}
+
+
+def read_rows(
+    filename: str,
+    readers: dict[str, Callable[[TextIO], Iterator[tuple[int, dict | str]]]]
+) -> Iterator[tuple[int, dict | str]]:
+    """
+    Streams the rows of a file, choosing the format by the file extension.
+
+    Args:
+        filename (str): The name of the file.
+        readers (dict): The readers of the supported formats by extension.
+
+    Raises:
+        ValueError: If the format is not supported or the file cannot be
+        opened.
+
+    Returns:
+        Iterator[tuple[int, dict | str]]: The line number and the fields of
+        every row, or an error message for rows that cannot be parsed.
+    """
+    extension = os.path.splitext(filename)[1].lower()
+    if extension not in readers:
+        raise ValueError(
+            app_settings.get_validation_errors()["invalid_file_format"]
+            .format(", ".join(readers))
+        )
+    try:
+        f = open(filename, encoding="utf-8-sig", newline="")
+    except FileNotFoundError as exc:
+        raise ValueError(
+            app_settings.get_validation_errors()["file_not_found"]
+            .format(filename)
+        ) from exc
+    except OSError as exc:
+        raise ValueError(
+            app_settings.get_validation_errors()["file_unreadable"]
+            .format(filename, exc.strerror or exc)
+        ) from exc
+    return stream_rows(f, readers[extension])
+
+
+def stream_rows(
+    f: TextIO, reader: Callable[[TextIO], Iterator[tuple[int, dict | str]]]
+) -> Iterator[tuple[int, dict | str]]:
+    """
+    Streams the rows of an open file and closes it when they are read.
+
+    Args:
+        f (TextIO): The open file.
+        reader (Callable): The reader of the file format.
+
+    Raises:
+        ValueError: If the file cannot be read, is not valid UTF-8 or is not
+        valid CSV.
+
+    Returns:
+        Iterator[tuple[int, dict | str]]: The rows returned by the reader.
+    """
+    with f:
+        try:
+            yield from reader(f)
+        except (OSError, UnicodeDecodeError, csv.Error) as exc:
+            raise ValueError(
+                app_settings.get_validation_errors()["file_unreadable"]
+                .format(f.name, getattr(exc, "strerror", None) or exc)
+            ) from exc
+
+
+def split_values(value: str | list | None) -> list[str]:
+    """
+    Splits a multi-valued field given either as a list or as a string with
+    values separated by semicolons, commas or spaces.
+
+    Args:
+        value (str | list | None): The field value.
+
+    Returns:
+        list[str]: The non-empty values.
+    """
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.replace(";", " ").replace(",", " ").split()
+    return [str(item).strip() for item in value if str(item).strip()]
+
+
+def build_record(row: dict) -> Record:
+    """
+    Creates a record from the fields of a row.
+
+    Args:
+        row (dict): The fields: name, phones (or phone), birthday, email and
+        address.
+
+    Raises:
+        ValueError: If a field is invalid.
+
+    Returns:
+        Record: The record.
+    """
+    record = Record(str(row.get("name") or ""))
+    for phone in split_values(row.get("phones") or row.get("phone")):
+        record.add_phone(phone)
+    for field, add in (
+        ("birthday", record.add_birthday),
+        ("email", record.add_email),
+        ("address", record.add_address),
+    ):
+        value = str(row.get(field) or "").strip()
+        if value:
+            add(value)
+    return record
+
+
+def build_note(row: dict) -> Note:
+    """
+    Creates a note from the fields of a row.
+
+    Args:
+        row (dict): The fields: title, text, tags and reminder.
+
+    Raises:
+        ValueError: If a field is invalid.
+
+    Returns:
+        Note: The note.
+    """
+    note = Note(str(row.get("title") or ""))
+    text = str(row.get("text") or "").strip()
+    if text:
+        note.add_text(text)
+    tags = split_values(row.get("tags"))
+    if tags:
+        note.add_tags(" ".join(tags))
+    reminder = str(row.get("reminder") or "").strip()
+    if reminder:
+        note.set_reminder(reminder)
+    return note
+
+
+def import_rows(
+    rows: Iterator[tuple[int, dict | str]],
+    build: Callable[[dict], Record | Note],
+    book: AddressBook | NotesBook,
+    add: Callable[[Record | Note], None],
+    key: Callable[[Record | Note], str],
+) -> tuple[int, list[tuple[int, str]]]:
+    """
+    Builds entries from the rows and adds them to a book.
+
+    The entries are added only after all rows are read, and the added
+    entries are removed again if adding is interrupted, so the book is
+    either left unchanged or gets every valid row.
+
+    Args:
+        rows (Iterator[tuple[int, dict | str]]): The parsed rows.
+        build (Callable): A function creating an entry from a row.
+        book (AddressBook | NotesBook): The book to import into.
+        add (Callable): A function adding an entry to the book.
+        key (Callable): A function returning the name or title of an entry.
+
+    Raises:
+        ValueError: If the file cannot be read.
+
+    Returns:
+        tuple[int, list[tuple[int, str]]]: The number of imported entries and
+        the line numbers of the rejected rows with the reasons.
+    """
+    entries = []
+    rejected = []
+    for line_number, row in rows:
+        if isinstance(row, str):
+            rejected.append((line_number, row))
+            continue
+        try:
+            entries.append((line_number, build(row)))
+        except ValueError as e:
+            rejected.append((line_number, str(e)))
+
+    changes = book.changes
+    added = []
+    try:
+        for line_number, entry in entries:
+            try:
+                add(entry)
+            except ValueError as e:
+                rejected.append((line_number, str(e)))
+                continue
+            added.append(entry)
+    except BaseException:
+        for entry in added:
+            book.delete(key(entry))
+        book.restore_changes(changes)
+        raise
+    rejected.sort(key=lambda item: item[0])
+    return len(added), rejected
+
+
+def import_contacts_file(
+    book: AddressBook, filename: str
+) -> tuple[int, list[tuple[int, str]]]:
+    """
+    Imports contacts from a CSV, JSON Lines or vCard file into the book.
+
+    The book is not saved, so a large import can be written in one go.
+
+    Args:
+        book (AddressBook): The address book.
+        filename (str): The name of the file.
+
+    Raises:
+        ValueError: If the format is not supported or the file cannot be
+        read.
+
+    Returns:
+        tuple[int, list[tuple[int, str]]]: The number of imported contacts
+        and the line numbers of the rejected rows with the reasons.
+    """
+    return import_rows(
+        read_rows(filename, CONTACT_READERS), build_record, book,
+        book.add_record, lambda record: record.name.value
+    )
+
+
+def import_notes_file(
+    book: NotesBook, filename: str
+) -> tuple[int, list[tuple[int, str]]]:
+    """
+    Imports notes from a CSV or JSON Lines file into the book.
+
+    The book is not saved, so a large import can be written in one go.
+
+    Args:
+        book (NotesBook): The notes book.
+        filename (str): The name of the file.
+
+    Raises:
+        ValueError: If the format is not supported or the file cannot be
+        read.
+
+    Returns:
+        tuple[int, list[tuple[int, str]]]: The number of imported notes and
+        the line numbers of the rejected rows with the reasons.
+    """
+    return import_rows(
+        read_rows(filename, NOTE_READERS), build_note, book,
+        book.add_note, lambda note: note.title.value
+    )
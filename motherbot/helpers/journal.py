@@ -0,0 +1,236 @@
+"""
+Journal module.
+
+The journal is an append-only log kept next to a book file. Every save
+appends the changed entries of the book instead of rewriting the whole book,
+and loading replays the journal on top of the last snapshot.
+"""
+
+import os
+import pickle
+import uuid
+from typing import Collection, Iterable, Iterator, Union
+from .serialize import save_data
+from ..notes.notes_book import NotesBook
+from ..contacts.address_book import AddressBook
+from ..constants.values import JOURNAL_SUFFIX, JOURNAL_COMPACT_SIZE
+
+# Identifies the journal batches saved by this process
+SESSION_ID = uuid.uuid4().hex
+
+
+def journal_path(filename: str) -> str:
+    """
+    Returns the path of the journal kept next to the book file.
+
+    Args:
+        filename (str): The name of the book file.
+
+    Returns:
+        str: The name of the journal file.
+    """
+    return filename + JOURNAL_SUFFIX
+
+
+def dump_journal(
+    data: Union["AddressBook", "NotesBook"],
+    changes: dict,
+    session: str | None = None
+) -> bytes:
+    """
+    Serializes the changed entries of the book as one journal batch.
+
+    Args:
+        data: The book the changes were made in.
+        changes (dict): The changes returned by `pop_changes` of the book.
+        session (str, optional): The id of the session saving the batch,
+        stored as a leading `("session", id, None)` entry, see
+        `batch_session`.
+
+    Returns:
+        bytes: The serialized batch.
+    """
+    entries = [("session", session, None)] if session is not None else []
+    for key, operation in changes.items():
+        if operation == "put" and key in data.data:
+            entries.append(("put", key, data.data[key]))
+        elif operation == "state":
+            state = data.__getstate__()
+            state.pop("data", None)
+            entries.append(("state", None, state))
+        else:
+            entries.append(("delete", key, None))
+    return pickle.dumps(entries, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def append_journal(payload: bytes, filename: str) -> None:
+    """
+    Appends a serialized batch to the journal of the book and flushes it to
+    disk.
+
+    Args:
+        payload (bytes): The batch returned by `dump_journal`.
+        filename (str): The name of the book file.
+
+    Returns:
+        None
+    """
+    with open(journal_path(filename), "ab") as f:
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def read_journal(filename: str, offset: int = 0) -> Iterator[list]:
+    """
+    Reads the batches of the journal of the book.
+
+    A batch that was cut off by a crash in the middle of a save is ignored
+    together with everything after it.
+
+    Args:
+        filename (str): The name of the book file.
+        offset (int, optional): The position in the journal to start from,
+        e.g. the journal size at the time the book was loaded.
+
+    Returns:
+        Iterator[list]: The `(operation, key, value)` entries of every batch.
+    """
+    try:
+        with open(journal_path(filename), "rb") as f:
+            f.seek(offset)
+            while True:
+                try:
+                    yield pickle.load(f)
+                except (EOFError, pickle.UnpicklingError):
+                    break
+    except FileNotFoundError:
+        return
+
+
+def batch_session(entries: list) -> str | None:
+    """
+    Returns the id of the session that saved a journal batch.
+
+    Args:
+        entries (list): The `(operation, key, value)` entries of the batch.
+
+    Returns:
+        str | None: The session id or None if the batch is not tagged.
+    """
+    if entries and entries[0][0] == "session":
+        return entries[0][1]
+    return None
+
+
+def apply_journal(
+    data: Union["AddressBook", "NotesBook"],
+    entries: Iterable[tuple],
+    skip: Collection = ()
+) -> set:
+    """
+    Applies journal entries to the book.
+
+    Args:
+        data: The book.
+        entries (Iterable[tuple]): The `(operation, key, value)` entries.
+        skip (Collection, optional): The keys that must not be changed, the
+        `None` key stands for the book settings.
+
+    Returns:
+        set: The skipped keys the entries tried to change.
+    """
+    skipped = set()
+    for operation, key, value in entries:
+        if operation == "session":
+            continue
+        if key in skip:
+            skipped.add(key)
+        elif operation == "put":
+            data.data[key] = value
+            value.bind(data)
+            data.update_index(key, value)
+        elif operation == "delete":
+            data.data.pop(key, None)
+            data.update_index(key, None)
+        elif operation == "state":
+            data.__dict__.update(value)
+    return skipped
+
+
+def replay_journal(
+    data: Union["AddressBook", "NotesBook"],
+    filename: str
+) -> None:
+    """
+    Applies the journal entries to the book loaded from the snapshot.
+
+    Args:
+        data: The book loaded from the snapshot.
+        filename (str): The name of the book file.
+
+    Returns:
+        None
+    """
+    for entries in read_journal(filename):
+        apply_journal(data, entries)
+
+
+def journal_size(filename: str) -> int:
+    """
+    Returns the size of the journal in bytes.
+
+    Args:
+        filename (str): The name of the book file.
+
+    Returns:
+        int: The size of the journal or 0 if there is no journal.
+    """
+    try:
+        return os.path.getsize(journal_path(filename))
+    except FileNotFoundError:
+        return 0
+
+
+def remove_journal(filename: str) -> None:
+    """
+    Removes the journal once its entries are part of the snapshot.
+
+    Args:
+        filename (str): The name of the book file.
+
+    Returns:
+        None
+    """
+    try:
+        os.remove(journal_path(filename))
+    except FileNotFoundError:
+        pass
+
+
+def compact_journal(
+    data: Union["AddressBook", "NotesBook"],
+    filename: str,
+    threshold: int = JOURNAL_COMPACT_SIZE
+) -> bool:
+    """
+    Folds the journal into a fresh snapshot once it grows over `threshold`.
+
+    The snapshot is written before the journal is removed, so a crash in
+    between only makes the next load replay entries that are already in the
+    snapshot.
+
+    Args:
+        data: The book to be written as a snapshot.
+        filename (str): The name of the book file.
+        threshold (int, optional): The journal size in bytes that triggers
+        the compaction.
+
+    Returns:
+        bool: True if the journal was compacted, False otherwise.
+    """
+    if journal_size(filename) <= threshold:
+        return False
+    save_data(data, filename)
+    remove_journal(filename)
+    return True
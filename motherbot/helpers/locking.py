@@ -0,0 +1,124 @@
+"""
+Locking module.
+
+Several sessions can work with the same book files. Every read and write of
+a book file happens under a short inter-process lock, and every session
+remembers the version of the files it last saw, so that changes saved by
+other sessions are merged in record by record instead of being overwritten.
+"""
+
+from typing import Union
+from filelock import FileLock
+from .serialize import load_data
+from .journal import (
+    apply_journal,
+    batch_session,
+    journal_path,
+    read_journal,
+    replay_journal,
+)
+from .mapped_storage import snapshot_stamp
+from ..notes.notes_book import NotesBook
+from ..contacts.address_book import AddressBook
+from ..constants.values import LOCK_SUFFIX, LOCK_TIMEOUT
+
+_locks = {}
+
+
+def book_lock(filename: str) -> FileLock:
+    """
+    Returns the inter-process lock of a book file.
+
+    The lock is only held while the files of the book are read or written,
+    never for a whole session.
+
+    Args:
+        filename (str): The name of the book file.
+
+    Returns:
+        FileLock: The lock, raises `filelock.Timeout` if it cannot be
+        acquired within `LOCK_TIMEOUT` seconds.
+    """
+    if filename not in _locks:
+        _locks[filename] = FileLock(
+            filename + LOCK_SUFFIX, timeout=LOCK_TIMEOUT
+        )
+    return _locks[filename]
+
+
+def disk_stamp(filename: str) -> tuple:
+    """
+    Returns the version of a book on disk: the size and modification time
+    of its snapshot and of its journal.
+
+    Args:
+        filename (str): The name of the book file.
+
+    Returns:
+        tuple: The stamps of the snapshot and the journal.
+    """
+    return snapshot_stamp(filename), snapshot_stamp(journal_path(filename))
+
+
+def merge_disk_changes(
+    data: Union["AddressBook", "NotesBook"],
+    filename: str,
+    base: tuple,
+    keep: dict,
+    session: str | None = None
+) -> set:
+    """
+    Merges the changes saved by other sessions into the book. Must be called
+    with the lock of the book held.
+
+    If only the journal grew since `base`, the new batches are applied and
+    the entries they change that were also changed in this session are
+    reported as conflicts, except for the batches saved by this session
+    itself, e.g. appended while it was out of sync with the files. If the snapshot was rewritten, the book is loaded
+    from disk and its entries replace the ones in memory, and the entries
+    changed in this session whose version on disk differs from the version
+    they were changed from are reported as conflicts, see
+    `base_primitives` of the books. Either way the entries changed in this
+    session and not saved yet are kept as they are.
+
+    Args:
+        data: The book.
+        filename (str): The name of the book file.
+        base (tuple): The `disk_stamp` of the book when it was last merged.
+        keep (dict): The unsaved changes of the book.
+        session (str, optional): The id the batches of this session are
+        tagged with, see `dump_journal`.
+
+    Returns:
+        set: The keys of the kept entries that were also changed on disk.
+    """
+    snapshot, journal = disk_stamp(filename)
+    base_snapshot, base_journal = base
+    offset = base_journal[0] if base_journal else 0
+    if snapshot == base_snapshot and journal and journal[0] >= offset:
+        conflicts = set()
+        for entries in read_journal(filename, offset):
+            skipped = apply_journal(data, entries, keep)
+            if session is None or batch_session(entries) != session:
+                conflicts |= skipped
+        return conflicts
+
+    disk_data = load_data(filename, default_data=type(data)())
+    replay_journal(disk_data, filename)
+    state = disk_data.__getstate__()
+    state.pop("data", None)
+    entries = [
+        ("delete", key, None)
+        for key in list(data.data) if key not in disk_data.data
+    ]
+    entries += [("put", key, value) for key, value in disk_data.data.items()]
+    entries.append(("state", None, state))
+    conflicts = {
+        key for key in keep
+        if key is not None and data.base_primitives(key) != (
+            disk_data.data[key].to_primitives()
+            if key in disk_data.data else None
+        )
+    }
+    apply_journal(data, entries, keep)
+    return conflicts
@@ -0,0 +1,216 @@
+"""
+Memory-mapped storage module.
+
+A view file is a read-only copy of a book laid out for `mmap`: a header
+with the book settings and the keys of the entries, a fixed-width index of
+entry offsets and the entries themselves, each pickled on its own. Opening
+a view only reads the header, an entry is decoded when it is first used.
+"""
+
+import mmap
+import os
+import pickle
+import struct
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Any, Callable, Iterator
+from ..constants.values import (
+    TEMP_SUFFIX,
+    VIEW_MAGIC,
+    VIEW_VERSION,
+    VIEW_CACHE_SIZE,
+)
+
+# Version, number of entries and length of the pickled metadata
+VIEW_HEADER = struct.Struct("<BQQ")
+# Offset and length of an entry
+VIEW_INDEX_ENTRY = struct.Struct("<QQ")
+
+
+def snapshot_stamp(filename: str) -> tuple[int, int] | None:
+    """
+    Returns the size and modification time of a snapshot file, used to tell
+    whether a view was built from the current snapshot.
+
+    Args:
+        filename (str): The name of the snapshot file.
+
+    Returns:
+        tuple[int, int] | None: The stamp or None if the file does not exist.
+    """
+    try:
+        stat = os.stat(filename)
+    except FileNotFoundError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def write_view(data: Any, filename: str, stamp: Any) -> None:
+    """
+    Atomically writes a view file of a book.
+
+    Args:
+        data: The book, converted with its `to_primitives` method.
+        filename (str): The name of the view file.
+        stamp: The stamp of the snapshot the view is built from.
+
+    Returns:
+        None
+    """
+    state, entries = data.to_primitives()
+    meta = pickle.dumps(
+        (stamp, state, list(data.data)), protocol=pickle.HIGHEST_PROTOCOL
+    )
+    temp_filename = filename + TEMP_SUFFIX
+    with open(temp_filename, "wb") as f:
+        f.write(VIEW_MAGIC)
+        f.write(VIEW_HEADER.pack(VIEW_VERSION, len(entries), len(meta)))
+        f.write(meta)
+        index_offset = f.tell()
+        offset = index_offset + VIEW_INDEX_ENTRY.size * len(entries)
+        index = bytearray()
+        f.seek(offset)
+        for primitives in entries:
+            blob = pickle.dumps(primitives, protocol=pickle.HIGHEST_PROTOCOL)
+            f.write(blob)
+            index += VIEW_INDEX_ENTRY.pack(offset, len(blob))
+            offset += len(blob)
+        f.seek(index_offset)
+        f.write(index)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_filename, filename)
+
+
+def read_view_stamp(filename: str) -> Any:
+    """
+    Returns the stamp of the snapshot a view file was built from.
+
+    Args:
+        filename (str): The name of the view file.
+
+    Returns:
+        The stamp or None if the file does not exist or is not a view.
+    """
+    try:
+        with open(filename, "rb") as f:
+            if f.read(len(VIEW_MAGIC)) != VIEW_MAGIC:
+                return None
+            version, _, meta_length = VIEW_HEADER.unpack(
+                f.read(VIEW_HEADER.size)
+            )
+            if version != VIEW_VERSION:
+                return None
+            return pickle.loads(f.read(meta_length))[0]
+    except (FileNotFoundError, struct.error, pickle.UnpicklingError):
+        return None
+
+
+class MappedMapping(MutableMapping):
+    """
+    Dictionary-like view of the entries of a memory-mapped view file.
+
+    Entries are decoded from the mapped file on first access and recently
+    used ones are kept in a bounded cache. The file itself is never
+    written: entries set or deleted through the mapping (e.g. when the
+    journal is replayed) only change the mapping in memory.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        decode: Callable[[Any], Any],
+        bind: Callable[[Any], None] = None,
+    ) -> None:
+        """
+        Maps the view file and reads its header.
+
+        Args:
+            filename (str): The name of the view file.
+            decode (Callable): A function creating an entry from its plain
+            values.
+            bind (Callable, optional): A function called with every decoded
+            entry.
+        """
+        self.decode = decode
+        self.bind = bind
+        self._cache = OrderedDict()
+        with open(filename, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        start = len(VIEW_MAGIC)
+        _, _, meta_length = VIEW_HEADER.unpack_from(self._mmap, start)
+        start += VIEW_HEADER.size
+        _, self.state, keys = pickle.loads(
+            self._mmap[start:start + meta_length]
+        )
+        self._index_offset = start + meta_length
+        # Keys map to the position of the entry in the index, or to the
+        # entry itself once it was set in memory
+        self._entries = {key: position for position, key in enumerate(keys)}
+
+    def _load(self, position: int) -> Any:
+        """
+        Decodes the entry at the given position of the index.
+        """
+        offset, length = VIEW_INDEX_ENTRY.unpack_from(
+            self._mmap, self._index_offset + position * VIEW_INDEX_ENTRY.size
+        )
+        value = self.decode(pickle.loads(self._mmap[offset:offset + length]))
+        if self.bind:
+            self.bind(value)
+        return value
+
+    def __getitem__(self, key: str) -> Any:
+        position = self._entries[key]
+        if not isinstance(position, int):
+            return position
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+        value = self._cache[key] = self._load(position)
+        if len(self._cache) > VIEW_CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._cache.pop(key, None)
+        self._entries[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        del self._entries[key]
+        self._cache.pop(key, None)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._entries
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def values(self) -> Iterator[Any]:
+        """
+        Streams all entries in order without caching them.
+        """
+        for _, value in self.items():
+            yield value
+
+    def items(self) -> Iterator[tuple[str, Any]]:
+        """
+        Streams all `(key, entry)` pairs in order without caching them.
+        """
+        for key, position in list(self._entries.items()):
+            if not isinstance(position, int):
+                yield key, position
+            elif key in self._cache:
+                yield key, self._cache[key]
+            else:
+                yield key, self._load(position)
+
+    def close(self) -> None:
+        """
+        Unmaps the view file.
+        """
+        self._cache.clear()
+        self._mmap.close()
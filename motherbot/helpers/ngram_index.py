@@ -0,0 +1,272 @@
+"""
+N-gram index module.
+
+The n-gram index maps every character n-gram of short texts, such as names
+and phone numbers, to the keys of the entries containing it. A search looks
+up the n-grams of the search term and returns a small set of candidate
+entries to be scored with fuzzy matching, instead of scoring every entry.
+"""
+
+import heapq
+from array import array
+from collections import Counter
+from typing import Hashable, Iterable
+from ..constants.values import NGRAM_SIZE, SEARCH_CANDIDATE_LIMIT
+
+# Stands for any character in the n-grams of typo variants
+WILDCARD = "\0"
+
+
+class NgramIndex:
+    """
+    Inverted index of the character n-grams of the texts of every entry.
+
+    Texts are padded with a space on both sides, so every substring shorter
+    than an n-gram is also part of one. Every indexed version of an entry
+    gets a new id, and the postings are compact arrays of ids. Ids of
+    replaced or removed versions are only marked as stale, and the postings
+    are rebuilt once stale ids outnumber the live ones. Entries keep the
+    position they were first added at, and candidates are returned in that
+    order. Every indexed n-gram is also filed under its patterns with one
+    character replaced by a wildcard, to look up the n-grams of a term with
+    a character inserted or replaced.
+    """
+
+    def __init__(self, size: int = NGRAM_SIZE) -> None:
+        """
+        Initializes an empty index.
+
+        Args:
+            size (int, optional): The length of the n-grams.
+        """
+        self.size = size
+        # N-gram -> ids of the entries containing it
+        self._postings = {}
+        # N-gram with one character replaced by `WILDCARD` -> n-grams
+        self._patterns = {}
+        # Id -> key of the entry, None if the id is stale
+        self._keys = []
+        # Key -> position of the entry, its id and its indexed texts
+        self._entries = {}
+        self._next_position = 0
+        self._stale = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._entries
+
+    def ngrams(self, text: str) -> set[str]:
+        """
+        Returns the n-grams of a text padded with spaces.
+
+        Args:
+            text (str): The text.
+
+        Returns:
+            set[str]: The distinct n-grams.
+        """
+        text = f" {text} "
+        return {
+            text[i:i + self.size]
+            for i in range(len(text) - self.size + 1)
+        }
+
+    def update(self, key: Hashable, texts: Iterable[str]) -> None:
+        """
+        Indexes the texts of an entry, replacing the texts indexed before.
+
+        Args:
+            key (Hashable): The key of the entry.
+            texts (Iterable[str]): The texts of the entry.
+
+        Returns:
+            None
+        """
+        texts = tuple(texts)
+        if key in self._entries:
+            position, entry_id, old_texts = self._entries[key]
+            if old_texts == texts:
+                return
+            self._keys[entry_id] = None
+            self._stale += 1
+        else:
+            position = self._next_position
+            self._next_position += 1
+        self._entries[key] = (position, self._add_postings(key, texts), texts)
+        self._compact()
+
+    def remove(self, key: Hashable) -> None:
+        """
+        Removes an entry from the index if it is indexed.
+
+        Args:
+            key (Hashable): The key of the entry.
+
+        Returns:
+            None
+        """
+        if key in self._entries:
+            _, entry_id, _ = self._entries.pop(key)
+            self._keys[entry_id] = None
+            self._stale += 1
+            self._compact()
+
+    def _add_postings(self, key: Hashable, texts: tuple[str, ...]) -> int:
+        """
+        Adds a new id of the entry to the postings of the n-grams of its
+        texts and returns the id.
+        """
+        entry_id = len(self._keys)
+        self._keys.append(key)
+        for ngram in set().union(*map(self.ngrams, texts)):
+            postings = self._postings.get(ngram)
+            if postings is None:
+                postings = self._postings[ngram] = array("I")
+                for i in range(len(ngram)):
+                    pattern = ngram[:i] + WILDCARD + ngram[i + 1:]
+                    self._patterns.setdefault(pattern, []).append(ngram)
+            postings.append(entry_id)
+        return entry_id
+
+    def _compact(self) -> None:
+        """
+        Rebuilds the postings without stale ids once they outnumber the
+        live ones.
+        """
+        if self._stale <= max(len(self._entries), 1024):
+            return
+        self._postings = {}
+        self._patterns = {}
+        self._keys = []
+        self._stale = 0
+        for key, (position, _, texts) in self._entries.items():
+            self._entries[key] = (
+                position, self._add_postings(key, texts), texts
+            )
+
+    def term_ngrams(self, term: str) -> set[str]:
+        """
+        Returns the n-grams of a search term, without padding.
+
+        Args:
+            term (str): The search term.
+
+        Returns:
+            set[str]: The distinct n-grams.
+        """
+        return {
+            term[i:i + self.size]
+            for i in range(len(term) - self.size + 1)
+        }
+
+    def typo_ngrams(self, term: str) -> set[str]:
+        """
+        Returns the n-grams of the variants of a search term with one
+        character deleted, inserted or replaced or two adjacent characters
+        swapped, which are not n-grams of the term itself. They let entries
+        that differ from the term by a typo share n-grams with it.
+
+        The inserted or replaced character can be any character, so the
+        n-grams containing it are looked up as patterns among the indexed
+        n-grams. The variants are also padded with spaces like the indexed
+        texts, for the entries starting or ending with a part of a variant.
+
+        Args:
+            term (str): The search term.
+
+        Returns:
+            set[str]: The distinct n-grams.
+        """
+        variants = {term[:i] + term[i + 1:] for i in range(len(term))}
+        variants |= {
+            term[:i] + term[i + 1] + term[i] + term[i + 2:]
+            for i in range(len(term) - 1)
+        }
+        ngrams = set().union(*map(self.term_ngrams, variants))
+        ngrams.update(f" {variant}"[:self.size] for variant in variants)
+        ngrams.update(f"{variant} "[-self.size:] for variant in variants)
+        patterns = set()
+        for i in range(len(term) + 1):
+            # The character inserted before or replacing the i-th one
+            for variant in {
+                term[:i] + WILDCARD + term[i:],
+                term[:i] + WILDCARD + term[i + 1:],
+            }:
+                patterns.update(
+                    variant[j:j + self.size]
+                    for j in range(
+                        max(i - self.size + 1, 0),
+                        min(i, len(variant) - self.size) + 1,
+                    )
+                )
+        for pattern in patterns:
+            ngrams.update(self._patterns.get(pattern, ()))
+        return ngrams - self.term_ngrams(term)
+
+    def candidates(
+        self, term: str, limit: int = SEARCH_CANDIDATE_LIMIT
+    ) -> list[Hashable]:
+        """
+        Returns the entries that may match the search term.
+
+        Entries with all n-grams of the term, which include every entry
+        containing the term, are always returned. Of the entries sharing only
+        some n-grams with the term or its typo variants, the `limit` entries
+        sharing the most are returned. A term shorter than an n-gram is
+        looked up in the n-grams themselves, which returns exactly the
+        entries containing it.
+
+        Args:
+            term (str): The search term.
+            limit (int, optional): The maximum number of entries sharing only
+            some n-grams with the term.
+
+        Returns:
+            list[Hashable]: The keys of the entries in the order they were
+            added to the index.
+        """
+        ngrams = self.term_ngrams(term)
+        if not ngrams:
+            ids = set().union(*(
+                postings for ngram, postings in self._postings.items()
+                if term in ngram
+            ))
+        else:
+            counts = Counter()
+            for ngram in ngrams:
+                counts.update(self._postings.get(ngram, ()))
+            ids = [
+                entry_id for entry_id, count in counts.items()
+                if count == len(ngrams)
+            ]
+            for ngram in self.typo_ngrams(term):
+                counts.update(self._postings.get(ngram, ()))
+            for entry_id in ids:
+                del counts[entry_id]
+            ids += self._top_ids(counts, limit)
+        keys = [self._keys[entry_id] for entry_id in ids]
+        return sorted(
+            (key for key in keys if key is not None),
+            key=lambda key: self._entries[key][0],
+        )
+
+    def _top_ids(self, counts: Counter, limit: int) -> list[int]:
+        """
+        Returns the `limit` live ids with the highest counts. Ties are broken
+        by the position of the entries, so the result does not depend on
+        when the entries were last updated.
+        """
+        for entry_id in [i for i in counts if self._keys[i] is None]:
+            del counts[entry_id]
+        top = heapq.nlargest(limit, counts, key=counts.__getitem__)
+        if not top or len(top) < limit:
+            return top
+        lowest = counts[top[-1]]
+        ids = [entry_id for entry_id in top if counts[entry_id] > lowest]
+        ties = [
+            entry_id for entry_id, count in counts.items() if count == lowest
+        ]
+        ties.sort(key=lambda entry_id: self._entries[self._keys[entry_id]][0])
+        return ids + ties[:limit - len(ids)]
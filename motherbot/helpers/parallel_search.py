@@ -0,0 +1,159 @@
+"""
+Parallel search module.
+
+Fuzzy scoring of a search term against a very large book is split between
+worker processes. The entries are divided into shards by key, and every
+shard is sent once to its own worker process, which keeps the texts of the
+shard in memory between searches. A search only sends the term and the
+keys of the candidates, together with the entries changed since the last
+search, and the scores of all shards are merged.
+"""
+
+import multiprocessing
+import os
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from typing import Hashable, Iterable, Sequence
+from .scoring import score_entries
+
+# Texts of the entries of the shard of a worker process by key
+_shard = {}
+
+
+def _load_shard(entries: dict[Hashable, Sequence[str]]) -> None:
+    """
+    Keeps the entries of the shard in the worker process.
+    """
+    global _shard
+    _shard = entries
+
+
+def _score_shard(
+    term: str,
+    keys: list[Hashable],
+    changes: dict[Hashable, Sequence[str] | None],
+) -> dict[Hashable, int]:
+    """
+    Applies the changes to the shard of the worker process and scores the
+    entries with the given keys.
+    """
+    for key, texts in changes.items():
+        if texts is None:
+            _shard.pop(key, None)
+        else:
+            _shard[key] = texts
+    return score_entries(
+        term, {key: _shard[key] for key in keys if key in _shard}
+    )
+
+
+def _shutdown(executors: list[ProcessPoolExecutor]) -> None:
+    """
+    Stops the worker processes without waiting for them.
+    """
+    for executor in executors:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+class ShardedScorer:
+    """
+    Scores search terms with `score_entries` in worker processes, one per
+    shard of the entries.
+    """
+
+    def __init__(
+        self,
+        entries: Iterable[tuple[Hashable, Sequence[str]]],
+        shards: int | None = None,
+    ) -> None:
+        """
+        Splits the entries into shards and starts a worker process for each
+        of them.
+
+        Args:
+            entries (Iterable[tuple[Hashable, Sequence[str]]]): Pairs of a key
+            and the texts of the entry, the main text first.
+            shards (int | None, optional): The number of shards, the number
+            of CPU cores if None.
+        """
+        self.shards = shards or os.cpu_count() or 1
+        shard_entries = [{} for _ in range(self.shards)]
+        for key, texts in entries:
+            shard_entries[self._shard_of(key)][key] = tuple(texts)
+        # Every shard has its own single-process executor, so the searches
+        # of a shard always run in the process that keeps it
+        context = multiprocessing.get_context("spawn")
+        self._executors = [
+            ProcessPoolExecutor(
+                max_workers=1,
+                mp_context=context,
+                initializer=_load_shard,
+                initargs=(shard,),
+            )
+            for shard in shard_entries
+        ]
+        # Entries changed since the last search by shard
+        self._changes = [{} for _ in range(self.shards)]
+        self._finalizer = weakref.finalize(
+            self, _shutdown, self._executors
+        )
+
+    def _shard_of(self, key: Hashable) -> int:
+        """
+        Returns the number of the shard an entry belongs to.
+        """
+        return hash(key) % self.shards
+
+    def update(self, key: Hashable, texts: Sequence[str] | None) -> None:
+        """
+        Records a changed entry, which is sent to its worker with the next
+        search.
+
+        Args:
+            key (Hashable): The key of the entry.
+            texts (Sequence[str] | None): The texts of the entry, the main
+            text first, or None if it was deleted.
+
+        Returns:
+            None
+        """
+        self._changes[self._shard_of(key)][key] = (
+            None if texts is None else tuple(texts)
+        )
+
+    def score(
+        self, term: str, keys: Iterable[Hashable]
+    ) -> dict[Hashable, int]:
+        """
+        Scores the entries with the given keys in the worker processes.
+
+        Args:
+            term (str): The normalized search term.
+            keys (Iterable[Hashable]): The keys of the entries to score.
+
+        Returns:
+            dict[Hashable, int]: The scores of the matching entries by key,
+            in the order of `keys`.
+        """
+        keys = list(keys)
+        shard_keys = [[] for _ in range(self.shards)]
+        for key in keys:
+            shard_keys[self._shard_of(key)].append(key)
+        futures = []
+        for shard, executor in enumerate(self._executors):
+            if not shard_keys[shard] and not self._changes[shard]:
+                continue
+            changes, self._changes[shard] = self._changes[shard], {}
+            futures.append(executor.submit(
+                _score_shard, term, shard_keys[shard], changes
+            ))
+        scores = {}
+        for future in futures:
+            scores.update(future.result())
+        return {key: scores[key] for key in keys if key in scores}
+
+    def close(self) -> None:
+        """
+        Stops the worker processes.
+        """
+        self._finalizer()
@@ -0,0 +1,152 @@
+"""
+Phone index module.
+
+The phone index maps every phone number to the contacts having it, for
+"who owns this number" lookups, and keeps the distinct numbers sorted, so
+the numbers starting with some digits are found with a binary search.
+"""
+
+import bisect
+from typing import Hashable, Iterable, Iterator
+
+
+class PhoneIndex:
+    """
+    Index of the phone numbers of every entry.
+    """
+
+    def __init__(self, numbers: Iterable[tuple[str, Hashable]] = ()) -> None:
+        """
+        Initializes the index. The numbers are sorted once, so building an
+        index of a whole book is much faster than updating an empty one
+        entry by entry.
+
+        Args:
+            numbers (Iterable[tuple[str, Hashable]], optional): Pairs of a
+            phone number and the key of the entry having it.
+        """
+        # Phone number -> keys of the entries having it
+        self._owners = {}
+        # Key -> phone numbers of the entry
+        self._phones = {}
+        phones_by_key = {}
+        for phone, key in numbers:
+            self._owners.setdefault(phone, set()).add(key)
+            phones_by_key.setdefault(key, set()).add(phone)
+        for key, phones in phones_by_key.items():
+            self._phones[key] = frozenset(phones)
+        # Distinct phone numbers in ascending order
+        self._sorted = sorted(self._owners)
+
+    def __len__(self) -> int:
+        return len(self._owners)
+
+    def __contains__(self, phone: object) -> bool:
+        return phone in self._owners
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._owners)
+
+    def update(self, key: Hashable, phones: Iterable[str]) -> None:
+        """
+        Indexes the phone numbers of an entry, replacing the numbers indexed
+        before.
+
+        Args:
+            key (Hashable): The key of the entry.
+            phones (Iterable[str]): The phone numbers of the entry.
+
+        Returns:
+            None
+        """
+        old_phones = self._phones.pop(key, frozenset())
+        new_phones = frozenset(phones)
+        for phone in old_phones - new_phones:
+            owners = self._owners[phone]
+            owners.discard(key)
+            if not owners:
+                del self._owners[phone]
+                del self._sorted[bisect.bisect_left(self._sorted, phone)]
+        for phone in new_phones - old_phones:
+            if phone not in self._owners:
+                self._owners[phone] = set()
+                bisect.insort(self._sorted, phone)
+            self._owners[phone].add(key)
+        if new_phones:
+            self._phones[key] = new_phones
+
+    def remove(self, key: Hashable) -> None:
+        """
+        Removes an entry from the index if it is indexed.
+
+        Args:
+            key (Hashable): The key of the entry.
+
+        Returns:
+            None
+        """
+        self.update(key, ())
+
+    def owners(self, phone: str) -> set[Hashable]:
+        """
+        Returns the entries having the phone number.
+
+        Args:
+            phone (str): The phone number.
+
+        Returns:
+            set[Hashable]: The keys of the entries.
+        """
+        return set(self._owners.get(phone, ()))
+
+    def phones(self, key: Hashable) -> frozenset[str]:
+        """
+        Returns the phone numbers of an entry.
+
+        Args:
+            key (Hashable): The key of the entry.
+
+        Returns:
+            frozenset[str]: The phone numbers.
+        """
+        return self._phones.get(key, frozenset())
+
+    def keys(self) -> set[Hashable]:
+        """
+        Returns the entries having any phone number.
+
+        Returns:
+            set[Hashable]: The keys of the entries.
+        """
+        return set(self._phones)
+
+    def with_prefix(self, prefix: str) -> list[str]:
+        """
+        Returns the phone numbers starting with the prefix.
+
+        Args:
+            prefix (str): The first digits.
+
+        Returns:
+            list[str]: The phone numbers in ascending order.
+        """
+        start = bisect.bisect_left(self._sorted, prefix)
+        end = start
+        while end < len(self._sorted) and (
+            self._sorted[end].startswith(prefix)
+        ):
+            end += 1
+        return self._sorted[start:end]
+
+    def shared(self) -> dict[str, set[Hashable]]:
+        """
+        Returns the phone numbers that belong to more than one entry.
+
+        Returns:
+            dict[str, set[Hashable]]: The keys of the entries by phone number.
+        """
+        return {
+            phone: set(owners)
+            for phone, owners in self._owners.items()
+            if len(owners) > 1
+        }
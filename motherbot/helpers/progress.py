@@ -0,0 +1,47 @@
+"""
+Progress module.
+
+The progress module shows a progress bar for long-running disk operations.
+"""
+
+from contextlib import contextmanager
+from typing import Callable, Iterator
+from ..constants.values import PROGRESS_MIN_SIZE
+
+
+@contextmanager
+def io_progress(description: str) -> Iterator[Callable[[int, int], None]]:
+    """
+    Provides a callback that reports the bytes read or written so far.
+
+    The progress bar is shown only when the operation is large enough
+    (`PROGRESS_MIN_SIZE` bytes) to be noticeable, small files are read and
+    written without any output, and `rich` is not even imported for them.
+
+    Args:
+        description (str): The text displayed next to the progress bar.
+
+    Yields:
+        Callable[[int, int], None]: A callback that takes the number of bytes
+        processed so far and the total number of bytes.
+    """
+    progress = None
+    task = None
+
+    def report(completed: int, total: int) -> None:
+        nonlocal progress, task
+        if progress is None:
+            if total < PROGRESS_MIN_SIZE:
+                return
+            from rich.progress import Progress
+
+            progress = Progress()
+            progress.start()
+            task = progress.add_task(description, total=total)
+        progress.update(task, completed=completed, total=total)
+
+    try:
+        yield report
+    finally:
+        if progress is not None:
+            progress.stop()
@@ -0,0 +1,32 @@
+"""
+Restorable field module.
+"""
+
+from typing import Any, Self
+
+
+class Restorable:
+    """
+    Mixin of the field classes that can be created from an already
+    validated value, e.g. one loaded from a snapshot, without validating it
+    again.
+    """
+
+    # The attribute the value of the field is kept in
+    value_attribute = "value"
+
+    @classmethod
+    def restore(cls, value: Any) -> Self:
+        """
+        Creates a field from an already validated value without validating
+        it again.
+
+        Args:
+            value (Any): The value of the field.
+
+        Returns:
+            Self: The field.
+        """
+        field = cls.__new__(cls)
+        setattr(field, cls.value_attribute, value)
+        return field
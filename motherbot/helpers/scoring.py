@@ -0,0 +1,206 @@
+"""
+Scoring module.
+
+Fuzzy scores are computed with rapidfuzz. A search term is scored against
+all candidates in one call, on several threads for long candidate lists,
+instead of one pair at a time from a Python loop. Scores are rounded to
+integers as they were with fuzzywuzzy.
+
+rapidfuzz's `partial_ratio` is more permissive than fuzzywuzzy's: it finds
+the best alignment of the term, also against the start or the end of the
+text, so more texts reach `FUZZY_MATCH_THRESHOLD`. The threshold is kept,
+which still matches what fuzzywuzzy matched, but searches return more weak
+matches than they used to. No other threshold gives the old results: a
+higher one drops old matches while still adding new ones.
+"""
+
+import heapq
+from typing import Hashable, Iterable, Mapping, Sequence
+from ..constants.values import (
+    FUZZY_MATCH_THRESHOLD,
+    PARALLEL_SCORING_MIN_CHOICES,
+)
+
+
+def ratio(s1: str, s2: str) -> int:
+    """
+    Returns the similarity of two strings.
+
+    Args:
+        s1 (str): The first string.
+        s2 (str): The second string.
+
+    Returns:
+        int: The similarity from 0 to 100.
+    """
+    from rapidfuzz import fuzz
+
+    return round(fuzz.ratio(s1, s2))
+
+
+def score_matches(
+    query: str,
+    choices: Iterable[str],
+    scorer: str = "ratio",
+    score_cutoff: int = 0,
+) -> dict[str, int]:
+    """
+    Scores the search term against all choices at once.
+
+    The scores are computed by `rapidfuzz.process.cdist` on all CPU cores
+    once there are at least `PARALLEL_SCORING_MIN_CHOICES` choices, or by
+    `rapidfuzz.process.extract` if numpy is not installed.
+
+    Args:
+        query (str): The search term.
+        choices (Iterable[str]): The strings to score.
+        scorer (str, optional): The name of the `rapidfuzz.fuzz` scorer,
+        e.g. "ratio" or "partial_ratio".
+        score_cutoff (int, optional): The lowest score to return.
+
+    Returns:
+        dict[str, int]: The scores of the choices scoring at least
+        `score_cutoff`, by choice.
+    """
+    from rapidfuzz import fuzz, process
+
+    choices = list(dict.fromkeys(choices))
+    if not choices:
+        return {}
+    scorer_function = getattr(fuzz, scorer)
+    # Scores are rounded, so a score just below the cutoff may still pass
+    cutoff = max(score_cutoff - 0.5, 0)
+    try:
+        import numpy
+    except ImportError:
+        scores = [
+            (index, score)
+            for _, score, index in process.extract(
+                query, choices, scorer=scorer_function, score_cutoff=cutoff,
+                limit=None,
+            )
+        ]
+    else:
+        workers = -1 if len(choices) >= PARALLEL_SCORING_MIN_CHOICES else 1
+        row = process.cdist(
+            [query], choices, scorer=scorer_function, score_cutoff=cutoff,
+            dtype=numpy.float64, workers=workers,
+        )[0]
+        scores = [
+            (index, row[index]) for index in numpy.flatnonzero(row >= cutoff)
+        ]
+    return {
+        choices[index]: round(score)
+        for index, score in scores
+        if round(score) >= score_cutoff
+    }
+
+
+def score_entries(
+    term: str, entries: Mapping[Hashable, Sequence[str]]
+) -> dict[Hashable, int]:
+    """
+    Scores entries made of a main text, e.g. a name, and some short texts,
+    e.g. phone numbers or tags.
+
+    A text containing the term scores 100 for every occurrence. Otherwise
+    the main text is compared with `partial_ratio` and the short texts with
+    `ratio`, and texts scoring below `FUZZY_MATCH_THRESHOLD` are skipped.
+    The scores of all texts of an entry add up.
+
+    Args:
+        term (str): The normalized search term.
+        entries (Mapping[Hashable, Sequence[str]]): The texts of the entries
+        by key, the main text first.
+
+    Returns:
+        dict[Hashable, int]: The scores of the matching entries by key, in
+        the order of `entries`.
+    """
+    partial_ratios = score_matches(
+        term,
+        (texts[0] for texts in entries.values() if term not in texts[0]),
+        "partial_ratio",
+        FUZZY_MATCH_THRESHOLD,
+    )
+    ratios = score_matches(
+        term,
+        (
+            text
+            for texts in entries.values()
+            for text in texts[1:]
+            if term not in text
+        ),
+        "ratio",
+        FUZZY_MATCH_THRESHOLD,
+    )
+
+    scores = {}
+    for key, texts in entries.items():
+        main_text = texts[0]
+        if term in main_text:
+            score = main_text.count(term) * 100
+        else:
+            score = partial_ratios.get(main_text, 0)
+        for text in texts[1:]:
+            if term in text:
+                score += text.count(term) * 100
+            else:
+                score += ratios.get(text, 0)
+        if score:
+            scores[key] = score
+    return scores
+
+
+def best_match(query: str, choices: Iterable[str]) -> tuple[str, int] | None:
+    """
+    Finds the choice most similar to the query, ignoring case and
+    punctuation.
+
+    Args:
+        query (str): The query.
+        choices (Iterable[str]): The strings to choose from.
+
+    Returns:
+        tuple[str, int] | None: The best choice with its score from 0 to 100,
+        or None if there are no choices.
+    """
+    from rapidfuzz import fuzz, process, utils
+
+    match = process.extractOne(
+        query, list(choices), scorer=fuzz.WRatio,
+        processor=utils.default_process,
+    )
+    if match is None:
+        return None
+    choice, score, _ = match
+    return choice, round(score)
+
+
+def top_keys(
+    scores: dict[Hashable, float],
+    limit: int | None = None,
+    offset: int = 0,
+) -> list[Hashable]:
+    """
+    Returns the keys with the highest scores, skipping the first `offset`.
+
+    Only `offset + limit` keys are kept in a heap instead of sorting all of
+    them. Keys with equal scores keep their order in `scores`.
+
+    Args:
+        scores (dict[Hashable, float]): The scores by key.
+        limit (int | None, optional): The maximum number of keys to return,
+        all of them if None.
+        offset (int, optional): The number of best keys to skip.
+
+    Returns:
+        list[Hashable]: The keys in order of decreasing score.
+    """
+    if limit is None:
+        ranked = sorted(scores, key=scores.__getitem__, reverse=True)
+    else:
+        ranked = heapq.nlargest(
+            offset + limit, scores, key=scores.__getitem__
+        )
+    return ranked[offset:]
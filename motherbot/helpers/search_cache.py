@@ -0,0 +1,80 @@
+"""
+Search cache module.
+
+The search cache keeps the results of the last searches of a book, so
+running the same search again, e.g. while paging through the results, does
+not score the entries again. Every book counts its changes in a version
+number, and the cache is emptied as soon as the version changes.
+
+Results are only reused for the exact same term. Fuzzy matches of a longer
+term are not a subset of the matches of a term it contains, so the results
+of a shorter term cannot be narrowed down.
+"""
+
+from collections import OrderedDict
+from ..constants.values import SEARCH_CACHE_SIZE
+
+
+class SearchCache:
+    """
+    Least recently used cache of the scores of search terms.
+    """
+
+    def __init__(self, size: int = SEARCH_CACHE_SIZE) -> None:
+        """
+        Initializes an empty cache.
+
+        Args:
+            size (int, optional): The maximum number of cached terms.
+        """
+        self.size = size
+        self._entries = OrderedDict()
+        self._version = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _check_version(self, version: int) -> None:
+        """
+        Empties the cache if the book changed since the results were cached.
+        """
+        if version != self._version:
+            self._entries.clear()
+            self._version = version
+
+    def get(self, term: str, version: int) -> dict | None:
+        """
+        Returns the cached results of a search term.
+
+        Args:
+            term (str): The normalized search term.
+            version (int): The current version of the book.
+
+        Returns:
+            dict | None: The scores of the matching entries by key, or None
+            if they are not cached.
+        """
+        self._check_version(version)
+        if term not in self._entries:
+            return None
+        self._entries.move_to_end(term)
+        return self._entries[term]
+
+    def put(self, term: str, version: int, scores: dict) -> None:
+        """
+        Caches the results of a search term, evicting the least recently used
+        term.
+
+        Args:
+            term (str): The normalized search term.
+            version (int): The version of the book the results are for.
+            scores (dict): The scores of the matching entries by key.
+
+        Returns:
+            None
+        """
+        self._check_version(version)
+        self._entries[term] = scores
+        self._entries.move_to_end(term)
+        if len(self._entries) > self.size:
+            self._entries.popitem(last=False)
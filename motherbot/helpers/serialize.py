@@ -2,44 +2,328 @@
 Serialize and deserialize address book data
 """
 
+import bz2
+import gc
+import glob
+import lzma
+import os
 import pickle
-from typing import Union
+import uuid
+import zlib
+from contextlib import contextmanager
+from typing import Callable, Iterable, Iterator, Union
 from ..notes.notes_book import NotesBook
+from ..notes.note_bodies import NoteBodies
+from ..notes.text import Text
 from ..contacts.address_book import AddressBook
+from ..settings.app_settings import app_settings
+from ..constants.values import (
+    IO_CHUNK_SIZE,
+    NOTE_BODIES_SUFFIX,
+    TEMP_SUFFIX,
+    SNAPSHOT_MAGIC,
+    SNAPSHOT_VERSION,
+)
 
+# Codec name: (id stored in the snapshot header, compressor, decompressor)
+CODECS = {
+    "none": (0, None, None),
+    "zlib": (1, zlib.compressobj, zlib.decompressobj),
+    "lzma": (2, lzma.LZMACompressor, lzma.LZMADecompressor),
+    "bz2": (3, bz2.BZ2Compressor, bz2.BZ2Decompressor),
+}
+CODEC_IDS = {
+    codec_id: decompressor for codec_id, _, decompressor in CODECS.values()
+}
+BOOK_TYPES = {
+    "address_book": AddressBook,
+    "notes_book": NotesBook,
+}
 
-def save_data(data: Union["AddressBook", "NotesBook"], filename: str) -> None:
+
+@contextmanager
+def gc_paused() -> Iterator[None]:
+    """
+    Pauses the garbage collector while a book is being built.
+
+    Building a book creates millions of objects that all stay alive, so the
+    collections triggered on the way only waste time scanning them.
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+def bodies_filename(filename: str) -> str:
+    """
+    Returns a new unique name of the note bodies file for a snapshot of a
+    notes book.
+
+    Sessions keep reading texts from the bodies file they loaded, so every
+    snapshot gets its own bodies file instead of overwriting one that may be
+    in use.
+
+    Args:
+        filename (str): The name of the snapshot file.
+
+    Returns:
+        str: The name of the bodies file.
+    """
+    return f"{filename}{NOTE_BODIES_SUFFIX}.{uuid.uuid4().hex}"
+
+
+def remove_note_bodies(filename: str, keep: Iterable[str] = ()) -> None:
+    """
+    Removes the bodies files of older snapshots of a book.
+
+    Files still open in a session stay readable there on POSIX systems and
+    cannot be removed on Windows, where they are removed on a later save.
+
+    Args:
+        filename (str): The name of the snapshot file.
+        keep (Iterable[str]): The names of the bodies files to keep.
+
+    Returns:
+        None
+    """
+    keep = {os.path.abspath(name) for name in keep}
+    for name in glob.glob(glob.escape(filename + NOTE_BODIES_SUFFIX) + ".*"):
+        if os.path.abspath(name) in keep or name.endswith(TEMP_SUFFIX):
+            continue
+        try:
+            os.remove(name)
+        except OSError:
+            continue
+
+
+def dump_data(
+    data: Union["AddressBook", "NotesBook"], filename: str
+) -> tuple[bytes, dict[str, bytes]]:
+    """
+    Serializes the provided book.
+
+    The book is stored as plain Python values (see `to_primitives` of the
+    books), which are faster to pickle and unpickle than the field objects
+    and are loaded back without validating every field again. The texts of
+    notes are stored in a separate bodies file and addressed by offset, so
+    they are only read when shown. The result is a consistent snapshot of
+    the book that can be written to disk later, even if the book is changed
+    in the meantime.
+
+    Args:
+        data: The book to be serialized.
+        filename (str): The name of the file where the book will be saved.
+
+    Returns:
+        tuple[bytes, dict[str, bytes]]: The serialized book and the files
+        that have to be written before it, by file name.
+    """
+    kind = next(
+        kind for kind, book_type in BOOK_TYPES.items()
+        if isinstance(data, book_type)
+    )
+    files = {}
+    bodies_name = None
+    if isinstance(data, NotesBook):
+        bodies = bytearray()
+
+        def store_text(text: Text) -> tuple[int, int]:
+            encoded = text.value.encode("utf-8")
+            offset = len(bodies)
+            bodies.extend(encoded)
+            return offset, len(encoded)
+
+        state, entries = data.to_primitives(store_text)
+        name = bodies_filename(filename)
+        files[name] = bytes(bodies)
+        bodies_name = os.path.basename(name)
+    else:
+        state, entries = data.to_primitives()
+    payload = pickle.dumps(
+        (kind, state, entries, bodies_name), protocol=pickle.HIGHEST_PROTOCOL
+    )
+    return payload, files
+
+
+def write_file(payload: bytes, filename: str) -> None:
+    """
+    Atomically writes raw data to a file.
+
+    Args:
+        payload (bytes): The data.
+        filename (str): The name of the file.
+
+    Returns:
+        None
+    """
+    temp_filename = filename + TEMP_SUFFIX
+    with open(temp_filename, "wb") as f:
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_filename, filename)
+
+
+def write_data(
+    payload: bytes,
+    filename: str,
+    report: Callable[[int, int], None] = None
+) -> None:
+    """
+    Atomically writes serialized data to a snapshot file.
+
+    The snapshot starts with a header that records the format version and
+    the codec selected in the settings, followed by the data compressed with
+    that codec. The data is compressed and written in chunks of
+    `IO_CHUNK_SIZE` bytes to a temporary file next to the target, flushed to
+    disk and then renamed over the target, so a crash in the middle of a
+    write never leaves a truncated file behind.
+
+    Args:
+        payload (bytes): The serialized data.
+        filename (str): The name of the file where the data will be saved.
+        report (Callable[[int, int], None], optional): A callback that takes
+        the number of bytes written so far and the total number of bytes.
+
+    Returns:
+        None
+    """
+    codec = app_settings.snapshot_codec
+    codec_id, compressor_factory, _ = CODECS[codec]
+    compressor = compressor_factory() if compressor_factory else None
+    view = memoryview(payload)
+    total = len(view)
+    temp_filename = filename + TEMP_SUFFIX
+    with open(temp_filename, "wb") as f:
+        f.write(SNAPSHOT_MAGIC + bytes([SNAPSHOT_VERSION, codec_id]))
+        for offset in range(0, total, IO_CHUNK_SIZE):
+            chunk = view[offset:offset + IO_CHUNK_SIZE]
+            f.write(compressor.compress(chunk) if compressor else chunk)
+            if report:
+                report(min(offset + IO_CHUNK_SIZE, total), total)
+        if compressor:
+            f.write(compressor.flush())
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_filename, filename)
+
+
+def save_data(
+    data: Union["AddressBook", "NotesBook"],
+    filename: str,
+    report: Callable[[int, int], None] = None
+) -> None:
     """
     Saves the provided data to a file.
 
     Args:
         data: The data to be saved, can be of any serializable type.
         filename (str): The name of the file where the data will be saved.
+        report (Callable[[int, int], None], optional): A callback that takes
+        the number of bytes written so far and the total number of bytes.
+
+    Returns:
+        None
+    """
+    payload, files = dump_data(data, filename)
+    write_snapshot(payload, files, filename, report)
+
+
+def write_snapshot(
+    payload: bytes,
+    files: dict[str, bytes],
+    filename: str,
+    report: Callable[[int, int], None] = None
+) -> None:
+    """
+    Writes a snapshot returned by `dump_data` together with the files it
+    refers to and removes the bodies files of older snapshots.
+
+    Args:
+        payload (bytes): The serialized book.
+        files (dict[str, bytes]): The files the snapshot refers to.
+        filename (str): The name of the file where the data will be saved.
+        report (Callable[[int, int], None], optional): A callback that takes
+        the number of bytes written so far and the total number of bytes.
 
     Returns:
         None
     """
-    with open(filename, "wb") as f:
-        pickle.dump(data, f)
+    for name, content in files.items():
+        write_file(content, name)
+    write_data(payload, filename, report)
+    remove_note_bodies(filename, keep=files)
 
 
 def load_data(
     filename: str,
-    default_data: Union["AddressBook", "NotesBook"] = None
+    default_data: Union["AddressBook", "NotesBook"] = None,
+    report: Callable[[int, int], None] = None
 ) -> Union["AddressBook", "NotesBook"]:
     """
     Loads data from a file.
 
+    The codec is detected from the snapshot header, files without a header
+    are read as plain pickles. The file is read and decompressed in chunks
+    of `IO_CHUNK_SIZE` bytes so the progress can be reported while reading.
+
     Args:
         filename (str): The name of the file from which the data will be
         loaded.
         default_data: The default data to return if the file is not found.
+        report (Callable[[int, int], None], optional): A callback that takes
+        the number of bytes read so far and the total number of bytes.
 
     Returns:
         The loaded data or default_data if the file is not found.
     """
     try:
         with open(filename, "rb") as f:
-            return pickle.load(f)
+            total = os.fstat(f.fileno()).st_size
+            header = f.read(len(SNAPSHOT_MAGIC) + 2)
+            if header[:len(SNAPSHOT_MAGIC)] == SNAPSHOT_MAGIC:
+                version, codec_id = header[len(SNAPSHOT_MAGIC):]
+                if version > SNAPSHOT_VERSION or codec_id not in CODEC_IDS:
+                    raise ValueError(
+                        f"Unsupported snapshot format in {filename}."
+                    )
+                decompressor_factory = CODEC_IDS[codec_id]
+            else:
+                f.seek(0)
+                version = 0
+                decompressor_factory = None
+            decompressor = (
+                decompressor_factory() if decompressor_factory else None
+            )
+            chunks = []
+            completed = f.tell()
+            while chunk := f.read(IO_CHUNK_SIZE):
+                chunks.append(
+                    decompressor.decompress(chunk) if decompressor else chunk
+                )
+                completed += len(chunk)
+                if report:
+                    report(completed, total)
+            payload = b"".join(chunks)
     except FileNotFoundError:
         return default_data
+
+    with gc_paused():
+        data = pickle.loads(payload)
+        # Versions 0 (no header) and 1 store pickled book objects
+        if version < 2:
+            return data
+        if version < 3:
+            kind, state, entries = data
+            return BOOK_TYPES[kind].from_primitives(state, entries)
+        kind, state, entries, bodies_name = data
+        if bodies_name is None:
+            return BOOK_TYPES[kind].from_primitives(state, entries)
+        bodies = NoteBodies(
+            os.path.join(os.path.dirname(filename), bodies_name)
+        )
+        return BOOK_TYPES[kind].from_primitives(state, entries, bodies)
@@ -0,0 +1,320 @@
+"""
+SQLite storage module.
+
+The SQLite storage keeps book entries in a local database file, one row per
+entry, so a single entry can be read or written without loading the whole
+book into memory.
+"""
+
+import pathlib
+import pickle
+import sqlite3
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Any, Callable, Iterator
+from ..constants.values import SQLITE_CACHE_SIZE
+
+
+def connect_database(
+    filename: str, read_only: bool = False
+) -> sqlite3.Connection:
+    """
+    Opens the database and creates the table for the book settings.
+
+    Args:
+        filename (str): The name of the database file.
+        read_only (bool, optional): Whether the database is opened for
+        reading only. It must exist then, and no tables are created.
+
+    Raises:
+        sqlite3.OperationalError: If the database cannot be opened.
+
+    Returns:
+        sqlite3.Connection: The database connection.
+    """
+    # The books may be opened on a loader thread and used on the main one,
+    # but never on both at once
+    if read_only:
+        connection = sqlite3.connect(
+            f"{pathlib.Path(filename).absolute().as_uri()}?mode=ro",
+            uri=True,
+            check_same_thread=False,
+        )
+        connection.execute("PRAGMA query_only = ON")
+        return connection
+    connection = sqlite3.connect(filename, check_same_thread=False)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute(
+        "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value BLOB)"
+    )
+    return connection
+
+
+def load_meta(connection: sqlite3.Connection, key: str, default: Any) -> Any:
+    """
+    Loads a book setting from the database.
+
+    Args:
+        connection (sqlite3.Connection): The database connection.
+        key (str): The name of the setting.
+        default: The value to return if the setting is not stored.
+
+    Returns:
+        The stored value or `default`.
+    """
+    row = connection.execute(
+        "SELECT value FROM meta WHERE key = ?", (key,)
+    ).fetchone()
+    return pickle.loads(row[0]) if row else default
+
+
+def save_meta(connection: sqlite3.Connection, key: str, value: Any) -> None:
+    """
+    Stores a book setting in the database.
+
+    Args:
+        connection (sqlite3.Connection): The database connection.
+        key (str): The name of the setting.
+        value: The value of the setting.
+
+    Returns:
+        None
+    """
+    connection.execute(
+        "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+        (key, pickle.dumps(value)),
+    )
+
+
+class SQLiteMapping(MutableMapping):
+    """
+    Dictionary-like view of a database table with one pickled entry per row.
+
+    Besides the pickled entry every row stores indexed columns computed from
+    the entry, and every multi-valued column (e.g. phones of a contact) is
+    kept in its own indexed table named `<table>_<column>`.
+
+    Recently used entries are kept in a bounded cache so that repeated
+    lookups return the same object. On a read-only connection the tables
+    are expected to exist and are not created.
+    """
+
+    def __init__(
+        self,
+        connection: sqlite3.Connection,
+        table: str,
+        columns: dict[str, Callable[[Any], Any]],
+        multi_columns: dict[str, Callable[[Any], list]],
+        bind: Callable[[Any], None] = None,
+    ) -> None:
+        """
+        Initializes the mapping and creates the tables and indexes.
+
+        Args:
+            connection (sqlite3.Connection): The database connection.
+            table (str): The name of the table.
+            columns (dict): Indexed columns mapped to functions computing the
+            column value from an entry.
+            multi_columns (dict): Multi-valued indexed columns mapped to
+            functions computing the list of values from an entry.
+            bind (Callable, optional): A function called with every entry
+            loaded from or stored to the table.
+        """
+        self.connection = connection
+        self.table = table
+        self.columns = columns
+        self.multi_columns = multi_columns
+        self.bind = bind
+        self._cache = OrderedDict()
+
+        if connection.execute("PRAGMA query_only").fetchone()[0]:
+            return
+        column_defs = "".join(f", {column}" for column in columns)
+        connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} "
+            f"(key TEXT PRIMARY KEY, value BLOB{column_defs})"
+        )
+        for column in columns:
+            connection.execute(
+                f"CREATE INDEX IF NOT EXISTS {table}_{column}_idx "
+                f"ON {table} ({column})"
+            )
+        for column in multi_columns:
+            connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {table}_{column} "
+                f"(key TEXT, {column})"
+            )
+            connection.execute(
+                f"CREATE INDEX IF NOT EXISTS {table}_{column}_idx "
+                f"ON {table}_{column} ({column})"
+            )
+            connection.execute(
+                f"CREATE INDEX IF NOT EXISTS {table}_{column}_key_idx "
+                f"ON {table}_{column} (key)"
+            )
+
+    def _remember(self, key: str, value: Any) -> Any:
+        """
+        Puts an entry into the cache, evicting the least recently used one.
+        """
+        if self.bind:
+            self.bind(value)
+        self._cache[key] = value
+        self._cache.move_to_end(key)
+        if len(self._cache) > SQLITE_CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return value
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+        row = self.connection.execute(
+            f"SELECT value FROM {self.table} WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(key)
+        return self._remember(key, pickle.loads(row[0]))
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        names = ", ".join(["key", "value", *self.columns])
+        placeholders = ", ".join("?" * (len(self.columns) + 2))
+        updates = ", ".join(
+            f"{name} = excluded.{name}" for name in ["value", *self.columns]
+        )
+        self.connection.execute(
+            f"INSERT INTO {self.table} ({names}) VALUES ({placeholders}) "
+            f"ON CONFLICT (key) DO UPDATE SET {updates}",
+            (
+                key,
+                pickle.dumps(value),
+                *(compute(value) for compute in self.columns.values()),
+            ),
+        )
+        for column, compute in self.multi_columns.items():
+            self.connection.execute(
+                f"DELETE FROM {self.table}_{column} WHERE key = ?", (key,)
+            )
+            self.connection.executemany(
+                f"INSERT INTO {self.table}_{column} (key, {column}) "
+                f"VALUES (?, ?)",
+                [(key, item) for item in compute(value)],
+            )
+        self._remember(key, value)
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self:
+            raise KeyError(key)
+        self.connection.execute(
+            f"DELETE FROM {self.table} WHERE key = ?", (key,)
+        )
+        for column in self.multi_columns:
+            self.connection.execute(
+                f"DELETE FROM {self.table}_{column} WHERE key = ?", (key,)
+            )
+        self._cache.pop(key, None)
+
+    def __contains__(self, key: object) -> bool:
+        if key in self._cache:
+            return True
+        return self.connection.execute(
+            f"SELECT 1 FROM {self.table} WHERE key = ?", (key,)
+        ).fetchone() is not None
+
+    def __iter__(self) -> Iterator[str]:
+        for (key,) in self.connection.execute(
+            f"SELECT key FROM {self.table} ORDER BY rowid"
+        ):
+            yield key
+
+    def __len__(self) -> int:
+        return self.connection.execute(
+            f"SELECT COUNT(*) FROM {self.table}"
+        ).fetchone()[0]
+
+    def values(self) -> Iterator[Any]:
+        """
+        Streams all entries in insertion order without caching them.
+        """
+        for _, value in self.items():
+            yield value
+
+    def items(self) -> Iterator[tuple[str, Any]]:
+        """
+        Streams all `(key, entry)` pairs in insertion order without caching
+        them.
+        """
+        for key, blob in self.connection.execute(
+            f"SELECT key, value FROM {self.table} ORDER BY rowid"
+        ):
+            value = self._cache.get(key)
+            if value is None:
+                value = pickle.loads(blob)
+                if self.bind:
+                    self.bind(value)
+            yield key, value
+
+    def keys_where(self, column: str, value: Any) -> list[str]:
+        """
+        Returns the keys of the entries with the given value of an indexed
+        column.
+
+        Args:
+            column (str): The name of an indexed or multi-valued column.
+            value: The value to look up.
+
+        Returns:
+            list[str]: The matching keys.
+        """
+        table = (
+            f"{self.table}_{column}" if column in self.multi_columns
+            else self.table
+        )
+        return [
+            key for (key,) in self.connection.execute(
+                f"SELECT DISTINCT key FROM {table} WHERE {column} = ?",
+                (value,),
+            )
+        ]
+
+    def keys_between(self, column: str, start: Any, end: Any) -> list[str]:
+        """
+        Returns the keys of the entries whose indexed column lies within the
+        inclusive range from `start` to `end`, ordered by that column.
+
+        Args:
+            column (str): The name of an indexed column.
+            start: The lower bound of the range.
+            end: The upper bound of the range.
+
+        Returns:
+            list[str]: The matching keys.
+        """
+        return [
+            key for (key,) in self.connection.execute(
+                f"SELECT key FROM {self.table} "
+                f"WHERE {column} BETWEEN ? AND ? ORDER BY {column}",
+                (start, end),
+            )
+        ]
+
+    def column_values(self, column: str) -> list[tuple[Any, str]]:
+        """
+        Returns all `(value, key)` pairs of a multi-valued column without
+        loading the entries.
+
+        Args:
+            column (str): The name of a multi-valued column.
+
+        Returns:
+            list[tuple]: The values with the keys of their entries.
+        """
+        return self.connection.execute(
+            f"SELECT {column}, key FROM {self.table}_{column} ORDER BY rowid"
+        ).fetchall()
+
+    def commit(self) -> None:
+        """
+        Commits the pending changes to the database file.
+        """
+        self.connection.commit()
@@ -2,15 +2,15 @@
 Suggests the closest matching command in case incorrect input.
 """
 
-from fuzzywuzzy import process
+from .scoring import best_match
 
 
 def suggest_command(user_command: str, commands: list[str]) -> str | None:
     """
     Suggests the closest matching command in case incorrect input.
     """
-    similar_command, match = process.extractOne(user_command, commands)
+    match = best_match(user_command, commands)
 
-    if match >= 50:
-        return similar_command
+    if match is not None and match[1] >= 50:
+        return match[0]
     return None
@@ -0,0 +1,148 @@
+"""
+Text index module.
+
+The text index is an inverted index of the words of longer texts, such as
+note bodies. A search looks up the words of the query and ranks the entries
+containing them with BM25, which favours words that are rare in the index
+and frequent in a short text.
+"""
+
+import math
+import re
+import unicodedata
+from collections import Counter
+from typing import Hashable
+from ..constants.values import BM25_K1, BM25_B
+
+WORD_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Splits a text into lower-cased words.
+
+    Args:
+        text (str): The text.
+
+    Returns:
+        list[str]: The words in the order they appear in the text.
+    """
+    return WORD_PATTERN.findall(unicodedata.normalize("NFC", text).lower())
+
+
+class TextIndex:
+    """
+    Inverted index of the words of the text of every entry, ranked with
+    BM25.
+    """
+
+    def __init__(self, k1: float = BM25_K1, b: float = BM25_B) -> None:
+        """
+        Initializes an empty index.
+
+        Args:
+            k1 (float, optional): How fast the score of a word saturates as
+            it is repeated in a text.
+            b (float, optional): How much the score depends on the length of
+            the text, from 0 to 1.
+        """
+        self.k1 = k1
+        self.b = b
+        # Word -> number of its occurrences by key
+        self._postings = {}
+        # Key -> number of occurrences of every word of its text
+        self._counts = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._counts
+
+    def update(self, key: Hashable, text: str | None) -> None:
+        """
+        Indexes the text of an entry, replacing the text indexed before.
+
+        Args:
+            key (Hashable): The key of the entry.
+            text (str | None): The text of the entry, None if it has no
+            text.
+
+        Returns:
+            None
+        """
+        counts = Counter(tokenize(text)) if text else Counter()
+        if counts == self._counts.get(key, Counter()):
+            return
+        self.remove(key)
+        if not counts:
+            return
+        for word, count in counts.items():
+            self._postings.setdefault(word, {})[key] = count
+        self._counts[key] = counts
+        self._total_length += counts.total()
+
+    def remove(self, key: Hashable) -> None:
+        """
+        Removes an entry from the index if it is indexed.
+
+        Args:
+            key (Hashable): The key of the entry.
+
+        Returns:
+            None
+        """
+        counts = self._counts.pop(key, None)
+        if counts is None:
+            return
+        for word in counts:
+            postings = self._postings[word]
+            del postings[key]
+            if not postings:
+                del self._postings[word]
+        self._total_length -= counts.total()
+
+    def keys(self, word: str) -> set[Hashable]:
+        """
+        Returns the entries whose text contains the word.
+
+        Args:
+            word (str): The lower-cased word.
+
+        Returns:
+            set[Hashable]: The keys of the entries.
+        """
+        return set(self._postings.get(word, ()))
+
+    def search(self, query: str) -> dict[Hashable, float]:
+        """
+        Scores the entries containing any word of the query with BM25.
+
+        Args:
+            query (str): The words to search for.
+
+        Returns:
+            dict[Hashable, float]: The scores of the matching entries by key.
+        """
+        if not self._counts:
+            return {}
+        count = len(self._counts)
+        average_length = self._total_length / count
+        scores = {}
+        for word in set(tokenize(query)):
+            postings = self._postings.get(word)
+            if not postings:
+                continue
+            idf = math.log(
+                1 + (count - len(postings) + 0.5) / (len(postings) + 0.5)
+            )
+            for key, frequency in postings.items():
+                length = self._counts[key].total()
+                scores[key] = scores.get(key, 0) + idf * (
+                    frequency * (self.k1 + 1)
+                    / (frequency + self.k1 * (
+                        1 - self.b + self.b * length / average_length
+                    ))
+                )
+        return scores
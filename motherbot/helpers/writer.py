@@ -0,0 +1,247 @@
+"""
+Background writer module.
+
+The background writer takes serialized snapshots and journal batches from
+the main thread and writes them to disk on a separate thread, so the prompt
+never waits for the disk.
+"""
+
+import atexit
+import threading
+from collections import OrderedDict
+from typing import Callable
+from .serialize import write_snapshot
+from .journal import append_journal, remove_journal
+from .locking import book_lock, disk_stamp
+
+
+class BackgroundWriter:
+    """
+    Writes book files on a background thread.
+
+    Pending writes are grouped by book file. A new snapshot of a book makes
+    all its pending writes obsolete, so only the latest snapshot hits the
+    disk, while journal batches are appended in the order they were queued.
+    """
+
+    def __init__(self) -> None:
+        self._pending = OrderedDict()
+        self._condition = threading.Condition()
+        self._thread = None
+        self._busy = False
+        self._closed = False
+        self._report = None
+        self._error = None
+        self._stamps = {}
+
+    def track(self, filename: str, stamp: tuple) -> None:
+        """
+        Remembers the version of a book on disk this session is in sync
+        with, see `disk_stamp`.
+
+        Args:
+            filename (str): The name of the book file.
+            stamp (tuple): The version of the book files.
+
+        Returns:
+            None
+        """
+        with self._condition:
+            self._stamps[filename] = stamp
+
+    def stamp(self, filename: str) -> tuple | None:
+        """
+        Returns the version of a book on disk this session is in sync with.
+
+        Args:
+            filename (str): The name of the book file.
+
+        Returns:
+            tuple | None: The version of the book files or None if the book
+            is not tracked.
+        """
+        with self._condition:
+            return self._stamps.get(filename)
+
+    def save_snapshot(
+        self,
+        filename: str,
+        payload: bytes,
+        files: dict[str, bytes] = None,
+        fallback: bytes = None,
+    ) -> None:
+        """
+        Queues a snapshot of a book, dropping the pending writes it replaces.
+        The journal of the book is removed once the snapshot is written.
+
+        If another session saved the book in the meantime, the snapshot
+        would overwrite its changes, so `fallback` is appended to the journal
+        instead.
+
+        Args:
+            filename (str): The name of the book file.
+            payload (bytes): The serialized book.
+            files (dict[str, bytes], optional): The files the snapshot
+            refers to, by file name, written before the snapshot.
+            fallback (bytes, optional): The journal batch with the changes
+            saved by the snapshot.
+
+        Returns:
+            None
+        """
+        with self._condition:
+            # The fallback also has to carry the batches the snapshot replaces
+            batches = [
+                task_payload if kind == "journal" else task_payload[2]
+                for kind, task_payload in self._pending.pop(filename, [])
+            ]
+            fallback = b"".join(
+                batch for batch in [*batches, fallback] if batch
+            ) or None
+            self._pending[filename] = [
+                ("snapshot", (payload, files or {}, fallback))
+            ]
+            self._start()
+
+    def append_journal(self, filename: str, payload: bytes) -> None:
+        """
+        Queues a batch to be appended to the journal of a book.
+
+        Args:
+            filename (str): The name of the book file.
+            payload (bytes): The serialized journal batch.
+
+        Returns:
+            None
+        """
+        with self._condition:
+            self._pending.setdefault(filename, []).append(
+                ("journal", payload)
+            )
+            self._start()
+
+    def flush(self, report: Callable[[int, int], None] = None) -> None:
+        """
+        Waits until all queued writes are on disk.
+
+        Args:
+            report (Callable[[int, int], None], optional): A callback that
+            reports the progress of the snapshots written while waiting.
+
+        Raises:
+            OSError: If a queued write failed.
+
+        Returns:
+            None
+        """
+        with self._condition:
+            self._report = report
+            while self._pending or self._busy:
+                self._condition.wait()
+            self._report = None
+            error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def wait(self) -> None:
+        """
+        Waits until all queued writes are done, leaving errors to be raised
+        by `flush`.
+
+        Returns:
+            None
+        """
+        with self._condition:
+            while self._pending or self._busy:
+                self._condition.wait()
+
+    def close(self, report: Callable[[int, int], None] = None) -> None:
+        """
+        Writes all queued data and stops the writer thread.
+
+        Args:
+            report (Callable[[int, int], None], optional): A callback that
+            reports the progress of the snapshots written while closing.
+
+        Returns:
+            None
+        """
+        self.flush(report)
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join()
+
+    def _start(self) -> None:
+        """
+        Wakes up the writer thread, starting it on first use.
+        """
+        self._closed = False
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="motherbot-writer", daemon=True
+            )
+            self._thread.start()
+        self._condition.notify_all()
+
+    def _run(self) -> None:
+        """
+        Writes the queued data until the writer is closed.
+        """
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if not self._pending:
+                    return
+                filename, tasks = self._pending.popitem(last=False)
+                self._busy = True
+                report = self._report
+            try:
+                with book_lock(filename):
+                    for kind, payload in tasks:
+                        self._write(filename, kind, payload, report)
+            except OSError as error:
+                self._error = error
+            finally:
+                with self._condition:
+                    self._busy = False
+                    self._condition.notify_all()
+
+    def _write(
+        self,
+        filename: str,
+        kind: str,
+        payload: bytes | tuple,
+        report: Callable[[int, int], None] = None,
+    ) -> None:
+        """
+        Writes a queued task. Must be called with the lock of the book held.
+
+        A snapshot is only written if the book on disk is still the version
+        this session is in sync with. Otherwise its fallback journal batch
+        is appended and the version is left as is, so the next save merges
+        the changes of the other sessions first. The batches carry the id of
+        this session, so that merge does not take them for changes made in
+        another session, see `merge_disk_changes`.
+        """
+        current = disk_stamp(filename)
+        with self._condition:
+            in_sync = self._stamps.get(filename, current) == current
+        if kind == "journal":
+            append_journal(payload, filename)
+        elif in_sync:
+            payload, files, _ = payload
+            write_snapshot(payload, files, filename, report)
+            remove_journal(filename)
+        elif payload[2] is not None:
+            append_journal(payload[2], filename)
+        if in_sync:
+            with self._condition:
+                self._stamps[filename] = disk_stamp(filename)
+
+
+writer = BackgroundWriter()
+atexit.register(writer.close)
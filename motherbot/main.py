@@ -1,12 +1,23 @@
 """
 Main module.
 """
+import argparse
+from concurrent.futures import ThreadPoolExecutor
 from .helpers.suggest import suggest_command
 from .helpers.completer import Prompt
 from .helpers.colors import green, danger, red
 from .helpers.welcome import print_title
 from .settings.app_settings import app_settings
-from .controllers.general import save_books, load_books, get_help, settings
+from .contacts.address_book import AddressBook
+from .notes.notes_book import NotesBook
+from .controllers.general import (
+    save_books,
+    flush_books,
+    load_books,
+    load_view_books,
+    get_help,
+    settings,
+)
 from .controllers.notes_controllers import (
     add_note,
     change_note,
@@ -14,7 +25,10 @@ from .controllers.notes_controllers import (
     get_notes,
     reminders,
     fake_notes,
-    search_notes
+    import_notes,
+    export_notes,
+    search_notes,
+    search_text,
 )
 from .controllers.contacts_controllers import (
     add_contact,
@@ -23,64 +37,198 @@ from .controllers.contacts_controllers import (
     birthdays,
     delete_contact,
     fake_contacts,
+    import_contacts,
+    export_contacts,
     search_contacts,
+    find_phone,
 )
 
+# Commands available when the books are opened with `--read-only`
+READ_ONLY_CONTROLLERS = {
+    get_contacts,
+    birthdays,
+    search_contacts,
+    find_phone,
+    export_contacts,
+    get_notes,
+    reminders,
+    search_notes,
+    search_text,
+    export_notes,
+}
 
-def main():
+
+def parse_args() -> argparse.Namespace:
     """
-    The main function that serves as the entry point for the application.
+    Parses the command line arguments of the application.
+
+    Returns:
+        argparse.Namespace: The parsed arguments.
+    """
+    parser = argparse.ArgumentParser(prog="motherbot")
+    parser.add_argument(
+        "--storage",
+        choices=app_settings.list_storage_modes(),
+        default=app_settings.storage_mode,
+        help="how the address book and notes book are stored on disk",
+    )
+    parser.add_argument(
+        "--codec",
+        choices=app_settings.list_snapshot_codecs(),
+        default=app_settings.snapshot_codec,
+        help="compression codec for saved snapshots",
+    )
+    parser.add_argument(
+        "--parallel-search",
+        type=int,
+        default=app_settings.parallel_search_size,
+        metavar="SIZE",
+        help="search books with at least SIZE entries in worker processes, "
+        "0 turns it off",
+    )
+    parser.add_argument(
+        "--read-only",
+        action="store_true",
+        help="open the books for viewing only, without saving changes",
+    )
+    args = parser.parse_args()
+    if args.parallel_search < 0:
+        parser.error(
+            app_settings.get_validation_errors()[
+                "invalid_parallel_search_size"
+            ]
+        )
+    return args
+
+
+def get_commands(read_only: bool) -> tuple[dict, dict, list, list]:
+    """
+    Returns the commands in the current language.
+
+    Args:
+        read_only (bool): Whether only the commands that do not change the
+        books are available.
+
+    Returns:
+        tuple[dict, dict, list, list]: The controllers of the address book
+        and of the notes book by command name, the exit commands and all
+        command names.
     """
-    book, notes_book = load_books()
+    command_names = app_settings.get_command_names()
+
+    contacts_controllers = {
+        command_names["settings"]: settings,
+        command_names["add_contact"]: add_contact,
+        command_names["change_contact"]: change_contact,
+        command_names["delete_contact"]: delete_contact,
+        command_names["all_contacts"]: get_contacts,
+        command_names["birthdays"]: birthdays,
+        command_names["search_contacts"]: search_contacts,
+        command_names["find_phone"]: find_phone,
+        command_names["fake_contacts"]: fake_contacts,
+        command_names["import_contacts"]: import_contacts,
+        command_names["export_contacts"]: export_contacts,
+    }
+
+    notes_controllers = {
+        command_names["add_note"]: add_note,
+        command_names["change_note"]: change_note,
+        command_names["delete_note"]: delete_note,
+        command_names["all_notes"]: get_notes,
+        command_names["reminders"]: reminders,
+        command_names["search_notes"]: search_notes,
+        command_names["search_text"]: search_text,
+        command_names["fake_notes"]: fake_notes,
+        command_names["import_notes"]: import_notes,
+        command_names["export_notes"]: export_notes,
+    }
+    if read_only:
+        contacts_controllers = {
+            name: controller
+            for name, controller in contacts_controllers.items()
+            if controller in READ_ONLY_CONTROLLERS
+        }
+        notes_controllers = {
+            name: controller
+            for name, controller in notes_controllers.items()
+            if controller in READ_ONLY_CONTROLLERS
+        }
+    exit_commands = [command_names["close"], command_names["exit"]]
+
+    all_commands = (
+        [command_names["help"]] + list(contacts_controllers)
+        + list(notes_controllers) + exit_commands
+    )
+    return contacts_controllers, notes_controllers, exit_commands, all_commands
+
+
+def open_books(read_only: bool) -> tuple[AddressBook, NotesBook]:
+    """
+    Loads the books, applies their settings and prints the upcoming
+    birthdays and reminders. Runs on a loader thread while the prompt is
+    already shown.
+
+    Args:
+        read_only (bool): Whether the books are opened for viewing only.
+
+    Returns:
+        tuple[AddressBook, NotesBook]: A tuple of the `adsress_book` and
+        `notes_book` objects.
+    """
+    book, notes_book = load_view_books() if read_only else load_books()
     app_settings.language = book.language
     app_settings.date_format = book.date_str_format
-    print_title("Welcome to the motherbot!", red)
     print(green(book.upcoming_birthdays(days=7, short=True)))
     print(green(notes_book.upcoming_reminders(days=7, short=True)))
-    prompt = Prompt()
+    return book, notes_book
 
-    while True:
-        command_names = app_settings.get_command_names()
-        questions = app_settings.get_questions()
 
-        contacts_controllers = {
-            command_names["settings"]: settings,
-            command_names["add_contact"]: add_contact,
-            command_names["change_contact"]: change_contact,
-            command_names["delete_contact"]: delete_contact,
-            command_names["all_contacts"]: get_contacts,
-            command_names["birthdays"]: birthdays,
-            command_names["search_contacts"]: search_contacts,
-            command_names["fake_contacts"]: fake_contacts,
-        }
+def main():
+    """
+    The main function that serves as the entry point for the application.
 
-        notes_controllers = {
-            command_names["add_note"]: add_note,
-            command_names["change_note"]: change_note,
-            command_names["delete_note"]: delete_note,
-            command_names["all_notes"]: get_notes,
-            command_names["reminders"]: reminders,
-            command_names["search_notes"]: search_notes,
-            command_names["fake_notes"]: fake_notes,
-        }
-        exit_commands = [command_names["close"], command_names["exit"]]
+    The prompt is shown right away while the books are loaded in the
+    background, a command waits for them only once it is entered.
+    """
+    args = parse_args()
+    app_settings.storage_mode = args.storage
+    app_settings.snapshot_codec = args.codec
+    app_settings.parallel_search_size = args.parallel_search
+    print_title("Welcome to the motherbot!", red)
+    loader = ThreadPoolExecutor(
+        max_workers=1, thread_name_prefix="motherbot-loader"
+    )
+    books = loader.submit(open_books, args.read_only)
+    loader.shutdown(wait=False)
+    prompt = Prompt()
 
-        all_commands = (
-            [command_names["help"]] + list(contacts_controllers)
-            + list(notes_controllers) + exit_commands
-        )
+    while True:
+        questions = app_settings.get_questions()
+        *_, all_commands = get_commands(args.read_only)
         try:
             styled_message = {questions["command"]: "#FFFFFF"}
             command = prompt.styled_prompt(
                 styled_message, all_commands).strip().lower()
         except KeyboardInterrupt:
-            save_books(book, notes_book)
+            if not args.read_only:
+                save_books(*books.result())
+                flush_books()
             print(green(app_settings.get_info_messages()["goodbye"]))
             break
 
         if not command:
             continue
 
+        # The commands are in the language of the books, so they are listed
+        # again once the books are loaded
+        book, notes_book = books.result()
+        questions = app_settings.get_questions()
+        command_names = app_settings.get_command_names()
+        (
+            contacts_controllers, notes_controllers, exit_commands,
+            all_commands
+        ) = get_commands(args.read_only)
+
         if command not in all_commands:
             similar_command = suggest_command(command, all_commands)
             if similar_command:
@@ -96,7 +244,9 @@ def main():
                 continue
 
         if command in exit_commands:
-            save_books(book, notes_book)
+            if not args.read_only:
+                save_books(book, notes_book)
+                flush_books()
             print(green(app_settings.get_info_messages()["goodbye"]))
             break
 
@@ -4,9 +4,10 @@ CreatedOn module.
 
 from datetime import datetime
 from ..settings.app_settings import app_settings
+from ..helpers.restorable import Restorable
 
 
-class CreatedOn:
+class CreatedOn(Restorable):
     """
     Class representing the creation date of an object.
 
@@ -15,6 +16,8 @@ class CreatedOn:
         instance was created.
     """
 
+    value_attribute = "created_on"
+
     def __init__(self) -> None:
         """
         Initializes a new CreatedOn instance with the current date and time.
@@ -2,9 +2,11 @@
 Note module.
 """
 
-from typing import List
+from datetime import date, datetime
+from typing import Callable, List
 from .title import Title
-from .text import Text
+from .text import LazyText, Text
+from .note_bodies import NoteBodies
 from .tag import Tag
 from .remainder import Reminder
 from .created_on import CreatedOn
@@ -38,6 +40,131 @@ class Note:
         self.tags: List[Tag] = []
         self.created_on: CreatedOn = CreatedOn()
         self.reminder: Reminder | None = None
+        self._book = None
+        self._dirty = True
+
+    def __getstate__(self) -> dict:
+        """
+        Returns the state to be pickled, without the book and changes
+        tracking.
+        """
+        state = self.__dict__.copy()
+        state.pop("_book", None)
+        state.pop("_dirty", None)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """
+        Restores the pickled state of a note saved to disk.
+        """
+        self.__dict__.update(state)
+        self._book = None
+        self._dirty = False
+
+    def to_primitives(
+        self, store_text: Callable[[Text], tuple[int, int]] = None
+    ) -> tuple:
+        """
+        Returns the note as a tuple of plain values for compact snapshots.
+
+        Args:
+            store_text (Callable[[Text], tuple[int, int]], optional): A
+            callback that stores the text outside of the note and returns
+            its offset and length. The text is kept inline if not given.
+
+        Returns:
+            tuple: The title, the text (or its offset and length), the list
+            of tags, the creation date in ISO format and the reminder as a
+            date ordinal, with None for missing fields.
+        """
+        if self.text is None:
+            text = None
+        elif store_text is not None:
+            text = store_text(self.text)
+        else:
+            text = self.text.value
+        return (
+            self.title.value,
+            text,
+            [tag.value for tag in self.tags],
+            self.created_on.created_on.isoformat(),
+            self.reminder.value.toordinal() if self.reminder else None,
+        )
+
+    @classmethod
+    def from_primitives(
+        cls, primitives: tuple, bodies: NoteBodies = None
+    ) -> "Note":
+        """
+        Creates a note from the values returned by `to_primitives` without
+        validating the fields again.
+
+        Args:
+            primitives (tuple): The values of the note fields.
+            bodies (NoteBodies, optional): The file the texts stored outside
+            of the notes are read from.
+
+        Returns:
+            Note: The restored note.
+        """
+        title, text, tags, created_on, reminder = primitives
+        note = cls.__new__(cls)
+        note.title = Title.restore(title)
+        if text is None:
+            note.text = None
+        elif isinstance(text, str):
+            note.text = Text.restore(text)
+        else:
+            note.text = LazyText(bodies, *text)
+        note.tags = [Tag.restore(tag) for tag in tags]
+        note.created_on = CreatedOn.restore(
+            datetime.fromisoformat(created_on)
+        )
+        note.reminder = (
+            Reminder.restore(date.fromordinal(reminder))
+            if reminder is not None else None
+        )
+        note._book = None
+        note._dirty = False
+        return note
+
+    @property
+    def is_dirty(self) -> bool:
+        """
+        Returns True if the note was changed since it was last saved.
+        """
+        return self._dirty
+
+    def bind(self, book) -> None:
+        """
+        Binds the note to the notes book that tracks its changes.
+
+        Args:
+            book (NotesBook | None): The notes book holding the note.
+        """
+        self._book = book
+
+    def before_change(self) -> None:
+        """
+        Lets the notes book remember the saved version of the note before
+        the note is first changed since it was last saved.
+        """
+        if not self._dirty and self._book is not None:
+            self._book.remember_base(self)
+
+    def mark_dirty(self) -> None:
+        """
+        Marks the note as changed and reports it to its notes book.
+        """
+        self._dirty = True
+        if self._book is not None:
+            self._book.mark_changed(self)
+
+    def mark_clean(self) -> None:
+        """
+        Marks the note as saved.
+        """
+        self._dirty = False
 
     def add_text(self, text: str) -> None:
         """
@@ -49,7 +176,9 @@ class Note:
         Returns:
             None
         """
+        self.before_change()
         self.text = Text(text)
+        self.mark_dirty()
 
     def add_tags(self, tags: str) -> None:
         """
@@ -64,9 +193,13 @@ class Note:
 
         tag_list = tags.split()
 
-        for tag in tag_list:
-            if tag.lower() not in self.tags:
-                self.tags.append(Tag(tag))
+        self.before_change()
+        try:
+            for tag in tag_list:
+                if tag.lower() not in self.tags:
+                    self.tags.append(Tag(tag))
+        finally:
+            self.mark_dirty()
 
     def remove_tag(self, tag: str):
         """
@@ -84,7 +217,9 @@ class Note:
         """
         tag_to_remove = Tag(tag)
         if tag_to_remove in self.tags:
+            self.before_change()
             self.tags.remove(tag)
+            self.mark_dirty()
         else:
             raise ValueError(
                 app_settings.get_validation_errors()["tag_not_found"]
@@ -101,7 +236,9 @@ class Note:
         Returns:
             None
         """
+        self.before_change()
         self.reminder = Reminder(remind_date)
+        self.mark_dirty()
 
     def remove_text(self):
         """
@@ -110,7 +247,9 @@ class Note:
         Returns:
             None
         """
+        self.before_change()
         self.text = None
+        self.mark_dirty()
 
     def remove_reminder(self):
         """
@@ -119,4 +258,6 @@ class Note:
         Returns:
             None
         """
+        self.before_change()
         self.reminder = None
+        self.mark_dirty()
@@ -0,0 +1,68 @@
+"""
+Note bodies module.
+"""
+
+import threading
+from collections import OrderedDict
+from ..constants.values import NOTE_BODY_CACHE_SIZE
+
+
+class NoteBodies:
+    """
+    Read-only file with the texts of the notes of a snapshot.
+
+    The texts are stored one after another as UTF-8 and addressed by their
+    offset and length in the file, so a text is read only when it is shown.
+    The most recently read texts are kept in a bounded LRU cache. The file
+    is opened right away and kept open, so it stays readable even if another
+    session removes it.
+    """
+
+    def __init__(
+        self, filename: str, cache_size: int = NOTE_BODY_CACHE_SIZE
+    ) -> None:
+        """
+        Initializes the store on top of a bodies file.
+
+        Args:
+            filename (str): The name of the bodies file.
+            cache_size (int): The number of texts kept in memory.
+        """
+        self.filename = filename
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._file = open(filename, "rb")
+        self._lock = threading.Lock()
+
+    def read(self, offset: int, length: int) -> str:
+        """
+        Returns the text stored at the given position of the file.
+
+        Args:
+            offset (int): The offset of the text in the file.
+            length (int): The length of the encoded text in bytes.
+
+        Returns:
+            str: The text.
+        """
+        with self._lock:
+            value = self._cache.get(offset)
+            if value is not None:
+                self._cache.move_to_end(offset)
+                return value
+            self._file.seek(offset)
+            value = self._file.read(length).decode("utf-8")
+            self._cache[offset] = value
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+            return value
+
+    def close(self) -> None:
+        """
+        Closes the bodies file.
+        """
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            self._cache.clear()
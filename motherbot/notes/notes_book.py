@@ -1,19 +1,206 @@
 """
 NotesBook module.
 """
-from datetime import datetime
+from datetime import date, datetime, timedelta
 from collections import UserDict
-from fuzzywuzzy import fuzz
+from concurrent.futures import BrokenExecutor
+from typing import Callable
 from .note import Note
-from ..helpers.display import display_table, highlight_term, wrap_text
+from .note_bodies import NoteBodies
+from .text import Text
+from ..helpers.display import (
+    display_table,
+    highlight_term,
+    highlight_words,
+    text_snippet,
+    wrap_text,
+)
+from ..helpers.filter_query import (
+    Predicate,
+    parse_date_range,
+    run_filter_query,
+)
+from ..helpers.parallel_search import ShardedScorer
+from ..helpers.scoring import score_entries, top_keys
+from ..helpers.search_cache import SearchCache
+from ..helpers.text_index import TextIndex, tokenize
 from ..settings.app_settings import app_settings
 
+FILTER_FIELDS = [
+    "title", "tag", "text", "reminder", "created", "has", "missing"
+]
+HAS_FIELDS = ["tag", "text", "reminder"]
+PHRASE_FIELDS = {"title", "text"}
+
 
 class NotesBook(UserDict):
     """
     Class representing a collection of notes.
     """
 
+    def __init__(self) -> None:
+        super().__init__()
+        self._changes = {}
+        self._base = {}
+        self._tag_index = None
+        self._text_index = None
+        self._parallel_scorer = None
+        self._version = 0
+        self._search_cache = SearchCache()
+
+    def __getstate__(self) -> dict:
+        """
+        Returns the state to be pickled, without unsaved changes tracking,
+        the indexes, the search cache and the search worker processes.
+        """
+        state = self.__dict__.copy()
+        state.pop("_changes", None)
+        state.pop("_base", None)
+        state.pop("_tag_index", None)
+        state.pop("_text_index", None)
+        state.pop("_parallel_scorer", None)
+        state.pop("_version", None)
+        state.pop("_search_cache", None)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """
+        Restores the pickled state, resets changes tracking and binds the
+        notes to the book.
+        """
+        self.__dict__.update(state)
+        self._changes = {}
+        self._base = {}
+        self._tag_index = None
+        self._text_index = None
+        self._parallel_scorer = None
+        self._version = 0
+        self._search_cache = SearchCache()
+        for note in self.data.values():
+            note.bind(self)
+
+    def to_primitives(
+        self, store_text: Callable[[Text], tuple[int, int]] = None
+    ) -> tuple[dict, list]:
+        """
+        Returns the book as plain values for compact snapshots.
+
+        Args:
+            store_text (Callable[[Text], tuple[int, int]], optional): A
+            callback that stores the texts of the notes outside of the
+            snapshot, see `Note.to_primitives`.
+
+        Returns:
+            tuple[dict, list]: The book settings and the list of notes,
+            each converted with `Note.to_primitives`.
+        """
+        state = self.__getstate__()
+        state.pop("data", None)
+        return state, [
+            note.to_primitives(store_text) for note in self.data.values()
+        ]
+
+    @classmethod
+    def from_primitives(
+        cls, state: dict, entries: list, bodies: NoteBodies = None
+    ) -> "NotesBook":
+        """
+        Creates a book from the values returned by `to_primitives` without
+        validating the notes again.
+
+        Args:
+            state (dict): The book settings.
+            entries (list): The notes converted to plain values.
+            bodies (NoteBodies, optional): The file the texts stored outside
+            of the snapshot are read from.
+
+        Returns:
+            NotesBook: The restored book.
+        """
+        book = cls()
+        book.__dict__.update(state)
+        for primitives in entries:
+            note = Note.from_primitives(primitives, bodies)
+            note.bind(book)
+            book.data[note.title.value.lower()] = note
+        return book
+
+    def mark_changed(self, note: Note) -> None:
+        """
+        Marks a note as changed since the last save.
+
+        Args:
+            note (Note): The note that was edited in place.
+        """
+        self._changes[note.title.value.lower()] = "put"
+        self.update_index(note.title.value.lower(), note)
+
+    def pop_changes(self) -> dict:
+        """
+        Returns the changes made since the last save and resets them.
+
+        Returns:
+            dict: A mapping of normalized titles to "put" or "delete".
+        """
+        changes, self._changes = self._changes, {}
+        self._base = {}
+        for key, operation in changes.items():
+            if operation == "put" and key in self.data:
+                self.data[key].mark_clean()
+        return changes
+
+    def remember_base(self, note: Note) -> None:
+        """
+        Remembers the saved version of a note before it is first changed or
+        deleted, to tell at the next save whether another session changed it
+        too.
+
+        Args:
+            note (Note): The note as it was last saved.
+        """
+        self._base.setdefault(note.title.value.lower(), note.to_primitives())
+
+    def base_primitives(self, key: str) -> tuple | None:
+        """
+        Returns the saved version of an entry changed since the last save.
+
+        Args:
+            key (str): The normalized title of the note.
+
+        Returns:
+            tuple | None: The note as returned by `Note.to_primitives` before
+            it was changed, or None if it was added since the last save.
+        """
+        return self._base.get(key)
+
+    @property
+    def changes(self) -> dict:
+        """
+        Returns the changes made since the last save without resetting them.
+
+        Returns:
+            dict: A mapping of normalized titles to the pending operations,
+            see `pop_changes`.
+        """
+        return dict(self._changes)
+
+    def restore_changes(self, changes: dict) -> None:
+        """
+        Restores the pending changes, e.g. after the entries added by an
+        interrupted import are deleted again.
+
+        Args:
+            changes (dict): The changes returned by `changes` before.
+        """
+        self._changes = dict(changes)
+
+    @property
+    def is_dirty(self) -> bool:
+        """
+        Returns True if the book was changed since it was last saved.
+        """
+        return bool(self._changes)
+
     def add_note(self, note: Note) -> None:
         """
         Adds a new note to the collection.
@@ -31,6 +218,9 @@ class NotesBook(UserDict):
                 .format(note.title.value)
             )
         self.data[normalized_title] = note
+        note.bind(self)
+        self._changes[normalized_title] = "put"
+        self.update_index(normalized_title, note)
 
     def delete(self, note_title: str) -> None:
         """
@@ -48,7 +238,10 @@ class NotesBook(UserDict):
                 app_settings.get_validation_errors()["title_not_found"]
                 .format(note_title)
             )
-        del self.data[normalized_note_title]
+        self.data[normalized_note_title].before_change()
+        self.data.pop(normalized_note_title).bind(None)
+        self._changes[normalized_note_title] = "delete"
+        self.update_index(normalized_note_title, None)
 
     def find(self, note_title: str) -> Note:
         """
@@ -71,60 +264,333 @@ class NotesBook(UserDict):
             .format(note_title)
         )
 
-    def smart_search(self, search_term: str) -> list:
+    @property
+    def tag_index(self) -> dict[str, set[str]]:
         """
-        Smart search that finds contacts even with typos and suggests contacts
-          as the user types.
+        Returns the index of the tags of the notes, building it on first
+        use.
+
+        Returns:
+            dict[str, set[str]]: A mapping of tags (without the leading `#`)
+            to the normalized titles of the notes having them.
+        """
+        if self._tag_index is None:
+            # Titles by tag and tags by title, to update the index when the
+            # tags of a note change
+            titles_by_tag, tags_by_title = {}, {}
+            for title, note in self.data.items():
+                tags = frozenset(tag.value for tag in note.tags)
+                for tag in tags:
+                    titles_by_tag.setdefault(tag, set()).add(title)
+                if tags:
+                    tags_by_title[title] = tags
+            self._tag_index = (titles_by_tag, tags_by_title)
+        return self._tag_index[0]
+
+    @property
+    def text_index(self) -> TextIndex:
+        """
+        Returns the full-text index of the note texts, building it on first
+        use.
+
+        Returns:
+            TextIndex: The index of the words of the note texts by
+            normalized title.
+        """
+        if self._text_index is None:
+            self._text_index = TextIndex()
+            for title, note in self.data.items():
+                self._text_index.update(
+                    title, note.text.value if note.text else None
+                )
+        return self._text_index
+
+    @property
+    def parallel_scorer(self) -> ShardedScorer | None:
+        """
+        Returns the scorer of the titles and tags of the notes in worker
+        processes, starting it on first use, or None if the book has fewer
+        than `app_settings.parallel_search_size` notes.
+        """
+        size = app_settings.parallel_search_size
+        if not size or len(self.data) < size:
+            return None
+        if self._parallel_scorer is None:
+            tags = self._tags_by_title()
+            self._parallel_scorer = ShardedScorer(
+                (title, [title, *tags.get(title, ())]) for title in self.data
+            )
+        return self._parallel_scorer
+
+    def _tags_by_title(self) -> dict[str, list[str]]:
+        """
+        Returns the tags (with the leading `#`) of the notes having any by
+        normalized title, read from the tag index.
+        """
+        tags_by_title = {}
+        for tag, titles in self.tag_index.items():
+            for title in titles:
+                tags_by_title.setdefault(title, []).append(f"#{tag}")
+        return tags_by_title
+
+    def _score_notes(
+        self, search_term: str, titles: list[str]
+    ) -> dict[str, int]:
+        """
+        Scores the titles and tags of the notes with `score_entries`, in
+        worker processes for large books.
+        """
+        scorer = self.parallel_scorer
+        if scorer is not None:
+            try:
+                return scorer.score(search_term, titles)
+            except BrokenExecutor:
+                # The workers are started again by the next search
+                scorer.close()
+                self._parallel_scorer = None
+        tags = self._tags_by_title()
+        return score_entries(search_term, {
+            title: [title, *tags.get(title, ())] for title in titles
+        })
+
+    def update_index(self, key: str, note: Note | None) -> None:
+        """
+        Updates the tag and text indexes after a note was added, edited or
+        deleted, and bumps the version of the book, which invalidates the
+        cached search results. Indexes that are not built yet are skipped.
 
         Args:
-            search_term (str): The term to search for in the contact names and
-              phone numbers.
-            limit (int): The maximum number of suggestions to return.
-            Returns:
-            list: A list of `Record` instances that match the search term with
-              fuzzy matching.
+            key (str): The normalized title of the note.
+            note (Note | None): The note or None if it was deleted.
+
+        Returns:
+            None
         """
-        search_term = search_term.lower()
-        titles = list(self.data)
-        tags = [
-            (str(tag), name)
-            for name, note in self.data.items()
-            for tag in note.tags
-        ]
+        self._version += 1
+        if self._parallel_scorer is not None:
+            self._parallel_scorer.update(
+                key,
+                None if note is None else [
+                    key, *(f"#{tag.value}" for tag in note.tags)
+                ],
+            )
+        if self._text_index is not None:
+            self._text_index.update(
+                key, note.text.value if note and note.text else None
+            )
+        if self._tag_index is None:
+            return
+        titles_by_tag, tags_by_title = self._tag_index
+        old_tags = tags_by_title.pop(key, frozenset())
+        new_tags = frozenset(
+            tag.value for tag in note.tags
+        ) if note is not None else frozenset()
+        for tag in old_tags - new_tags:
+            titles_by_tag[tag].discard(key)
+            if not titles_by_tag[tag]:
+                del titles_by_tag[tag]
+        for tag in new_tags - old_tags:
+            titles_by_tag.setdefault(tag, set()).add(key)
+        if new_tags:
+            tags_by_title[key] = new_tags
+
+    def tag_keys(self, tag: str) -> set[str]:
+        """
+        Returns the notes that have the given tag.
 
-        matched_titles = {}
+        Args:
+            tag (str): The tag with or without the leading `#`.
 
-        for title in titles:
-            if search_term in title:
-                matched_titles[title] = title.count(search_term) * 100
-            else:
-                match = fuzz.partial_ratio(search_term, title)
-                if match >= 70:
-                    matched_titles[title] = match
-
-        for tag, title in tags:
-            if search_term in tag:
-                matched_titles[title] = (
-                    matched_titles.get(title, 0)
-                    + tag.count(search_term) * 100
+        Returns:
+            set[str]: The normalized titles of the notes.
+        """
+        return set(self.tag_index.get(tag.lstrip("#").lower(), ()))
+
+    def search_text(self, query: str) -> dict[str, float]:
+        """
+        Scores the notes whose texts contain any word of the query with
+        BM25, see `TextIndex`.
+
+        Args:
+            query (str): The words to search for.
+
+        Returns:
+            dict[str, float]: The scores of the matching notes by normalized
+            title.
+        """
+        return self.text_index.search(query)
+
+    def reminder_keys(self, start: date, end: date) -> set[str] | None:
+        """
+        Returns the notes with a reminder within the inclusive date range
+        from an index of the reminders. The notes of this book are kept in
+        memory and have no such index.
+
+        Args:
+            start (date): The first date of the range.
+            end (date): The last date of the range.
+
+        Returns:
+            set[str] | None: The normalized titles of the notes, or None if
+            the book has no index of the reminders.
+        """
+        return None
+
+    def _filter_predicate(self, field: str | None, value: str) -> Predicate:
+        """
+        Returns the predicate of a filter query on a field of the notes, see
+        `run_filter_query`. Titles are matched against the keys of the book,
+        tags and words of the texts are looked up in the tag and text
+        indexes, reminders in the index of the reminders if the book has
+        one.
+        """
+        validation_errors = app_settings.get_validation_errors()
+        field = field or "title"
+        if field == "title":
+            term = value.strip().lower()
+            return Predicate(
+                lambda note: term in note.title.value.lower(),
+                lambda: {title for title in self.data if term in title},
+            )
+        if field == "tag":
+            tag = value.strip().lstrip("#").lower()
+            return Predicate(
+                lambda note: any(item.value == tag for item in note.tags),
+                lambda: self.tag_keys(tag),
+            )
+        if field == "text":
+            words = set(tokenize(value))
+            return Predicate(
+                lambda note: bool(words) and note.text is not None
+                and words.issubset(tokenize(note.text.value)),
+                lambda: set.intersection(*(
+                    self.text_index.keys(word) for word in words
+                )) if words else set(),
+            )
+        if field in ("reminder", "created"):
+            start, end = parse_date_range(value)
+            if field == "created":
+                return Predicate(
+                    lambda note: start
+                    <= note.created_on.created_on.date() <= end
                 )
-                continue
-            match = fuzz.ratio(search_term, tag)
-            if match >= 70:
-                matched_titles[title] = matched_titles.get(title, 0) + match
-
-        sorted_titles = sorted(
-            matched_titles.items(),
-            key=lambda x: x[1],
-            reverse=True
+            return Predicate(
+                lambda note: note.reminder is not None
+                and start <= note.reminder.value <= end,
+                lambda: self.reminder_keys(start, end),
+            )
+        if field == "has" and value.strip().lower() in HAS_FIELDS:
+            has_field = value.strip().lower()
+            if has_field == "tag":
+                return Predicate(
+                    lambda note: bool(note.tags),
+                    lambda: set().union(*self.tag_index.values()),
+                )
+            if has_field == "reminder":
+                return Predicate(
+                    lambda note: note.reminder is not None,
+                    lambda: self.reminder_keys(date.min, date.max),
+                )
+            return Predicate(lambda note: note.text is not None)
+        if field == "has":
+            raise ValueError(
+                validation_errors["invalid_search_field"]
+                .format(", ".join(HAS_FIELDS))
+            )
+        raise ValueError(
+            validation_errors["invalid_search_field"]
+            .format(", ".join(FILTER_FIELDS))
+        )
+
+    def filter(self, query: str) -> list[Note]:
+        """
+        Finds the notes matching a filter query, e.g.
+        `#work reminder:<01.12.2026` or `missing:tag NOT title:draft`, see
+        `run_filter_query`. Tag queries such as `#work AND #urgent NOT #done`
+        are filter queries too.
+
+        Plain words match the titles. The fields are `title`, `tag`, `text`
+        (words of the text), `reminder` and `created` (date ranges) and
+        `has` or `missing` with `tag`, `text` or `reminder`.
+
+        Args:
+            query (str): The filter query.
+
+        Raises:
+            ValueError: If the query is invalid or uses an unknown field.
+
+        Returns:
+            list[Note]: The matching notes sorted by title.
+        """
+        keys = run_filter_query(
+            query, self._filter_predicate, lambda: set(self.data),
+            self.data.__getitem__, PHRASE_FIELDS,
         )
+        return [self.data[key] for key in keys]
+
+    def notes_with_reminders(self, start: date, end: date) -> list[Note]:
+        """
+        Returns the notes with a reminder within the inclusive date range.
 
-        results = []
-        for title, _ in sorted_titles:
-            note = self.find(title)
-            results.append(note)
+        Args:
+            start (date): The first date of the range.
+            end (date): The last date of the range.
 
-        return results
+        Returns:
+            list[Note]: The notes with a reminder in the range.
+        """
+        return [
+            note for note in self.data.values()
+            if note.reminder is not None
+            and start <= note.reminder.value <= end
+        ]
+
+    def search_scores(self, search_term: str) -> dict[str, int]:
+        """
+        Scores the notes matching the search term by title or tag, even with
+        typos.
+
+        Titles and tags are scored with fuzzy matching, see `score_entries`,
+        in worker processes for books with at least
+        `app_settings.parallel_search_size` notes, see `ShardedScorer`. The
+        results of the last terms are cached until the book changes.
+
+        Args:
+            search_term (str): The term to search for in the note titles and
+              tags.
+
+        Returns:
+            dict[str, int]: The scores of the matching notes by normalized
+            title.
+        """
+        search_term = search_term.lower()
+        cached = self._search_cache.get(search_term, self._version)
+        if cached is not None:
+            return dict(cached)
+        matched_titles = self._score_notes(search_term, list(self.data))
+        self._search_cache.put(search_term, self._version, matched_titles)
+        return dict(matched_titles)
+
+    def smart_search(
+        self, search_term: str, limit: int | None = None, offset: int = 0
+    ) -> list:
+        """
+        Smart search that finds notes even with typos and suggests notes
+          as the user types.
+
+        Args:
+            search_term (str): The term to search for in the note titles and
+              tags.
+            limit (int | None, optional): The maximum number of notes to
+              return, all matching notes if None.
+            offset (int, optional): The number of best matching notes to skip.
+
+        Returns:
+            list: A list of `Note` instances that match the search term with
+              fuzzy matching, best matches first.
+        """
+        scores = self.search_scores(search_term)
+        return [self.find(title) for title in top_keys(scores, limit, offset)]
 
     def upcoming_reminders(self, days: int, short: bool = False) -> list:
         """
@@ -141,12 +607,10 @@ class NotesBook(UserDict):
         today = datetime.today().date()
         upcoming_reminders = {}
 
-        for note in self.data.values():
-            if note.reminder is None or note.reminder.value < today:
-                continue
-            days_until_reminder = (note.reminder.value - today).days
-            if 0 <= days_until_reminder <= days:
-                upcoming_reminders[note.reminder.value] = note
+        for note in self.notes_with_reminders(
+            today, today + timedelta(days=days)
+        ):
+            upcoming_reminders[note.reminder.value] = note
         sorted_reminders = dict(sorted(upcoming_reminders.items()))
 
         if short:
@@ -172,7 +636,9 @@ class NotesBook(UserDict):
             notes (list[Note]): A list of notes to display.
             search_term (str, optional): The search term used to filter the
             contacts.
-            field (str, optional): The field to be searched.
+            field (str, optional): The field to be searched. For "text" the
+            text is shortened to the part with the most words of the search
+            term.
 
         Returns:
             str: A formatted table of notes.
@@ -190,9 +656,20 @@ class NotesBook(UserDict):
             tags = wrap_text(" ".join(map(str, note.tags)), width=15)
             if search_term and not field or field == "tags":
                 tags = highlight_term(tags, search_term)
+            if not note.text:
+                text = "-"
+            elif search_term and field == "text":
+                text = highlight_words(
+                    wrap_text(
+                        text_snippet(str(note.text), search_term), width=40
+                    ),
+                    search_term,
+                )
+            else:
+                text = wrap_text(str(note.text), width=40)
             table.append([
                 title,
-                wrap_text(str(note.text), width=40) if note.text else "-",
+                text,
                 tags if note.tags else "-",
                 str(note.created_on),
                 str(note.reminder) if note.reminder else "-"
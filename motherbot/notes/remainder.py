@@ -4,9 +4,10 @@ Reminder module.
 
 from datetime import datetime
 from ..settings.app_settings import app_settings
+from ..helpers.restorable import Restorable
 
 
-class Reminder:
+class Reminder(Restorable):
     """
     Class representing a reminder for a specific date.
 
@@ -0,0 +1,122 @@
+"""
+SQLite notes book module.
+"""
+
+import sqlite3
+from datetime import date
+from .note import Note
+from .notes_book import NotesBook
+from ..helpers.sqlite_storage import SQLiteMapping
+
+
+class SQLiteNotesBook(NotesBook):
+    """
+    Notes book whose notes are stored in a SQLite database.
+
+    Notes are written to the database as soon as they are added, edited or
+    deleted and committed on save. Titles and reminder dates are indexed
+    columns, tags are kept in the indexed `notes_tag` table.
+    """
+
+    def __init__(self, connection: sqlite3.Connection) -> None:
+        """
+        Initializes the notes book on top of an open database.
+
+        Args:
+            connection (sqlite3.Connection): The database connection.
+        """
+        super().__init__()
+        self.connection = connection
+        self.data = SQLiteMapping(
+            connection,
+            "notes",
+            columns={
+                "title": lambda note: note.title.value,
+                "reminder": lambda note: (
+                    note.reminder.value.isoformat() if note.reminder else None
+                ),
+            },
+            multi_columns={
+                "tag": lambda note: [tag.value for tag in note.tags],
+            },
+            bind=lambda note: note.bind(self),
+        )
+
+    def mark_changed(self, note: Note) -> None:
+        """
+        Marks a note as changed and writes it to the database.
+
+        Args:
+            note (Note): The note that was edited in place.
+        """
+        super().mark_changed(note)
+        self.data[note.title.value.lower()] = note
+
+    def commit(self) -> None:
+        """
+        Commits the changes made since the last save to the database file.
+        """
+        self.pop_changes()
+        self.data.commit()
+
+    @property
+    def tag_index(self) -> dict[str, set[str]]:
+        """
+        Returns the index of the tags of the notes read from the tag table
+        without loading the notes.
+
+        Returns:
+            dict[str, set[str]]: A mapping of tags (without the leading `#`)
+            to the normalized titles of the notes having them.
+        """
+        titles_by_tag = {}
+        for tag, title in self.data.column_values("tag"):
+            titles_by_tag.setdefault(tag, set()).add(title)
+        return titles_by_tag
+
+    def tag_keys(self, tag: str) -> set[str]:
+        """
+        Returns the notes that have the given tag from the tag table.
+
+        Args:
+            tag (str): The tag with or without the leading `#`.
+
+        Returns:
+            set[str]: The normalized titles of the notes.
+        """
+        return set(self.data.keys_where("tag", tag.lstrip("#").lower()))
+
+    def reminder_keys(self, start: date, end: date) -> set[str]:
+        """
+        Returns the notes with a reminder within the inclusive date range
+        from the reminder column index.
+
+        Args:
+            start (date): The first date of the range.
+            end (date): The last date of the range.
+
+        Returns:
+            set[str]: The normalized titles of the notes.
+        """
+        return set(self.data.keys_between(
+            "reminder", start.isoformat(), end.isoformat()
+        ))
+
+    def notes_with_reminders(self, start: date, end: date) -> list[Note]:
+        """
+        Returns the notes with a reminder within the inclusive date range
+        using the reminder index.
+
+        Args:
+            start (date): The first date of the range.
+            end (date): The last date of the range.
+
+        Returns:
+            list[Note]: The notes with a reminder in the range.
+        """
+        return [
+            self.data[key]
+            for key in self.data.keys_between(
+                "reminder", start.isoformat(), end.isoformat()
+            )
+        ]
@@ -4,9 +4,10 @@ Tag field module
 
 from ..settings.app_settings import app_settings
 from ..constants.values import TAG_MIN_LENGTH, TAG_MAX_LENGTH
+from ..helpers.restorable import Restorable
 
 
-class Tag:
+class Tag(Restorable):
     """
     Class representing a tag field.
     """
@@ -4,9 +4,11 @@ Text field module
 
 from ..settings.app_settings import app_settings
 from ..constants.values import TEXT_MAX_LENGTH
+from .note_bodies import NoteBodies
+from ..helpers.restorable import Restorable
 
 
-class Text:
+class Text(Restorable):
     """
     Class representing a tag field.
     """
@@ -37,3 +39,43 @@ class Text:
         """
 
         return self.value
+
+
+class LazyText(Text):
+    """
+    Text field whose value stays on disk until it is first read.
+
+    Notes loaded from a snapshot get a lazy text that only knows where the
+    text is stored, the value itself is read from the note bodies file (see
+    `NoteBodies`) when the note is shown.
+    """
+
+    def __init__(self, bodies: NoteBodies, offset: int, length: int) -> None:
+        """
+        Initialize a lazy text field.
+
+        Args:
+            bodies (NoteBodies): The file the text is stored in.
+            offset (int): The offset of the text in the file.
+            length (int): The length of the encoded text in bytes.
+        """
+        self.bodies = bodies
+        self.offset = offset
+        self.length = length
+
+    @property
+    def value(self) -> str:
+        """
+        Returns the text, reading it from the bodies file if needed.
+
+        Returns:
+            str: The text of the note.
+        """
+        return self.bodies.read(self.offset, self.length)
+
+    def __reduce__(self) -> tuple:
+        """
+        Pickles the field as a plain text field with its value, so journals
+        and databases do not depend on the bodies file.
+        """
+        return Text.restore, (self.value,)
@@ -4,9 +4,10 @@ Title field module.
 
 from ..settings.app_settings import app_settings
 from ..constants.values import TITLE_MIN_LENGTH, TITLE_MAX_LENGTH
+from ..helpers.restorable import Restorable
 
 
-class Title:
+class Title(Restorable):
     """
     Class representing a title field.
     """
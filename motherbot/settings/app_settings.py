@@ -7,6 +7,7 @@ from ..constants.commands import (
 from ..constants.info_messages import info_messages_en, info_messages_ua
 from ..constants.questions import questions_en, questions_ua
 from ..constants.validation import validation_errors_en, validation_errors_ua
+from ..constants.values import PARALLEL_SEARCH_MIN_SIZE
 
 
 class AppSettings:
@@ -14,8 +15,10 @@ class AppSettings:
         """
         Initializes a new AppSettings instance with default settings.
 
-        Sets the language to English, date format to DD.MM.YYYY, and available
-        languages and date formats.
+        Sets the language to English, date format to DD.MM.YYYY, storage mode
+        to journal, snapshot codec to zlib, parallel search size to
+        `PARALLEL_SEARCH_MIN_SIZE`, and available languages, date formats,
+        storage modes and snapshot codecs.
         """
         self._language = "en"
         self._date_format = "%d.%m.%Y"
@@ -26,6 +29,11 @@ class AppSettings:
             "MM/DD/YYYY": "%m/%d/%Y",
             "YYYY-MM-DD": "%Y-%m-%d",
         }
+        self._storage_mode = "journal"
+        self._available_storage_modes = ["snapshot", "journal", "sqlite"]
+        self._snapshot_codec = "zlib"
+        self._available_snapshot_codecs = ["none", "zlib", "lzma", "bz2"]
+        self._parallel_search_size = PARALLEL_SEARCH_MIN_SIZE
 
     @property
     def language(self) -> str:
@@ -83,6 +91,73 @@ class AppSettings:
                 f"{', '.join(self._available_date_formats.keys())}"
             )
 
+    @property
+    def storage_mode(self) -> str:
+        """
+        Returns the current storage mode.
+        """
+        return self._storage_mode
+
+    @storage_mode.setter
+    def storage_mode(self, value: str) -> None:
+        """
+        Sets the current storage mode.
+
+        In "snapshot" mode every save rewrites the whole book file, in
+        "journal" mode saves append the changed entries to a journal next to
+        the book file, in "sqlite" mode the books are stored in a SQLite
+        database one entry per row.
+        """
+        if value in self._available_storage_modes:
+            self._storage_mode = value
+        else:
+            raise ValueError(
+                self.get_validation_errors()["invalid_storage_mode"]
+                .format(", ".join(self._available_storage_modes))
+            )
+
+    @property
+    def snapshot_codec(self) -> str:
+        """
+        Returns the codec used to compress book snapshots.
+        """
+        return self._snapshot_codec
+
+    @snapshot_codec.setter
+    def snapshot_codec(self, value: str) -> None:
+        """
+        Sets the codec used to compress book snapshots. Snapshots saved with
+        any codec can still be loaded.
+        """
+        if value in self._available_snapshot_codecs:
+            self._snapshot_codec = value
+        else:
+            raise ValueError(
+                self.get_validation_errors()["invalid_snapshot_codec"]
+                .format(", ".join(self._available_snapshot_codecs))
+            )
+
+    @property
+    def parallel_search_size(self) -> int:
+        """
+        Returns the number of entries from which a book is searched in
+        parallel worker processes.
+        """
+        return self._parallel_search_size
+
+    @parallel_search_size.setter
+    def parallel_search_size(self, value: int) -> None:
+        """
+        Sets the number of entries from which a book is searched in parallel
+        worker processes, 0 turns parallel search off.
+        """
+        if isinstance(value, int) and value >= 0:
+            self._parallel_search_size = value
+        else:
+            raise ValueError(
+                self.get_validation_errors()["invalid_parallel_search_size"]
+            )
+
     def list_languages(self) -> list:
         """
         Returns the list of available languages.
@@ -95,6 +170,18 @@ class AppSettings:
         """
         return list(self._available_date_formats.keys())
 
+    def list_storage_modes(self) -> list:
+        """
+        Returns the list of available storage modes.
+        """
+        return self._available_storage_modes
+
+    def list_snapshot_codecs(self) -> list:
+        """
+        Returns the list of available snapshot codecs.
+        """
+        return self._available_snapshot_codecs
+
     def get_command_names(self) -> dict:
         """
         Returns the command names dictionary based on the current language.
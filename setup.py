@@ -14,7 +14,6 @@ setup(
         'docutils ',
         'Faker',
         'filelock',
-        'fuzzywuzzy',
         'identify',
         'idna',
         'importlib_metadata',
@@ -22,7 +21,6 @@ setup(
         'jaraco.context',
         'jaraco.functools',
         'keyring',
-        'Levenshtein',
         'markdown-it-py',
         'mdurl',
         'more-itertools',
@@ -37,7 +35,6 @@ setup(
         'pyfiglet',
         'Pygments',
         'python-dateutil',
-        'python-Levenshtein',
         'PyYAML',
         'rapidfuzz',
         'readme_renderer',
@@ -0,0 +1,68 @@
+"""
+Tests of the BK-tree against a brute-force scan of the strings.
+"""
+
+import random
+
+import pytest
+from rapidfuzz.distance import Levenshtein
+
+from motherbot.helpers.bk_tree import BKTree
+
+
+def brute_force(words: set[str], term: str, max_distance: int) -> list:
+    return sorted(
+        (distance, word)
+        for word in words
+        if (distance := Levenshtein.distance(term, word)) <= max_distance
+    )
+
+
+def random_word(rnd: random.Random) -> str:
+    return "".join(rnd.choice("abcd") for _ in range(rnd.randint(1, 7)))
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_search_matches_brute_force(seed):
+    rnd = random.Random(seed)
+    words = {random_word(rnd) for _ in range(400)}
+    tree = BKTree(words)
+    assert len(tree) == len(words)
+    for _ in range(50):
+        term = random_word(rnd)
+        for max_distance in range(4):
+            assert tree.search(term, max_distance) == brute_force(
+                words, term, max_distance
+            )
+
+
+def test_search_skips_discarded_words_and_rebuilds():
+    rnd = random.Random(7)
+    words = set()
+    while len(words) < 3000:
+        words.add(random_word(rnd) + random_word(rnd))
+    tree = BKTree(words)
+    for word in sorted(words)[::2]:
+        tree.discard(word)
+        words.discard(word)
+    tree.add("abba")
+    words.add("abba")
+    for word in sorted(words)[::3] + sorted(words)[1::3]:
+        tree.discard(word)
+        words.discard(word)
+    tree.discard("not in the tree")
+
+    assert len(tree) == len(words)
+    assert len(tree._nodes) < 3000
+    assert all(word in tree for word in words)
+    for _ in range(30):
+        term = random_word(rnd)
+        assert tree.search(term, 2) == brute_force(words, term, 2)
+
+
+def test_readded_word_is_found_again():
+    tree = BKTree(["smith", "smyth", "smithe"])
+    tree.discard("smyth")
+    assert tree.search("smyth", 0) == []
+    tree.add("smyth")
+    assert tree.search("smyth", 1) == [(0, "smyth"), (1, "smith")]
@@ -0,0 +1,145 @@
+"""
+Tests of exporting contacts and notes and importing them back.
+"""
+
+import pytest
+
+from motherbot.contacts.address_book import AddressBook
+from motherbot.contacts.record import Record
+from motherbot.helpers.export_data import (
+    LINE_LENGTH, contact_rows, escape_text, export_contacts_file,
+    export_notes_file, fold_line, note_rows,
+)
+from motherbot.helpers.import_data import (
+    import_contacts_file, import_notes_file,
+)
+from motherbot.notes.note import Note
+from motherbot.notes.notes_book import NotesBook
+
+
+def address_book() -> AddressBook:
+    book = AddressBook()
+    for name, phones, email, address, birthday in [
+        ("John Smith", ["0501234567", "0671234567"], "john@gmail.com",
+         "1 Main St, New York, USA", "15.03.1990"),
+        ("Олена Бондар", ["0931234567"], None,
+         "вул. Хрещатик 1; кв. 2, Київ, Україна", None),
+        ("O'Brien, Jr", [], "obrien@example.com", None, "29.02.2000"),
+        ("Solo", [], None, None, None),
+    ]:
+        record = Record(name)
+        for phone in phones:
+            record.add_phone(phone)
+        if email:
+            record.add_email(email)
+        if address:
+            record.add_address(address)
+        if birthday:
+            record.add_birthday(birthday)
+        book.add_record(record)
+    return book
+
+
+def notes_book() -> NotesBook:
+    book = NotesBook()
+    for title, text, tags, reminder in [
+        ("Shopping", "milk, bread; \"eggs\"\nand a backslash \\", "home",
+         "01.01.2099"),
+        ("Нотатка", "Текст українською", "робота ідеї", None),
+        ("Empty", None, "", None),
+    ]:
+        note = Note(title)
+        if text:
+            note.add_text(text)
+        if tags:
+            note.add_tags(tags)
+        if reminder:
+            note.set_reminder(reminder)
+        book.add_note(note)
+    return book
+
+
+@pytest.mark.parametrize("extension", [".csv", ".jsonl", ".vcf"])
+def test_contacts_round_trip(tmp_path, extension):
+    book = address_book()
+    filename = str(tmp_path / f"contacts{extension}")
+    assert export_contacts_file(book, filename) == len(book)
+
+    imported = AddressBook()
+    assert import_contacts_file(imported, filename) == (len(book), [])
+    assert list(contact_rows(imported)) == list(contact_rows(book))
+
+
+@pytest.mark.parametrize("extension", [".csv", ".jsonl"])
+def test_notes_round_trip(tmp_path, extension):
+    book = notes_book()
+    filename = str(tmp_path / f"notes{extension}")
+    assert export_notes_file(book, filename) == len(book)
+
+    imported = NotesBook()
+    assert import_notes_file(imported, filename) == (len(book), [])
+    assert list(note_rows(imported)) == list(note_rows(book))
+
+
+def test_unsupported_format_is_not_written(tmp_path):
+    with pytest.raises(ValueError):
+        export_notes_file(notes_book(), str(tmp_path / "notes.vcf"))
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_escape_text():
+    assert escape_text("a,b;c\\d\ne") == "a\\,b\\;c\\\\d\\ne"
+
+
+@pytest.mark.parametrize("line", [
+    "SUMMARY:short",
+    "DESCRIPTION:" + "x" * 200,
+    "DESCRIPTION:" + "ї" * 100,
+    "SUMMARY:" + "a€" * 60,
+])
+def test_fold_line(line):
+    folded = fold_line(line)
+    assert folded.endswith("\r\n")
+    physical = folded[:-2].split("\r\n")
+    assert all(len(part.encode("utf-8")) <= LINE_LENGTH for part in physical)
+    assert all(part.startswith(" ") for part in physical[1:])
+    assert physical[0] + "".join(part[1:] for part in physical[1:]) == line
+
+
+def unfold(content: str) -> list[str]:
+    return content.replace("\r\n ", "").split("\r\n")
+
+
+def test_reminders_calendar(tmp_path):
+    book = notes_book()
+    note = book.find("Shopping")
+    note.add_text(note.text.value + " " + "long text " * 20)
+    filename = tmp_path / "reminders.ics"
+    assert export_notes_file(book, str(filename)) == 1
+
+    content = filename.read_bytes().decode("utf-8")
+    assert all(
+        len(line.encode("utf-8")) <= LINE_LENGTH
+        for line in content.split("\r\n")
+    )
+    lines = unfold(content)
+    assert lines[0] == "BEGIN:VCALENDAR"
+    assert lines[-2:] == ["END:VCALENDAR", ""]
+    assert "DTSTART;VALUE=DATE:20990101" in lines
+    assert "SUMMARY:Shopping" in lines
+    assert "CATEGORIES:home" in lines
+    description = next(line for line in lines if line.startswith("DESC"))
+    assert description.startswith(
+        "DESCRIPTION:milk\\, bread\\; \"eggs\"\\nand a backslash \\\\ "
+    )
+
+
+def test_birthdays_calendar(tmp_path):
+    filename = tmp_path / "birthdays.ics"
+    assert export_contacts_file(address_book(), str(filename)) == 2
+
+    lines = unfold(filename.read_bytes().decode("utf-8"))
+    assert lines.count("BEGIN:VEVENT") == 2
+    assert "SUMMARY:O'Brien\\, Jr" in lines
+    assert "DTSTART;VALUE=DATE:20000229" in lines
+    assert lines.count("RRULE:FREQ=YEARLY") == 2
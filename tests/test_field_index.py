@@ -0,0 +1,118 @@
+"""
+Tests of the field index against a brute-force scan of the contacts.
+"""
+
+import random
+
+import pytest
+
+from motherbot.contacts.address_book import AddressBook
+from motherbot.contacts.record import Record
+from motherbot.helpers.field_index import FieldIndex, address_values
+
+USERS = ["anna", "ivan", "olga", "petro"]
+DOMAINS = ["gmail.com", "ukr.net", "example.org"]
+STREETS = ["Main St 1", "Rynok 5", "Shevchenka 10"]
+CITIES = ["Kyiv", "Lviv", "New York"]
+COUNTRIES = ["Ukraine", "USA"]
+
+
+def test_address_values():
+    assert address_values("Main St 1, New York, USA") == [
+        ("street", "main st 1"), ("city", "new york"), ("country", "usa"),
+        ("address", "main"), ("address", "st"), ("address", "1"),
+        ("address", "new"), ("address", "york"), ("address", "usa"),
+    ]
+    assert address_values("Flat 2, Rynok 5, Lviv, Ukraine")[:3] == [
+        ("street", "flat 2 rynok 5"), ("city", "lviv"), ("country", "ukraine"),
+    ]
+    assert address_values("Kyiv, Ukraine")[:2] == [
+        ("street", "kyiv"), ("city", "ukraine"),
+    ]
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_index_matches_brute_force(seed):
+    rnd = random.Random(seed)
+    pairs = [("city", city.lower()) for city in CITIES] + [
+        ("domain", domain) for domain in DOMAINS
+    ]
+    index = FieldIndex()
+    entries = {}
+    for _ in range(500):
+        key = rnd.randrange(50)
+        if rnd.random() < 0.2:
+            index.remove(key)
+            entries.pop(key, None)
+            continue
+        values = set(rnd.sample(pairs, rnd.randrange(3)))
+        index.update(key, values)
+        entries[key] = values
+    assert len(index) == sum(1 for values in entries.values() if values)
+    for pair in pairs:
+        assert index.keys(*pair) == {
+            key for key, values in entries.items() if pair in values
+        }
+
+
+def random_book(rnd: random.Random) -> AddressBook:
+    book = AddressBook()
+    for number in range(200):
+        record = Record(f"Contact {number}")
+        if rnd.random() < 0.7:
+            record.add_email(f"{rnd.choice(USERS)}@{rnd.choice(DOMAINS)}")
+        if rnd.random() < 0.7:
+            record.add_address(", ".join([
+                rnd.choice(STREETS), rnd.choice(CITIES), rnd.choice(COUNTRIES)
+            ]))
+        book.add_record(record)
+    return book
+
+
+def matches(record: Record, field: str, value: str) -> bool:
+    email = record.email.value.lower() if record.email else ""
+    parts = record.address.value.split(", ") if record.address else []
+    if field == "email":
+        return email == value.lower()
+    if field == "domain":
+        return email.endswith("@" + value.lower())
+    if field == "city":
+        return len(parts) == 3 and parts[1].lower() == value.lower()
+    if field == "country":
+        return len(parts) == 3 and parts[2].lower() == value.lower()
+    return all(
+        word in " ".join(parts).lower().replace(",", " ").split()
+        for word in value.lower().split()
+    )
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_filter_matches_brute_force(seed):
+    rnd = random.Random(seed)
+    book = random_book(rnd)
+    queries = [("email", f"{user}@{domain}")
+               for user in USERS for domain in DOMAINS]
+    queries += [("domain", domain) for domain in DOMAINS]
+    queries += [("city", city) for city in CITIES]
+    queries += [("country", country) for country in COUNTRIES]
+    queries += [("address", "rynok lviv"), ("address", "york 1")]
+
+    for round_number in range(2):
+        for field, value in queries:
+            query = f'{field}:"{value}"' if " " in value else (
+                f"{field}:{value}"
+            )
+            assert {
+                record.name.value for record in book.filter(query)
+            } == {
+                record.name.value for record in book.values()
+                if matches(record, field, value)
+            }, query
+        for record in rnd.sample(list(book.values()), 40):
+            if record.email:
+                record.remove_email()
+            else:
+                record.add_email(f"{rnd.choice(USERS)}@gmail.com")
+            record.add_address(f"Rynok 5, {rnd.choice(CITIES)}, Ukraine")
+        for record in rnd.sample(list(book.values()), 20):
+            book.delete(record.name.value)
@@ -0,0 +1,239 @@
+"""
+Tests of filter queries.
+"""
+
+import random
+from datetime import date
+
+import pytest
+
+from motherbot.contacts.address_book import AddressBook
+from motherbot.contacts.record import Record
+from motherbot.contacts.sqlite_address_book import SQLiteAddressBook
+from motherbot.helpers.filter_query import (
+    Predicate,
+    is_filter_query,
+    parse_date_range,
+    query_terms,
+    run_filter_query,
+)
+from motherbot.notes.note import Note
+from motherbot.helpers.sqlite_storage import connect_database
+from motherbot.notes.notes_book import NotesBook
+
+
+@pytest.mark.parametrize("query", [
+    "#wor", "shopping", "shopping list", "a OR b", "#",
+])
+def test_plain_terms_are_not_filter_queries(query):
+    assert not is_filter_query(query)
+
+
+@pytest.mark.parametrize("query", [
+    "#work #urgent", "#work AND #urgent", "NOT #done", "#work plan",
+    "tag:work", "has:reminder", "(#home OR #garden)",
+])
+def test_filter_queries(query):
+    assert is_filter_query(query)
+
+
+def test_single_tag_is_matched_fuzzily():
+    book = NotesBook()
+    note = Note("weekly plan")
+    note.add_tags("work")
+    book.add_note(note)
+    book.add_note(Note("holiday"))
+    assert list(book.search_scores("#wor")) == ["weekly plan"]
+    assert book.filter("#wor") == []
+
+
+ENTRIES = {
+    "alpha": {"tags": {"work", "urgent"}, "city": "new york"},
+    "beta": {"tags": {"work", "done"}, "city": "kyiv"},
+    "gamma": {"tags": {"home"}, "city": "new york"},
+    "delta": {"tags": {"garden", "urgent"}, "city": ""},
+    "epsilon": {"tags": set(), "city": "lviv"},
+}
+
+
+def make_predicate(field, value, indexed=True):
+    if field == "tag":
+        keys = {
+            key for key, entry in ENTRIES.items() if value in entry["tags"]
+        }
+        return Predicate(
+            lambda entry: value in entry["tags"],
+            (lambda: keys) if indexed else None,
+        )
+    if field == "city":
+        return Predicate(lambda entry: entry["city"] == value.lower())
+    if field == "has":
+        return Predicate(lambda entry: bool(entry[value]))
+    if field is None:
+        return Predicate(
+            lambda entry: value in entry["name"],
+            (lambda: {key for key in ENTRIES if value in key})
+            if indexed else None,
+            exact=False,
+        )
+    raise ValueError(f"unknown field {field}")
+
+
+def run(query, indexed=True):
+    return run_filter_query(
+        query,
+        lambda field, value: make_predicate(field, value, indexed),
+        lambda: set(ENTRIES),
+        lambda key: {**ENTRIES[key], "name": key},
+        {"city"},
+    )
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("#work", ["alpha", "beta"]),
+    ("#work #urgent", ["alpha"]),
+    ("#work AND #urgent", ["alpha"]),
+    ("#work NOT #done", ["alpha"]),
+    ("#work AND NOT #done", ["alpha"]),
+    ("NOT #work", ["delta", "epsilon", "gamma"]),
+    ("#home OR #garden", ["delta", "gamma"]),
+    ("#home OR #work #urgent", ["alpha", "gamma"]),
+    ("(#home OR #work) #urgent", ["alpha"]),
+    ("(#home OR #garden) NOT #urgent", ["gamma"]),
+    ("city:New York", ["alpha", "gamma"]),
+    ('city:"New York" #home', ["gamma"]),
+    ("city:New York NOT #work", ["gamma"]),
+    ("missing:city", ["delta"]),
+    ("has:tags NOT #urgent", ["beta", "gamma"]),
+    ("lta OR #home", ["delta", "gamma"]),
+    ("a #urgent", ["alpha", "delta"]),
+    ("#WORK", []),
+    ("#nothing OR NOT #nothing", sorted(ENTRIES)),
+])
+def test_run_filter_query(query, expected):
+    assert run(query) == expected
+    assert run(query, indexed=False) == expected
+
+
+@pytest.mark.parametrize("query", [
+    "", "AND", "#work AND", "#work OR", "(#work", "#work)", "()", "NOT",
+    "#work (#home",
+])
+def test_invalid_filter_queries(query):
+    with pytest.raises(ValueError):
+        run(query)
+
+
+def test_unknown_field_is_reported():
+    with pytest.raises(ValueError, match="unknown field"):
+        run("color:red")
+
+
+def random_query(rnd: random.Random, depth: int = 0) -> str:
+    if depth > 2 or rnd.random() < 0.4:
+        return rnd.choice([
+            "#work", "#urgent", "#done", "#home", "#garden", "#none",
+            "city:kyiv", "missing:city", "has:tags", "lta", "a",
+        ])
+    left = random_query(rnd, depth + 1)
+    right = random_query(rnd, depth + 1)
+    return rnd.choice([
+        f"{left} {right}", f"{left} AND {right}", f"{left} OR {right}",
+        f"{left} NOT {right}", f"NOT {left}", f"({left} OR {right})",
+    ])
+
+
+def test_planned_queries_match_checking_every_entry():
+    rnd = random.Random(4)
+    for _ in range(300):
+        query = random_query(rnd)
+        assert run(query) == run(query, indexed=False), query
+
+
+def test_query_terms_skip_negated_predicates():
+    assert query_terms(
+        "city:New York #work NOT #done NOT (#home OR lviv)", {"city"}
+    ) == [("city", "New York"), ("tag", "work")]
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("01.12.2026", (date(2026, 12, 1), date(2026, 12, 1))),
+    ("<01.12.2026", (date.min, date(2026, 11, 30))),
+    ("<=01.12.2026", (date.min, date(2026, 12, 1))),
+    (">01.12.2026", (date(2026, 12, 2), date.max)),
+    (">=01.12.2026", (date(2026, 12, 1), date.max)),
+    ("01.11.2026..01.12.2026", (date(2026, 11, 1), date(2026, 12, 1))),
+    ("..01.12.2026", (date.min, date(2026, 12, 1))),
+    ("01.12.2026..", (date(2026, 12, 1), date.max)),
+])
+def test_parse_date_range(value, expected):
+    assert parse_date_range(value) == expected
+
+
+@pytest.mark.parametrize("value", ["01.12", "2026-12-01", "<", "tomorrow"])
+def test_invalid_date_range(value):
+    with pytest.raises(ValueError):
+        parse_date_range(value)
+
+
+def contacts_book(book: AddressBook | None = None) -> AddressBook:
+    book = AddressBook() if book is None else book
+    for name, phone, email, address, birthday in [
+        ("John Smith", "0501234567", "john@gmail.com",
+         "1 Main St, New York, USA", "15.03.1990"),
+        ("Olena Bondar", "0671234567", "olena@ukr.net",
+         "Khreshchatyk 1, Kyiv, Ukraine", "02.03.1985"),
+        ("Taras Lee", "0509876543", None, "Rynok 5, Lviv, Ukraine", None),
+        ("Mary Wade", None, "mary@gmail.com", None, "20.07.2000"),
+    ]:
+        record = Record(name)
+        if phone:
+            record.add_phone(phone)
+        if email:
+            record.add_email(email)
+        if address:
+            record.add_address(address)
+        if birthday:
+            record.add_birthday(birthday)
+        book.add_record(record)
+    return book
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("email:@gmail.com", ["john smith", "mary wade"]),
+    ("domain:ukr.net", ["olena bondar"]),
+    ("email:JOHN@gmail.com", ["john smith"]),
+    ("city:Kyiv", ["olena bondar"]),
+    ("country:ukraine NOT city:lviv", ["olena bondar"]),
+    ("address:main new", ["john smith"]),
+    ("phone:050", ["john smith", "taras lee"]),
+    ("phone:0671234567", ["olena bondar"]),
+    ("missing:email AND has:phone", ["taras lee"]),
+    ("month:3", ["john smith", "olena bondar"]),
+    ("birthday:>=01.01.1990", ["john smith", "mary wade"]),
+    ("lee OR wade", ["mary wade", "taras lee"]),
+    ('"john smith"', ["john smith"]),
+])
+def test_contacts_filter(query, expected):
+    records = contacts_book().filter(query)
+    assert [record.name.value.lower() for record in records] == expected
+
+
+@pytest.mark.parametrize("query", [
+    "color:red", "has:color", "month:13", "phone:abc", "birthday:01.13",
+])
+def test_contacts_filter_errors(query):
+    with pytest.raises(ValueError):
+        contacts_book().filter(query)
+
+
+def test_sqlite_email_lookup_uses_the_email_column(tmp_path):
+    book = contacts_book(
+        SQLiteAddressBook(connect_database(str(tmp_path / "motherbot.db")))
+    )
+    records = book.filter("email:JOHN@gmail.com OR email:mary@gmail.com")
+    assert [record.name.value for record in records] == [
+        "John Smith", "Mary Wade"
+    ]
+    assert book.email_keys("olena@ukr.net") == {"olena bondar"}
+    assert book._field_index is None
@@ -0,0 +1,85 @@
+"""
+Tests of importing contacts and notes from files.
+"""
+
+import pytest
+
+from motherbot.contacts.address_book import AddressBook
+from motherbot.contacts.record import Record
+from motherbot.helpers.import_data import (
+    build_record, import_contacts_file, import_notes_file, import_rows,
+)
+from motherbot.notes.notes_book import NotesBook
+
+
+def saved_book() -> AddressBook:
+    book = AddressBook()
+    book.add_record(Record("Existing"))
+    book.pop_changes()
+    return book
+
+
+def test_imports_valid_rows_and_reports_rejected(tmp_path):
+    path = tmp_path / "contacts.csv"
+    path.write_text(
+        "name,phones,email\n"
+        "Alice,0501234567,alice@example.com\n"
+        "Bob,123,\n"
+        "Existing,,\n"
+        "Carol,,\n",
+        encoding="utf-8",
+    )
+    book = saved_book()
+    imported, rejected = import_contacts_file(book, str(path))
+    assert imported == 2
+    assert [line for line, _ in rejected] == [3, 4]
+    assert set(book.data) == {"existing", "alice", "carol"}
+    assert book.changes == {"alice": "put", "carol": "put"}
+
+
+@pytest.mark.parametrize("content", [
+    "name\nAlice\nBob\n".encode() + b"\xff\xfe broken\nCarol\n",
+    b"name\nAlice\n\"" + b"x" * 200_000 + b"\"\n",
+])
+def test_unreadable_file_leaves_book_unchanged(tmp_path, content):
+    path = tmp_path / "contacts.csv"
+    path.write_bytes(content)
+    book = saved_book()
+    with pytest.raises(ValueError, match="contacts.csv"):
+        import_contacts_file(book, str(path))
+    assert list(book.data) == ["existing"]
+    assert book.changes == {}
+
+
+def test_directory_is_reported(tmp_path):
+    directory = tmp_path / "notes.csv"
+    directory.mkdir()
+    with pytest.raises(ValueError, match="notes.csv"):
+        import_notes_file(NotesBook(), str(directory))
+
+
+def test_missing_file_is_reported(tmp_path):
+    with pytest.raises(ValueError, match="missing.jsonl"):
+        import_notes_file(NotesBook(), str(tmp_path / "missing.jsonl"))
+
+
+def test_interrupted_import_is_rolled_back():
+    book = saved_book()
+    book.find("Existing").add_phone("0501234567")
+    changes = book.changes
+    calls = []
+
+    def add(record: Record) -> None:
+        calls.append(record)
+        if len(calls) == 3:
+            raise KeyboardInterrupt
+        book.add_record(record)
+
+    rows = [(line, {"name": f"Person {line}"}) for line in range(1, 6)]
+    with pytest.raises(KeyboardInterrupt):
+        import_rows(
+            iter(rows), build_record, book, add,
+            lambda record: record.name.value,
+        )
+    assert list(book.data) == ["existing"]
+    assert book.changes == changes
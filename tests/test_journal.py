@@ -0,0 +1,108 @@
+"""
+Tests of saving changes to the journal and replaying it on load.
+"""
+
+import os
+
+import pytest
+
+from motherbot.contacts.address_book import AddressBook
+from motherbot.contacts.record import Record
+from motherbot.helpers.journal import (
+    append_journal, compact_journal, dump_journal, journal_path,
+    journal_size, replay_journal,
+)
+from motherbot.helpers.serialize import load_data, save_data
+from motherbot.notes.note import Note
+from motherbot.notes.notes_book import NotesBook
+
+FILENAME = "book.pkl"
+
+
+@pytest.fixture
+def in_tmp(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def save_changes(book) -> None:
+    append_journal(dump_journal(book, book.pop_changes()), FILENAME)
+
+
+def reload(default):
+    loaded = load_data(FILENAME, default_data=default)
+    replay_journal(loaded, FILENAME)
+    return loaded
+
+
+def test_contacts_round_trip(in_tmp):
+    book = AddressBook()
+    for number in range(10):
+        record = Record(f"Person {number}")
+        record.add_phone(f"050000000{number}")
+        book.add_record(record)
+    book.pop_changes()
+    save_data(book, FILENAME)
+
+    book.find("Person 1").add_email("one@example.com")
+    book.delete("Person 2")
+    book.add_record(Record("Person 10"))
+    save_changes(book)
+    book.find("Person 10").add_birthday("01.01.2000")
+    book.delete("Person 1")
+    book.language = "ua"
+    book.mark_changed()
+    save_changes(book)
+
+    loaded = reload(AddressBook())
+    assert loaded.to_primitives() == book.to_primitives()
+    assert loaded.phone_index.owners("0500000003") == {"person 3"}
+    assert loaded.search_scores("person 10")["person 10"] == 100
+
+
+def test_notes_round_trip(in_tmp):
+    book = NotesBook()
+    for number in range(5):
+        note = Note(f"Note {number}")
+        note.add_text(f"Text {number}")
+        book.add_note(note)
+    book.pop_changes()
+    save_data(book, FILENAME)
+
+    loaded = load_data(FILENAME)
+    loaded.find("Note 0").add_tags("work")
+    loaded.find("Note 1").remove_text()
+    loaded.find("Note 1").add_text("Edited")
+    loaded.delete("Note 4")
+    save_changes(loaded)
+
+    replayed = reload(NotesBook())
+    assert replayed.to_primitives() == loaded.to_primitives()
+    assert replayed.tag_keys("work") == {"note 0"}
+
+
+def test_cut_off_batch_is_ignored(in_tmp):
+    book = AddressBook()
+    book.add_record(Record("Kept"))
+    save_changes(book)
+    book.add_record(Record("Lost"))
+    payload = dump_journal(book, book.pop_changes())
+    append_journal(payload[:len(payload) // 2], FILENAME)
+
+    assert list(reload(AddressBook()).data) == ["kept"]
+
+
+def test_compaction_folds_the_journal_into_the_snapshot(in_tmp):
+    book = AddressBook()
+    book.add_record(Record("First"))
+    save_changes(book)
+
+    assert not compact_journal(book, FILENAME)
+    assert compact_journal(book, FILENAME, threshold=0)
+    assert journal_size(FILENAME) == 0
+    assert not os.path.exists(journal_path(FILENAME))
+    assert list(reload(AddressBook()).data) == ["first"]
+
+    book.add_record(Record("Second"))
+    save_changes(book)
+    assert list(reload(AddressBook()).data) == ["first", "second"]
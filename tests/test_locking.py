@@ -0,0 +1,172 @@
+"""
+Tests of merging the changes saved by another session.
+"""
+
+import pytest
+
+from motherbot.contacts.address_book import AddressBook
+from motherbot.contacts.record import Record
+from motherbot.helpers.journal import (
+    SESSION_ID, append_journal, dump_journal, replay_journal,
+)
+from motherbot.helpers.locking import disk_stamp, merge_disk_changes
+from motherbot.helpers.serialize import load_data, save_data
+from motherbot.notes.note import Note
+from motherbot.notes.notes_book import NotesBook
+
+FILENAME = "address_book.pkl"
+
+
+@pytest.fixture
+def saved_book(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    book = AddressBook()
+    for number in range(1, 6):
+        record = Record(f"Person {number}")
+        record.add_phone(f"050000000{number}")
+        book.add_record(record)
+    book.pop_changes()
+    save_data(book, FILENAME)
+    return book
+
+
+def other_session_saves(change, snapshot: bool = True) -> None:
+    """
+    Loads the book in another session, changes it and saves it as a new
+    snapshot or to the journal.
+    """
+    other = load_data(FILENAME, default_data=AddressBook())
+    change(other)
+    if snapshot:
+        other.pop_changes()
+        save_data(other, FILENAME)
+    else:
+        append_journal(dump_journal(other, other.pop_changes()), FILENAME)
+
+
+
+@pytest.mark.parametrize("snapshot", [True, False])
+def test_same_record_changed_in_both_sessions(saved_book, snapshot):
+    base = disk_stamp(FILENAME)
+    saved_book.find("Person 3").add_email("p3@example.com")
+    other_session_saves(
+        lambda other: other.find("Person 3").add_phone("0671234567"),
+        snapshot,
+    )
+    conflicts = merge_disk_changes(
+        saved_book, FILENAME, base, saved_book.changes
+    )
+    assert conflicts == {"person 3"}
+    assert saved_book.find("Person 3").email.value == "p3@example.com"
+
+
+@pytest.mark.parametrize("snapshot", [True, False])
+def test_other_records_are_merged_without_conflicts(saved_book, snapshot):
+    base = disk_stamp(FILENAME)
+    saved_book.find("Person 1").add_email("p1@example.com")
+    other_session_saves(
+        lambda other: other.find("Person 3").add_phone("0671234567"),
+        snapshot,
+    )
+    conflicts = merge_disk_changes(
+        saved_book, FILENAME, base, saved_book.changes
+    )
+    assert conflicts == set()
+    assert [str(phone) for phone in saved_book.find("Person 3").phones] == [
+        "0500000003", "0671234567"
+    ]
+    assert saved_book.find("Person 1").email.value == "p1@example.com"
+
+
+def test_unchanged_disk_record_is_not_a_conflict(saved_book):
+    base = disk_stamp(FILENAME)
+    saved_book.find("Person 2").add_birthday("01.02.1990")
+    saved_book.delete("Person 4")
+    saved_book.add_record(Record("Person 6"))
+    other_session_saves(lambda other: other.add_record(Record("Person 7")))
+    conflicts = merge_disk_changes(
+        saved_book, FILENAME, base, saved_book.changes
+    )
+    assert conflicts == set()
+    assert sorted(saved_book.data) == [
+        "person 1", "person 2", "person 3", "person 5", "person 6",
+        "person 7",
+    ]
+
+
+def test_deleted_and_added_records_conflict(saved_book):
+    base = disk_stamp(FILENAME)
+    saved_book.delete("Person 4")
+    saved_book.add_record(Record("Person 6"))
+
+    def change(other):
+        other.find("Person 4").add_email("p4@example.com")
+        other.add_record(Record("Person 6"))
+
+    other_session_saves(change)
+    conflicts = merge_disk_changes(
+        saved_book, FILENAME, base, saved_book.changes
+    )
+    assert conflicts == {"person 4", "person 6"}
+    assert "person 4" not in saved_book.data
+
+
+def test_saved_changes_are_the_new_base(saved_book):
+    saved_book.find("Person 3").add_email("p3@example.com")
+    saved_book.pop_changes()
+    save_data(saved_book, FILENAME)
+    base = disk_stamp(FILENAME)
+    saved_book.find("Person 3").add_birthday("01.02.1990")
+    other_session_saves(lambda other: other.add_record(Record("Person 7")))
+    conflicts = merge_disk_changes(
+        saved_book, FILENAME, base, saved_book.changes
+    )
+    assert conflicts == set()
+
+
+def test_same_note_changed_in_both_sessions(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    filename = "notes_book.pkl"
+    book = NotesBook()
+    note = Note("shopping")
+    note.add_text("milk")
+    book.add_note(note)
+    book.add_note(Note("holiday"))
+    book.pop_changes()
+    save_data(book, filename)
+    base = disk_stamp(filename)
+    book.find("shopping").add_tags("home")
+    book.find("holiday").set_reminder("01.01.2099")
+    other = load_data(filename, default_data=NotesBook())
+    other.find("shopping").add_text("milk and bread")
+    other.pop_changes()
+    save_data(other, filename)
+    assert merge_disk_changes(book, filename, base, book.changes) == {
+        "shopping"
+    }
+
+
+def test_own_batches_are_not_conflicts(saved_book):
+    base = disk_stamp(FILENAME)
+    other_session_saves(
+        lambda other: other.find("Person 1").add_email("p1@example.com"),
+        snapshot=False,
+    )
+    # Appended while out of sync, so the base is left as is
+    saved_book.find("Person 3").add_email("p3@example.com")
+    append_journal(
+        dump_journal(saved_book, saved_book.pop_changes(), SESSION_ID),
+        FILENAME,
+    )
+    saved_book.find("Person 3").add_birthday("01.02.1990")
+
+    conflicts = merge_disk_changes(
+        saved_book, FILENAME, base, saved_book.changes, SESSION_ID
+    )
+    assert conflicts == set()
+    assert saved_book.find("Person 1").email.value == "p1@example.com"
+    assert saved_book.find("Person 3").birthday is not None
+
+    reloaded = load_data(FILENAME)
+    replay_journal(reloaded, FILENAME)
+    assert reloaded.find("Person 3").email.value == "p3@example.com"
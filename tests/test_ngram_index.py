@@ -0,0 +1,130 @@
+"""
+Tests of the n-gram index against scoring every entry.
+"""
+
+import random
+
+import pytest
+
+from motherbot.contacts import address_book as address_book_module
+from motherbot.contacts.address_book import AddressBook
+from motherbot.contacts.record import Record
+from motherbot.helpers.ngram_index import NgramIndex
+from motherbot.helpers.scoring import score_entries
+
+FIRST_NAMES = [
+    "john", "mary", "andrea", "arthur", "caleb", "alyssa", "kyle", "pete",
+    "james", "olena", "taras", "iryna", "christopher", "ana", "eastwood",
+]
+LAST_NAMES = [
+    "smith", "aguilar", "salazar", "gentry", "duncan", "wade", "harvey",
+    "shevchenko", "kovalenko", "bondar", "lee", "o'neil", "eastman",
+]
+
+
+def make_entries(seed: int = 1) -> dict[str, list[str]]:
+    rnd = random.Random(seed)
+    return {
+        f"{first} {last}": [
+            f"{first} {last}", str(rnd.randrange(10**9, 10**10))
+        ]
+        for first in FIRST_NAMES
+        for last in LAST_NAMES
+    }
+
+
+def make_typo(rnd: random.Random, text: str) -> str:
+    i = rnd.randrange(len(text))
+    char = rnd.choice("abcdefghijklmnopqrstuvwxyz")
+    return rnd.choice([
+        text[:i] + text[i + 1:],
+        text[:i] + char + text[i:],
+        text[:i] + char + text[i + 1:],
+        text[:i] + text[i + 1:i + 2] + text[i] + text[i + 2:],
+    ]).strip()
+
+
+def make_terms(entries: dict, count: int, seed: int = 2) -> list[str]:
+    rnd = random.Random(seed)
+    keys = sorted(entries)
+    terms = []
+    while len(terms) < count:
+        name = rnd.choice(keys)
+        start = rnd.randrange(len(name))
+        term = make_typo(
+            rnd, name[start:start + rnd.randrange(3, 10)]
+        )
+        if term:
+            terms.append(term)
+    return terms
+
+
+def build_index(entries: dict) -> NgramIndex:
+    index = NgramIndex()
+    for key, texts in entries.items():
+        index.update(key, texts)
+    return index
+
+
+def test_term_missing_a_letter_is_found():
+    entries = {"john smith": ["john smith"], "mary lee": ["mary lee"]}
+    assert "john smith" in score_entries("smth", entries)
+    assert build_index(entries).candidates("smth") == ["john smith"]
+
+
+@pytest.mark.parametrize("term", ["asr", "eas", "ete", "smiht", "jonh"])
+def test_edge_matches_are_candidates(term):
+    entries = make_entries()
+    candidates = set(build_index(entries).candidates(term))
+    assert set(score_entries(term, entries)) <= candidates
+
+
+def test_candidates_recall_typo_terms():
+    entries = make_entries()
+    index = build_index(entries)
+    for term in make_terms(entries, 150):
+        candidates = index.candidates(term, limit=len(entries))
+        expected = score_entries(term, entries)
+        assert set(expected) <= set(candidates), term
+
+
+def test_candidates_recall_after_updates():
+    entries = make_entries()
+    index = build_index(entries)
+    rnd = random.Random(3)
+    keys = sorted(entries)
+    for key in rnd.sample(keys, 60):
+        index.remove(key)
+        del entries[key]
+    for key in rnd.sample(sorted(entries), 60):
+        entries[key] = [key, str(rnd.randrange(10**9, 10**10))]
+        index.update(key, entries[key])
+    assert len(index) == len(entries)
+    for term in make_terms(entries, 50):
+        candidates = index.candidates(term, limit=len(entries))
+        assert set(score_entries(term, entries)) <= set(candidates), term
+
+
+def test_candidates_contain_every_entry_with_the_term():
+    entries = make_entries()
+    index = build_index(entries)
+    for term in ["sm", "a", "en", "ko", "lee", "salazar"]:
+        expected = {
+            key for key, texts in entries.items()
+            if any(term in text for text in texts)
+        }
+        assert expected <= set(index.candidates(term, limit=0)), term
+
+
+@pytest.mark.parametrize("indexed", [True, False])
+def test_search_scores_match_unindexed_scores(monkeypatch, indexed):
+    if indexed:
+        monkeypatch.setattr(address_book_module, "SEARCH_INDEX_MIN_SIZE", 0)
+    entries = make_entries()
+    book = AddressBook()
+    for key, texts in entries.items():
+        record = Record(key.title())
+        record.add_phone(texts[1])
+        book.add_record(record)
+    for term in make_terms(entries, 50):
+        assert book.search_scores(term) == score_entries(term, entries), term
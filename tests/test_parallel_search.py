@@ -0,0 +1,106 @@
+"""
+Tests of scoring in worker processes against serial scoring.
+"""
+
+import pytest
+
+from motherbot.contacts.address_book import AddressBook
+from motherbot.contacts.record import Record
+from motherbot.helpers.parallel_search import ShardedScorer
+from motherbot.helpers.scoring import score_entries
+from motherbot.notes.note import Note
+from motherbot.notes.notes_book import NotesBook
+from motherbot.settings.app_settings import app_settings
+
+NAMES = ["John Smith", "Jane Smyth", "Olena Bondar", "Taras Lee", "Mary Wade"]
+CONTACT_TERMS = ["smith", "jon", "olena", "050", "lee wade", "zzz"]
+NOTE_TERMS = ["shopping", "#work", "trip", "ideas", "nothing here"]
+
+
+def address_book() -> AddressBook:
+    book = AddressBook()
+    for number in range(40):
+        record = Record(f"{NAMES[number % len(NAMES)]} {number}")
+        record.add_phone(f"05{number % 3}00000{number:02}")
+        book.add_record(record)
+    return book
+
+
+def edit_contacts(book: AddressBook) -> None:
+    book.find("John Smith 0").add_phone("0671234567")
+    book.delete("Jane Smyth 1")
+    book.delete("Olena Bondar 2")
+    record = Record("Jon Smithson")
+    record.add_phone("0509999999")
+    book.add_record(record)
+
+
+def notes_book() -> NotesBook:
+    book = NotesBook()
+    for number in range(40):
+        note = Note(f"{['Shopping', 'Trip', 'Ideas'][number % 3]} {number}")
+        if number % 2:
+            note.add_tags(["work", "home"][number % 4 // 2])
+        book.add_note(note)
+    return book
+
+
+def edit_notes(book: NotesBook) -> None:
+    book.find("Trip 1").add_tags("work")
+    book.find("Shopping 3").remove_tag("home")
+    book.delete("Ideas 2")
+    book.add_note(Note("Work trip"))
+
+
+def scores(book, term: str, size: int, monkeypatch) -> dict:
+    monkeypatch.setattr(app_settings, "_parallel_search_size", size)
+    return book.search_scores(term)
+
+
+@pytest.mark.parametrize("make_book, edit, terms", [
+    (address_book, edit_contacts, CONTACT_TERMS),
+    (notes_book, edit_notes, NOTE_TERMS),
+])
+def test_sharded_scores_match_serial(monkeypatch, make_book, edit, terms):
+    serial, sharded = make_book(), make_book()
+    monkeypatch.setattr(app_settings, "_parallel_search_size", 10)
+    assert sharded.parallel_scorer is not None
+    try:
+        for edited in (False, True):
+            if edited:
+                # The changes have to reach the worker shards
+                edit(serial)
+                edit(sharded)
+            for term in terms:
+                assert scores(sharded, term, 10, monkeypatch) == scores(
+                    serial, term, 0, monkeypatch
+                ), term
+    finally:
+        sharded._parallel_scorer.close()
+
+
+def test_scorer_with_several_shards():
+    entries = {
+        f"entry {number}": [f"entry {number}", f"{number:04}"]
+        for number in range(30)
+    }
+    scorer = ShardedScorer(entries.items(), shards=3)
+    try:
+        assert scorer.score("entry 1", entries) == score_entries(
+            "entry 1", entries
+        )
+        scorer.update("entry 1", None)
+        scorer.update("entry 7", ["entry seven", "0007"])
+        scorer.update("new entry", ["new entry"])
+        del entries["entry 1"]
+        entries["entry 7"] = ["entry seven", "0007"]
+        entries["new entry"] = ["new entry"]
+        for term in ["entry 1", "seven", "0007", "new"]:
+            assert scorer.score(term, entries) == score_entries(
+                term, entries
+            )
+        assert scorer.score("entry", ["entry 2", "missing"]) == (
+            score_entries("entry", {"entry 2": entries["entry 2"]})
+        )
+    finally:
+        scorer.close()
@@ -0,0 +1,93 @@
+"""
+Tests of the phone index against a brute-force scan of the numbers.
+"""
+
+import random
+
+import pytest
+
+from motherbot.contacts.address_book import AddressBook
+from motherbot.contacts.record import Record
+from motherbot.helpers.phone_index import PhoneIndex
+
+
+def random_phone(rnd: random.Random) -> str:
+    return "050" + "".join(rnd.choice("012") for _ in range(7))
+
+
+def check(index: PhoneIndex, entries: dict[int, set[str]]) -> None:
+    numbers = sorted(set().union(*entries.values()))
+    assert sorted(index) == numbers
+    assert index.keys() == {key for key, phones in entries.items() if phones}
+    for key, phones in entries.items():
+        assert index.phones(key) == phones
+    for phone in numbers:
+        assert index.owners(phone) == {
+            key for key, phones in entries.items() if phone in phones
+        }
+    for prefix in ["", "050", "0501", "05012", "0509", numbers[0][:8]]:
+        assert index.with_prefix(prefix) == [
+            phone for phone in numbers if phone.startswith(prefix)
+        ]
+    assert index.shared() == {
+        phone: owners
+        for phone in numbers
+        if len(owners := index.owners(phone)) > 1
+    }
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_index_matches_brute_force(seed):
+    rnd = random.Random(seed)
+    index = PhoneIndex()
+    entries = {}
+    for step in range(600):
+        key = rnd.randrange(80)
+        if rnd.random() < 0.2:
+            index.remove(key)
+            entries.pop(key, None)
+        else:
+            phones = {random_phone(rnd) for _ in range(rnd.randrange(4))}
+            index.update(key, phones)
+            entries[key] = phones
+        if step % 100 == 99:
+            check(index, entries)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_bulk_build_matches_updates(seed):
+    rnd = random.Random(seed)
+    entries = {
+        key: {random_phone(rnd) for _ in range(rnd.randrange(4))}
+        for key in range(300)
+    }
+    index = PhoneIndex(
+        (phone, key) for key, phones in entries.items() for phone in phones
+    )
+    entries = {key: phones for key, phones in entries.items() if phones}
+    check(index, entries)
+    for key in rnd.sample(sorted(entries), 50):
+        entries[key] = {random_phone(rnd)}
+        index.update(key, entries[key])
+    check(index, entries)
+
+
+def test_book_index_follows_edits():
+    book = AddressBook()
+    for number in range(1, 4):
+        record = Record(f"Person {number}")
+        record.add_phone(f"050000000{number}")
+        book.add_record(record)
+    assert book.phone_index.owners("0500000002") == {"person 2"}
+
+    book.find("Person 2").remove_phone("0500000002")
+    book.find("Person 2").add_phone("0670000002")
+    book.delete("Person 3")
+    record = Record("Person 4")
+    record.add_phone("0500000003")
+    book.add_record(record)
+    assert sorted(book.phone_index) == [
+        "0500000001", "0500000003", "0670000002"
+    ]
+    assert book.phone_index.owners("0500000003") == {"person 4"}
+    assert book.phone_index.owners("0500000002") == set()
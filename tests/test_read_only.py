@@ -0,0 +1,50 @@
+"""
+Tests of opening the books with `--read-only`.
+"""
+
+import os
+import sqlite3
+
+import pytest
+
+from motherbot.constants.values import DATABASE_PATH
+from motherbot.contacts.record import Record
+from motherbot.controllers.general import (
+    load_database, load_view_books, settings,
+)
+from motherbot.main import get_commands
+from motherbot.settings.app_settings import app_settings
+
+
+@pytest.fixture
+def sqlite_storage(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(app_settings, "_storage_mode", "sqlite")
+    return tmp_path
+
+
+def test_missing_database_is_not_created(sqlite_storage):
+    book, notes_book = load_view_books()
+    assert len(book) == 0 and len(notes_book) == 0
+    assert os.listdir(sqlite_storage) == []
+
+
+def test_database_is_opened_read_only(sqlite_storage):
+    book, _ = load_database()
+    book.add_record(Record("John Smith"))
+    book.commit()
+    book.connection.close()
+    modified = os.stat(DATABASE_PATH).st_mtime_ns
+
+    book, notes_book = load_view_books()
+    assert [record.name.value for record in book.values()] == ["John Smith"]
+    assert len(notes_book) == 0
+    with pytest.raises(sqlite3.OperationalError):
+        book.add_record(Record("Mary Wade"))
+    assert os.stat(DATABASE_PATH).st_mtime_ns == modified
+
+
+def test_settings_are_not_offered():
+    contacts_controllers, *_ = get_commands(True)
+    assert settings not in contacts_controllers.values()
+    assert settings in get_commands(False)[0].values()
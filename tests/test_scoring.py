@@ -0,0 +1,65 @@
+"""
+Tests of batched fuzzy scoring against scoring one pair at a time.
+"""
+
+import random
+
+from rapidfuzz import fuzz
+
+from motherbot.constants.values import FUZZY_MATCH_THRESHOLD
+from motherbot.helpers.scoring import score_entries, score_matches, top_keys
+
+NAMES = [
+    "john smith", "mary wade", "andrea salazar", "arthur duncan",
+    "olena bondar", "taras shevchenko", "pete lee", "kyle aguilar",
+]
+
+
+def score_pairs(term: str, entries: dict) -> dict:
+    """
+    Scores the entries the way the searches did before batching.
+    """
+    scores = {}
+    for key, (main_text, *texts) in entries.items():
+        if term in main_text:
+            score = main_text.count(term) * 100
+        else:
+            match = round(fuzz.partial_ratio(term, main_text))
+            score = match if match >= FUZZY_MATCH_THRESHOLD else 0
+        for text in texts:
+            if term in text:
+                score += text.count(term) * 100
+            else:
+                match = round(fuzz.ratio(term, text))
+                score += match if match >= FUZZY_MATCH_THRESHOLD else 0
+        if score:
+            scores[key] = score
+    return scores
+
+
+def test_score_entries_matches_scoring_pairs():
+    rnd = random.Random(5)
+    entries = {
+        name: [name, str(rnd.randrange(10**9, 10**10)), "#work"]
+        for name in NAMES
+    }
+    terms = ["smith", "smth", "a", "wor", "#work", "0", "ar", "lee pete"]
+    terms += [str(rnd.randrange(10**6, 10**10)) for _ in range(20)]
+    for term in terms:
+        assert score_entries(term, entries) == score_pairs(term, entries)
+
+
+def test_score_matches_cutoff_and_duplicates():
+    scores = score_matches("smith", ["smith", "smyth", "jones", "smith"])
+    assert scores == {"smith": 100, "smyth": 80, "jones": 20}
+    assert score_matches(
+        "smith", ["smith", "smyth", "jones"], "ratio", 70
+    ) == {"smith": 100, "smyth": 80}
+    assert score_matches("smith", []) == {}
+
+
+def test_top_keys_keeps_order_of_equal_scores():
+    scores = {"a": 1, "b": 3, "c": 3, "d": 2}
+    assert top_keys(scores) == ["b", "c", "d", "a"]
+    assert top_keys(scores, limit=2) == ["b", "c"]
+    assert top_keys(scores, limit=2, offset=1) == ["c", "d"]
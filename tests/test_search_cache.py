@@ -0,0 +1,60 @@
+"""
+Tests of the cached search results of the books.
+"""
+
+from motherbot.contacts.address_book import AddressBook
+from motherbot.contacts.record import Record
+from motherbot.notes.note import Note
+from motherbot.notes.notes_book import NotesBook
+
+
+def notes_book(*titles: str) -> NotesBook:
+    book = NotesBook()
+    for title in titles:
+        book.add_note(Note(title))
+    return book
+
+
+def address_book(*names: str) -> AddressBook:
+    book = AddressBook()
+    for name in names:
+        book.add_record(Record(name))
+    return book
+
+
+def titles(notes: list) -> list[str]:
+    return [note.title.value for note in notes]
+
+
+def names(records: list) -> list[str]:
+    return [record.name.value for record in records]
+
+
+def test_refined_note_search_matches_fresh_search():
+    fresh = titles(
+        notes_book("xbcd shopping", "alpha", "zzabc").smart_search("abcd")
+    )
+    book = notes_book("xbcd shopping", "alpha", "zzabc")
+    book.smart_search("abc")
+    assert titles(book.smart_search("abcd")) == fresh
+    assert fresh == ["zzabc", "xbcd shopping"]
+
+
+def test_refined_contact_search_matches_fresh_search():
+    fresh = names(
+        address_book("Xbcd Smith", "Alpha", "Zzabc").smart_search("abcd")
+    )
+    book = address_book("Xbcd Smith", "Alpha", "Zzabc")
+    book.smart_search("abc")
+    assert names(book.smart_search("abcd")) == fresh
+    assert fresh == ["Zzabc", "Xbcd Smith"]
+
+
+def test_repeated_search_is_cached_until_the_book_changes():
+    book = notes_book("shopping list", "holiday plans")
+    assert titles(book.smart_search("shop")) == ["shopping list"]
+    assert len(book._search_cache) == 1
+    book.add_note(Note("shop opening hours"))
+    assert titles(book.smart_search("shop")) == [
+        "shopping list", "shop opening hours"
+    ]
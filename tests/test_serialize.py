@@ -0,0 +1,117 @@
+"""
+Tests of writing books to snapshots and loading them back.
+"""
+
+import glob
+import os
+import pickle
+
+import pytest
+
+from motherbot.constants.values import NOTE_BODIES_SUFFIX, SNAPSHOT_MAGIC
+from motherbot.contacts.address_book import AddressBook
+from motherbot.contacts.record import Record
+from motherbot.helpers.serialize import CODECS, load_data, save_data
+from motherbot.notes.note import Note
+from motherbot.notes.notes_book import NotesBook
+from motherbot.notes.text import LazyText
+from motherbot.settings.app_settings import app_settings
+
+
+def address_book() -> AddressBook:
+    book = AddressBook()
+    for number in range(50):
+        record = Record(f"Person {number}")
+        record.add_phone(f"05000000{number:02}")
+        if number % 2:
+            record.add_email(f"person{number}@example.com")
+            record.add_birthday(f"{number % 28 + 1:02}.03.1990")
+        if number % 3:
+            record.add_address(f"Street {number}, Kyiv, Ukraine")
+        book.add_record(record)
+    return book
+
+
+def notes_book() -> NotesBook:
+    book = NotesBook()
+    for number in range(50):
+        note = Note(f"Note {number}")
+        if number % 2:
+            note.add_text(f"Текст нотатки {number} " * (number + 1))
+        if number % 3:
+            note.add_tags(f"tag{number % 4} common")
+        if number % 5 == 0:
+            note.set_reminder(f"{number % 28 + 1:02}.12.2030")
+        book.add_note(note)
+    return book
+
+
+@pytest.fixture
+def in_tmp(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.mark.parametrize("codec", list(CODECS))
+@pytest.mark.parametrize("make_book", [address_book, notes_book])
+def test_round_trip(in_tmp, monkeypatch, codec, make_book):
+    monkeypatch.setattr(app_settings, "_snapshot_codec", codec)
+    book = make_book()
+    save_data(book, "book.pkl")
+
+    with open("book.pkl", "rb") as f:
+        header = f.read(len(SNAPSHOT_MAGIC) + 2)
+    assert header[:len(SNAPSHOT_MAGIC)] == SNAPSHOT_MAGIC
+    assert header[-1] == CODECS[codec][0]
+
+    loaded = load_data("book.pkl")
+    assert type(loaded) is type(book)
+    assert loaded.to_primitives() == book.to_primitives()
+    assert loaded.changes == {}
+    assert all(entry._book is loaded for entry in loaded.values())
+
+
+def test_note_texts_are_read_lazily(in_tmp):
+    book = notes_book()
+    save_data(book, "notes.pkl")
+    loaded = load_data("notes.pkl")
+    note = loaded.find("Note 3")
+    assert isinstance(note.text, LazyText)
+    assert note.text.value == book.find("Note 3").text.value
+
+    copied = pickle.loads(pickle.dumps(note))
+    assert type(copied.text) is not LazyText
+    assert copied.text.value == note.text.value
+
+
+def test_older_bodies_files_are_removed(in_tmp):
+    book = notes_book()
+    save_data(book, "notes.pkl")
+    first = load_data("notes.pkl")
+    book.find("Note 1").remove_text()
+    book.find("Note 1").add_text("Changed")
+    save_data(book, "notes.pkl")
+
+    assert len(glob.glob("notes.pkl" + NOTE_BODIES_SUFFIX + ".*")) == 1
+    assert load_data("notes.pkl").find("Note 1").text.value == "Changed"
+    if os.name == "posix":
+        assert first.find("Note 3").text.value == (
+            book.find("Note 3").text.value
+        )
+
+
+def test_legacy_pickle_is_loaded(in_tmp):
+    book = address_book()
+    with open("book.pkl", "wb") as f:
+        pickle.dump(book, f)
+    loaded = load_data("book.pkl")
+    assert loaded.to_primitives() == book.to_primitives()
+
+
+def test_missing_and_unsupported_files(in_tmp):
+    default = AddressBook()
+    assert load_data("missing.pkl", default_data=default) is default
+    with open("book.pkl", "wb") as f:
+        f.write(SNAPSHOT_MAGIC + bytes([99, 0]))
+    with pytest.raises(ValueError):
+        load_data("book.pkl")
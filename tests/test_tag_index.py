@@ -0,0 +1,97 @@
+"""
+Tests of the tag index against a brute-force scan of the notes.
+"""
+
+import random
+
+import pytest
+
+from motherbot.helpers.serialize import load_data, save_data
+from motherbot.helpers.sqlite_storage import connect_database
+from motherbot.notes.note_bodies import NoteBodies
+from motherbot.notes.note import Note
+from motherbot.notes.notes_book import NotesBook
+from motherbot.notes.sqlite_notes_book import SQLiteNotesBook
+
+TAGS = ["work", "home", "urgent", "ideas", "travel"]
+
+
+def brute_force(book: NotesBook) -> dict[str, set[str]]:
+    titles_by_tag = {}
+    for key, note in book.items():
+        for tag in note.tags:
+            titles_by_tag.setdefault(tag.value, set()).add(key)
+    return titles_by_tag
+
+
+def edit_randomly(book: NotesBook, rnd: random.Random, steps: int) -> None:
+    for step in range(steps):
+        title = f"Note {rnd.randrange(60)}"
+        note = book.get(title.lower())
+        action = rnd.random()
+        if note is None:
+            note = Note(title)
+            note.add_tags(" ".join(rnd.sample(TAGS, rnd.randrange(3))))
+            book.add_note(note)
+        elif action < 0.4:
+            note.add_tags(rnd.choice(TAGS).upper())
+        elif action < 0.8 and note.tags:
+            note.remove_tag(rnd.choice(note.tags).value)
+        else:
+            book.delete(title)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_index_matches_brute_force(seed):
+    rnd = random.Random(seed)
+    book = NotesBook()
+    edit_randomly(book, rnd, 50)
+    assert book.tag_index == brute_force(book)
+    edit_randomly(book, rnd, 300)
+    assert book.tag_index == brute_force(book)
+    expected = brute_force(book)
+    for tag in TAGS:
+        assert book.tag_keys(f"#{tag.upper()}") == expected.get(tag, set())
+
+
+def test_first_build_does_not_touch_the_notes(tmp_path, monkeypatch):
+    book = NotesBook()
+    edit_randomly(book, random.Random(6), 100)
+    for note in book.values():
+        note.add_text("Some text")
+    save_data(book, str(tmp_path / "notes.pkl"))
+    loaded = load_data(str(tmp_path / "notes.pkl"))
+    version = loaded._version
+
+    def read(*args):
+        raise AssertionError("note text read")
+
+    monkeypatch.setattr(NoteBodies, "read", read)
+    assert loaded.tag_index == brute_force(book)
+    assert loaded._version == version
+    assert loaded._text_index is None
+
+
+@pytest.mark.parametrize("query, check", [
+    ("#work AND #home", lambda tags: {"work", "home"} <= tags),
+    ("#work OR #travel", lambda tags: bool({"work", "travel"} & tags)),
+    ("#urgent NOT #work",
+     lambda tags: "urgent" in tags and "work" not in tags),
+    ("#ideas #home", lambda tags: {"ideas", "home"} <= tags),
+])
+def test_tag_queries_match_brute_force(query, check):
+    book = NotesBook()
+    edit_randomly(book, random.Random(4), 300)
+    assert [note.title.value.lower() for note in book.filter(query)] == sorted(
+        key for key, note in book.items()
+        if check({tag.value for tag in note.tags})
+    )
+
+
+def test_sqlite_tag_table_matches_brute_force(tmp_path):
+    book = SQLiteNotesBook(connect_database(str(tmp_path / "motherbot.db")))
+    edit_randomly(book, random.Random(5), 300)
+    expected = brute_force(book)
+    assert book.tag_index == expected
+    for tag in TAGS:
+        assert book.tag_keys(tag) == expected.get(tag, set())
@@ -0,0 +1,101 @@
+"""
+Tests of the full-text index against BM25 computed from the texts.
+"""
+
+import math
+import random
+
+import pytest
+
+from motherbot.constants.values import BM25_B, BM25_K1
+from motherbot.helpers.text_index import TextIndex, tokenize
+from motherbot.notes.note import Note
+from motherbot.notes.notes_book import NotesBook
+
+WORDS = ["milk", "bread", "call", "mom", "meeting", "report", "Київ", "день"]
+
+
+def bm25(texts: dict, query: str) -> dict:
+    documents = {key: tokenize(text) for key, text in texts.items() if text}
+    documents = {key: words for key, words in documents.items() if words}
+    if not documents:
+        return {}
+    average_length = sum(map(len, documents.values())) / len(documents)
+    scores = {}
+    for word in set(tokenize(query)):
+        having = [key for key, words in documents.items() if word in words]
+        idf = math.log(
+            1 + (len(documents) - len(having) + 0.5) / (len(having) + 0.5)
+        )
+        for key in having:
+            frequency = documents[key].count(word)
+            length = len(documents[key])
+            scores[key] = scores.get(key, 0) + idf * (
+                frequency * (BM25_K1 + 1)
+                / (frequency + BM25_K1 * (
+                    1 - BM25_B + BM25_B * length / average_length
+                ))
+            )
+    return scores
+
+
+def assert_scores_equal(actual: dict, expected: dict) -> None:
+    assert actual.keys() == expected.keys()
+    for key, score in expected.items():
+        assert actual[key] == pytest.approx(score)
+
+
+def random_text(rnd: random.Random) -> str:
+    return " ".join(rnd.choice(WORDS) for _ in range(rnd.randrange(8)))
+
+
+def test_tokenize():
+    assert tokenize("Call MOM, buy milk!") == ["call", "mom", "buy", "milk"]
+    assert tokenize("Зустріч у КИЄВІ") == ["зустріч", "у", "києві"]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_search_matches_bm25(seed):
+    rnd = random.Random(seed)
+    index = TextIndex()
+    texts = {}
+    for step in range(300):
+        key = rnd.randrange(40)
+        if rnd.random() < 0.2:
+            index.remove(key)
+            texts.pop(key, None)
+        else:
+            texts[key] = random_text(rnd) or None
+            index.update(key, texts[key])
+        if step % 50 == 49:
+            for word in WORDS:
+                assert index.keys(word.lower()) == {
+                    key for key, text in texts.items()
+                    if text and word.lower() in tokenize(text)
+                }
+            query = random_text(rnd)
+            assert_scores_equal(index.search(query), bm25(texts, query))
+
+
+def test_book_search_follows_edits():
+    rnd = random.Random(1)
+    book = NotesBook()
+    for number in range(30):
+        note = Note(f"Note {number}")
+        text = random_text(rnd)
+        if text:
+            note.add_text(text)
+        book.add_note(note)
+    assert_scores_equal(book.search_text("milk mom"), bm25(
+        {key: note.text and note.text.value for key, note in book.items()},
+        "milk mom",
+    ))
+
+    for note in rnd.sample(list(book.values()), 10):
+        note.remove_text()
+        note.add_text(random_text(rnd) or "empty")
+    for note in rnd.sample(list(book.values()), 5):
+        book.delete(note.title.value)
+    texts = {key: note.text and note.text.value for key, note in book.items()}
+    for query in ["milk mom", "report", "київ день", "empty", "absent"]:
+        assert_scores_equal(book.search_text(query), bm25(texts, query))
@@ -0,0 +1,164 @@
+"""
+Tests of the background writer.
+"""
+
+import threading
+
+import pytest
+
+from motherbot.contacts.address_book import AddressBook
+from motherbot.contacts.record import Record
+from motherbot.helpers import writer as writer_module
+from motherbot.helpers.journal import (
+    SESSION_ID, dump_journal, journal_size, replay_journal,
+)
+from motherbot.helpers.locking import disk_stamp, merge_disk_changes
+from motherbot.helpers.serialize import dump_data, load_data, save_data
+from motherbot.helpers.writer import BackgroundWriter
+
+FILENAME = "address_book.pkl"
+
+
+@pytest.fixture
+def book(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    book = AddressBook()
+    book.add_record(Record("Person 1"))
+    book.pop_changes()
+    save_data(book, FILENAME)
+    return book
+
+
+@pytest.fixture
+def writes(monkeypatch):
+    """
+    Counts the snapshots and journal batches written. The first snapshot
+    blocks until `release` is set, so the next writes queue up behind it.
+    """
+    started, release = threading.Event(), threading.Event()
+    counts = {"snapshot": 0, "journal": 0}
+    write_snapshot = writer_module.write_snapshot
+    append_journal = writer_module.append_journal
+
+    def counting_snapshot(*args, **kwargs):
+        counts["snapshot"] += 1
+        if counts["snapshot"] == 1:
+            started.set()
+            release.wait(5)
+        write_snapshot(*args, **kwargs)
+
+    def counting_journal(*args, **kwargs):
+        counts["journal"] += 1
+        append_journal(*args, **kwargs)
+
+    monkeypatch.setattr(writer_module, "write_snapshot", counting_snapshot)
+    monkeypatch.setattr(writer_module, "append_journal", counting_journal)
+    return counts, started, release
+
+
+def save(writer: BackgroundWriter, book: AddressBook, snapshot: bool) -> None:
+    changes = book.pop_changes()
+    batch = dump_journal(book, changes, SESSION_ID)
+    if snapshot:
+        writer.save_snapshot(
+            FILENAME, *dump_data(book, FILENAME), fallback=batch
+        )
+    else:
+        writer.append_journal(FILENAME, batch)
+
+
+def reload() -> AddressBook:
+    loaded = load_data(FILENAME)
+    replay_journal(loaded, FILENAME)
+    return loaded
+
+
+def test_queued_snapshots_are_coalesced(book, writes):
+    counts, started, release = writes
+    writer = BackgroundWriter()
+    writer.track(FILENAME, disk_stamp(FILENAME))
+    book.add_record(Record("Person 2"))
+    save(writer, book, snapshot=True)
+    assert started.wait(5)
+
+    for number in range(3, 8):
+        book.add_record(Record(f"Person {number}"))
+        save(writer, book, snapshot=number % 2 == 1)
+    release.set()
+    writer.close()
+
+    assert counts == {"snapshot": 2, "journal": 0}
+    assert journal_size(FILENAME) == 0
+    assert sorted(reload().data) == [f"person {n}" for n in range(1, 8)]
+    assert writer.stamp(FILENAME) == disk_stamp(FILENAME)
+
+
+def test_snapshot_replaces_pending_journal_batches(book, writes):
+    counts, started, release = writes
+    writer = BackgroundWriter()
+    writer.track(FILENAME, disk_stamp(FILENAME))
+    save(writer, book, snapshot=True)
+    assert started.wait(5)
+
+    book.add_record(Record("Person 2"))
+    save(writer, book, snapshot=False)
+    book.delete("Person 1")
+    save(writer, book, snapshot=False)
+    book.add_record(Record("Person 3"))
+    save(writer, book, snapshot=True)
+    release.set()
+    writer.close()
+
+    assert counts == {"snapshot": 2, "journal": 0}
+    assert journal_size(FILENAME) == 0
+    assert sorted(load_data(FILENAME).data) == ["person 2", "person 3"]
+
+
+def test_journal_batches_are_appended_in_order(book, writes):
+    counts, _, _ = writes
+    writer = BackgroundWriter()
+    writer.track(FILENAME, disk_stamp(FILENAME))
+    book.add_record(Record("Person 2"))
+    save(writer, book, snapshot=False)
+    book.delete("Person 2")
+    save(writer, book, snapshot=False)
+    book.add_record(Record("Person 3"))
+    save(writer, book, snapshot=False)
+    writer.close()
+
+    assert counts == {"snapshot": 0, "journal": 3}
+    assert sorted(reload().data) == ["person 1", "person 3"]
+    assert writer.stamp(FILENAME) == disk_stamp(FILENAME)
+
+
+def test_out_of_sync_snapshot_falls_back_to_the_journal(book, writes):
+    counts, _, release = writes
+    release.set()
+    writer = BackgroundWriter()
+    base = disk_stamp(FILENAME)
+    writer.track(FILENAME, base)
+
+    other = load_data(FILENAME)
+    other.add_record(Record("Other"))
+    other.pop_changes()
+    save_data(other, FILENAME)
+    counts["snapshot"] = 0
+
+    book.find("Person 1").add_email("p1@example.com")
+    book.add_record(Record("Person 2"))
+    save(writer, book, snapshot=True)
+    writer.close()
+
+    assert counts == {"snapshot": 0, "journal": 1}
+    assert writer.stamp(FILENAME) == base
+    loaded = reload()
+    assert sorted(loaded.data) == ["other", "person 1", "person 2"]
+    assert loaded.find("Person 1").email.value == "p1@example.com"
+
+    book.find("Person 2").add_email("p2@example.com")
+    conflicts = merge_disk_changes(
+        book, FILENAME, base, book.changes, SESSION_ID
+    )
+    assert conflicts == set()
+    assert sorted(book.data) == ["other", "person 1", "person 2"]
+    assert book.find("Person 2").email.value == "p2@example.com"